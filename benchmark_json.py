@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+
+import dnac_json
+from mock_dnac_server import generate_report
+
+REPORT_CLIENTS = 500000
+
+
+def stdlib_dumpb(obj):
+    return json.dumps(obj).encode('utf-8')
+
+
+def stdlib_dump(obj, file):
+    json.dump(obj, file)
+
+
+def best_time(function, repeat):
+    """
+    :param function: function to time
+    :param repeat: number of runs
+    :return: the shortest run time, in seconds
+    """
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    """
+    This application will compare the stdlib json module with the dnac_json backend, orjson if installed, on a
+    synthetic Client Detail report:
+     - decode the full report, the API responses
+     - encode the full report and write it to a file
+     - encode and decode each client, the report index and the merged shard reports
+    """
+    parser = argparse.ArgumentParser(description='JSON backend micro-benchmark')
+    parser.add_argument('--clients', type=int, default=REPORT_CLIENTS, help='number of clients in the report')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs, the shortest run is reported')
+    args = parser.parse_args()
+
+    report_bytes = ''.join(generate_report(args.clients)).encode('utf-8')
+    report = json.loads(report_bytes)
+    clients = report['client_details']
+    encoded_clients = [json.dumps(client) for client in clients]
+    size_mb = len(report_bytes) / 1024 / 1024
+    print('Report clients:', args.clients, ', size: %.1f MB' % size_mb, ', dnac_json backend:', dnac_json.BACKEND)
+
+    folder = tempfile.mkdtemp(prefix='json-benchmark-')
+    filename = os.path.join(folder, 'report.json')
+
+    def write_stdlib():
+        with open(filename, 'w') as file:
+            stdlib_dump(report, file)
+
+    def write_backend():
+        with open(filename, 'wb') as file:
+            dnac_json.dump(report, file)
+
+    tests = [
+        ('decode report', lambda: json.loads(report_bytes), lambda: dnac_json.loads(report_bytes)),
+        ('encode report', lambda: stdlib_dumpb(report), lambda: dnac_json.dumpb(report)),
+        ('write report file', write_stdlib, write_backend),
+        ('encode clients', lambda: [json.dumps(client) for client in clients],
+         lambda: [dnac_json.dumps(client) for client in clients]),
+        ('decode clients', lambda: [json.loads(client) for client in encoded_clients],
+         lambda: [dnac_json.loads(client) for client in encoded_clients])
+    ]
+    print('\n%-20s %12s %12s %12s %10s' % ('Test', 'json (s)', dnac_json.BACKEND + ' (s)', 'MB/s', 'Speedup'))
+    try:
+        for name, stdlib_function, backend_function in tests:
+            stdlib_time = best_time(stdlib_function, args.repeat)
+            backend_time = best_time(backend_function, args.repeat)
+            print('%-20s %12.3f %12.3f %12.0f %9.1fx' % (name, stdlib_time, backend_time, size_mb / backend_time,
+                                                         stdlib_time / backend_time))
+    finally:
+        if os.path.exists(filename):
+            os.remove(filename)
+        os.rmdir(folder)
+
+
+if __name__ == '__main__':
+    main()
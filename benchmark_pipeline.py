@@ -0,0 +1,305 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import concurrent.futures
+import glob
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import requests
+
+from requests.auth import HTTPBasicAuth  # for Basic Auth
+
+from mock_dnac_server import build_notification
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+DOWNLOAD_SCRIPT = os.path.join(REPO_DIR, 'dnacenter_create_report_download.py')
+SERVE_SCRIPT = os.path.join(REPO_DIR, 'serve_receiver.py')
+
+WEBHOOK_USERNAME = 'benchmark'
+WEBHOOK_PASSWORD = 'benchmark'
+STARTUP_TIMEOUT = 30  # max time to wait for the mock server and the receiver to start, in seconds
+RECEIVER_TIMEOUT = 600  # max time to wait for the receiver to process all the reports, in seconds
+
+
+def free_port():
+    """
+    :return: a free local TCP port
+    """
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values, pct):
+    """
+    :param values: the measured values
+    :param pct: percentile, for example 99
+    :return: the percentile value, None if there are no values
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(int(len(values) * pct / 100), len(values) - 1)]
+
+
+def start_process(command, cwd, env, log_file):
+    """
+    Start the {command}, the output is saved to the {log_file}
+    :return: the process
+    """
+    with open(log_file, 'w') as log:
+        return subprocess.Popen(command, cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+def wait_process(process):
+    """
+    Wait for the process to exit
+    :param process: the process
+    :return: the exit code and the process peak RSS, in MB
+    """
+    _, status, rusage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return process.returncode, rusage.ru_maxrss / 1024  # ru_maxrss is in KB on Linux
+
+
+def stop_process(process):
+    """
+    Stop the process with SIGINT, for a clean shutdown
+    :param process: the process
+    :return: the process peak RSS, in MB
+    """
+    process.send_signal(signal.SIGINT)
+    return wait_process(process)[1]
+
+
+def wait_for_url(url, auth=None, timeout=STARTUP_TIMEOUT):
+    """
+    Wait for the server at {url} to accept requests
+    :return None
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            requests.get(url, auth=auth, timeout=5)
+            return
+        except requests.exceptions.ConnectionError:
+            if time.monotonic() > deadline:
+                raise RuntimeError('Server not started: ' + url)
+            time.sleep(0.2)
+
+
+def benchmark_download(dnac_url, work_dir, runs, concurrency):
+    """
+    Run the download app {runs} times, against the mock server
+    :param dnac_url: mock server URL
+    :param work_dir: folder for the app runs, each run has its own folder
+    :param runs: number of app runs
+    :param concurrency: number of app runs at the same time
+    :return: the benchmark results
+    """
+    env = dict(os.environ, DNAC_URL=dnac_url, DNAC_USER='admin', DNAC_PASS='admin')
+
+    def run_app(number):
+        run_dir = os.path.join(work_dir, 'download-%03d' % number)
+        os.makedirs(run_dir)
+        start = time.monotonic()
+        process = start_process([sys.executable, DOWNLOAD_SCRIPT], run_dir, env, os.path.join(run_dir, 'run.log'))
+        exit_code, peak_rss = wait_process(process)
+        report_files = glob.glob(os.path.join(run_dir, 'report_store', '*', '*.json*'))
+        succeeded = exit_code == 0 and len(report_files) == 1
+        size = os.path.getsize(report_files[0]) if succeeded else 0
+        return time.monotonic() - start, peak_rss, succeeded, size
+
+    start = time.monotonic()
+    with concurrent.futures.ThreadPoolExecutor(concurrency) as executor:
+        app_runs = list(executor.map(run_app, range(runs)))
+    total_time = time.monotonic() - start
+
+    latencies = [latency for latency, _, succeeded, _ in app_runs if succeeded]
+    return {
+        'scenario': 'download',
+        'runs': runs,
+        'concurrency': concurrency,
+        'succeeded': len(latencies),
+        'failed': runs - len(latencies),
+        'total_time': total_time,
+        'throughput': len(latencies) / total_time,
+        'latency_p50': percentile(latencies, 50),
+        'latency_p99': percentile(latencies, 99),
+        'bytes': sum(size for _, _, _, size in app_runs),
+        'peak_rss_mb': max(peak_rss for _, peak_rss, _, _ in app_runs)
+    }
+
+
+def benchmark_receiver(dnac_url, work_dir, notifications, concurrency, server='dev', workers=2, threads=8):
+    """
+    Send {notifications} report notifications to the webhook receiver, the receiver downloads the reports from the
+    mock server
+    :param dnac_url: mock server URL
+    :param work_dir: folder for the receiver run
+    :param notifications: number of report notifications
+    :param concurrency: number of notifications sent at the same time
+    :param server: "dev" for the Flask development server, "gunicorn" for serve_receiver.py
+    :param workers: number of Gunicorn worker processes
+    :param threads: number of Gunicorn threads in each worker
+    :return: the benchmark results
+    """
+    run_dir = os.path.join(work_dir, 'receiver-' + server)
+    os.makedirs(run_dir)
+    port = free_port()
+    receiver_url = 'http://127.0.0.1:%d' % port
+    auth = HTTPBasicAuth(WEBHOOK_USERNAME, WEBHOOK_PASSWORD)
+    env = dict(os.environ, DNAC_URL=dnac_url, DNAC_USER='admin', DNAC_PASS='admin',
+               WEBHOOK_USERNAME=WEBHOOK_USERNAME, WEBHOOK_PASSWORD=WEBHOOK_PASSWORD,
+               PYTHONPATH=os.pathsep.join(filter(None, [REPO_DIR, os.environ.get('PYTHONPATH')])),
+               DEDUP_DB=os.path.join(run_dir, 'dedup.db'))
+    if server == 'gunicorn':
+        command = [sys.executable, SERVE_SCRIPT, '--bind', '127.0.0.1:%d' % port, '--workers', str(workers),
+                   '--threads', str(threads)]
+    else:
+        command = [sys.executable, '-c',
+                   'import report_receiver; report_receiver.app.run(host="127.0.0.1", port=%d, threaded=True)' % port]
+    receiver = start_process(command, run_dir, env, os.path.join(run_dir, 'receiver.log'))
+    try:
+        wait_for_url(receiver_url + '/', auth)
+        session = requests.Session()
+        host = dnac_url.split('://')[-1]
+
+        def send(number):
+            notification = build_notification(str(uuid.uuid4()), str(uuid.uuid4()), 'Benchmark %d' % number, host)
+            start = time.monotonic()
+            response = session.post(receiver_url + '/dnacenter_report', json=notification, auth=auth, timeout=30)
+            return time.monotonic() - start, response.status_code
+
+        start = time.monotonic()
+        with concurrent.futures.ThreadPoolExecutor(concurrency) as executor:
+            responses = list(executor.map(send, range(notifications)))
+        ack_time = time.monotonic() - start
+        accepted = len([status for _, status in responses if status == 202])
+
+        # wait for the report workers to download all the accepted reports, the /stats of a Gunicorn worker include
+        # only the reports of that worker, the downloaded reports are counted in the report store
+        deadline = time.monotonic() + RECEIVER_TIMEOUT
+        while True:
+            processed = len(glob.glob(os.path.join(run_dir, 'report_store', '*', '*.json*')))
+            if processed >= accepted or time.monotonic() > deadline:
+                break
+            time.sleep(0.1)
+        total_time = time.monotonic() - start
+    finally:
+        peak_rss = stop_process(receiver)
+
+    ack_latencies = [latency for latency, _ in responses]
+    return {
+        'scenario': 'receiver-' + server,
+        'notifications': notifications,
+        'concurrency': concurrency,
+        'accepted': accepted,
+        'processed': processed,
+        'failed': accepted - processed,
+        'total_time': total_time,
+        'throughput': processed / total_time,
+        'ack_throughput': notifications / ack_time,
+        'ack_latency_p50': percentile(ack_latencies, 50),
+        'ack_latency_p99': percentile(ack_latencies, 99),
+        'peak_rss_mb': peak_rss
+    }
+
+
+def print_results(results):
+    """
+    Print the benchmark results
+    :param results: the benchmark results
+    :return None
+    """
+    print('\nScenario:', results['scenario'])
+    for key, value in results.items():
+        if key == 'scenario':
+            continue
+        if isinstance(value, float):
+            value = '%.3f' % value
+        print('  %-16s %s' % (key, value))
+
+
+def main():
+    """
+    This application will benchmark the report apps against the mock Cisco DNA Center server:
+     - the download app, create report, poll the execution, download the report
+     - the webhook receiver, report notifications, report download by the report workers, with the Flask
+       development server or Gunicorn
+    and will record the throughput, the p50/p99 latency, and the peak RSS, in seconds and MB
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the report apps against the mock Cisco DNA Center')
+    parser.add_argument('--scenario', choices=['download', 'receiver', 'all'], default='all')
+    parser.add_argument('--runs', type=int, default=5, help='number of download app runs')
+    parser.add_argument('--notifications', type=int, default=50, help='number of notifications sent to the receiver')
+    parser.add_argument('--concurrency', type=int, default=1, help='number of app runs or notifications at a time')
+    parser.add_argument('--latency', type=float, default=0.05, help='mock API latency, in seconds')
+    parser.add_argument('--execution-time', type=float, default=2, help='mock report execution time, in seconds')
+    parser.add_argument('--clients', type=int, default=1000, help='number of clients in each mock report')
+    parser.add_argument('--server', choices=['dev', 'gunicorn', 'both'], default='dev',
+                        help='receiver server, Flask development server or Gunicorn (serve_receiver.py)')
+    parser.add_argument('--workers', type=int, default=2, help='number of Gunicorn worker processes')
+    parser.add_argument('--threads', type=int, default=8, help='number of Gunicorn threads in each worker')
+    parser.add_argument('--output', help='JSON file where to save the results, to compare with the next runs')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='report-benchmark-')
+    port = free_port()
+    dnac_url = 'http://127.0.0.1:%d' % port
+    mock_server = start_process(
+        [sys.executable, os.path.join(REPO_DIR, 'mock_dnac_server.py'), '--port', str(port),
+         '--latency', str(args.latency), '--execution-time', str(args.execution_time), '--clients', str(args.clients)],
+        work_dir, dict(os.environ), os.path.join(work_dir, 'mock_dnac_server.log'))
+    all_results = []
+    try:
+        wait_for_url(dnac_url + '/mock/stats')
+        print('Mock Cisco DNA Center:', dnac_url, ', work folder:', work_dir)
+        if args.scenario in ('download', 'all'):
+            all_results.append(benchmark_download(dnac_url, work_dir, args.runs, args.concurrency))
+            print_results(all_results[-1])
+        if args.scenario in ('receiver', 'all'):
+            for server in (['dev', 'gunicorn'] if args.server == 'both' else [args.server]):
+                all_results.append(benchmark_receiver(dnac_url, work_dir, args.notifications, args.concurrency,
+                                                      server=server, workers=args.workers, threads=args.threads))
+                print_results(all_results[-1])
+    finally:
+        stop_process(mock_server)
+
+    if args.output:
+        settings = {'latency': args.latency, 'execution_time': args.execution_time, 'clients': args.clients}
+        with open(args.output, 'w') as file:
+            json.dump({'created': time.time(), 'mock': settings, 'results': all_results}, file, indent=4)
+        print('\nResults saved to', args.output)
+
+
+if __name__ == '__main__':
+    main()
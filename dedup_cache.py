@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import collections
+import sqlite3
+import threading
+import time
+
+DEDUP_CACHE_SIZE = 10000  # max number of keys kept in memory
+DEDUP_TTL = 24 * 3600  # keys expire after 24 hours
+DEDUP_DB_SIZE = 1000000  # max number of keys kept in the database
+DEDUP_PRUNE_INTERVAL = 1000  # the expired keys are deleted from the database every 1000 notifications added
+
+
+class DedupCache:
+    """
+    Bounded LRU cache, with TTL, of the notifications already processed.
+    The keys are optionally saved to a SQLite database, so the duplicates are detected after a restart, and by all the
+    processes sharing the database, for example the Gunicorn workers. The check and the insert of the keys are one
+    SQLite transaction, the database write lock is held from the check to the insert.
+    """
+
+    def __init__(self, max_size=DEDUP_CACHE_SIZE, ttl=DEDUP_TTL, db_file=None, db_max_size=DEDUP_DB_SIZE,
+                 prune_interval=DEDUP_PRUNE_INTERVAL):
+        """
+        :param max_size: max number of keys kept in memory, the least recently seen keys are evicted
+        :param ttl: time after which a key is no longer a duplicate, in seconds
+        :param db_file: SQLite database file where to save the keys, the keys are kept only in memory if not provided
+        :param db_max_size: max number of keys kept in the database, the least recently seen keys are deleted
+        :param prune_interval: the expired keys, and the keys over {db_max_size}, are deleted from the database at
+        startup and every {prune_interval} notifications added
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.db_max_size = db_max_size
+        self.prune_interval = prune_interval
+        self.pruned = 0
+        self._added = 0
+        self.checked = 0
+        self.duplicates = 0
+        self._keys = collections.OrderedDict()  # key: time seen
+        self._lock = threading.Lock()
+        self._db = None
+        if db_file:
+            # autocommit mode, the transactions are started explicitly
+            self._db = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None, timeout=30)
+            self._db.execute('CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, seen REAL)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS seen_time ON seen (seen)')
+            self._db_prune(time.time())
+
+    def _seen(self, key, now):
+        # the lock is held by the caller
+        seen = self._keys.get(key)
+        if seen is None or now - seen > self.ttl:
+            return False
+        self._keys.move_to_end(key)
+        return True
+
+    def _add(self, key, now):
+        # the lock is held by the caller
+        self._keys[key] = now
+        self._keys.move_to_end(key)
+        while len(self._keys) > self.max_size:
+            self._keys.popitem(last=False)
+
+    def _db_prune(self, now):
+        """
+        Delete the expired keys, and the least recently seen keys over {db_max_size}, from the database
+        :param now: the current time
+        :return None
+        """
+        pruned = self._db.execute('DELETE FROM seen WHERE seen < ?', (now - self.ttl,)).rowcount
+        pruned += self._db.execute('DELETE FROM seen WHERE rowid IN (SELECT rowid FROM seen '
+                                   'ORDER BY seen DESC, rowid DESC LIMIT -1 OFFSET ?)', (self.db_max_size,)).rowcount
+        self.pruned += pruned
+
+    def _db_check_and_add(self, keys, now):
+        """
+        Insert the {keys} to the database, in one transaction, BEGIN IMMEDIATE takes the database write lock, so
+        another process can not add the same keys between the check and the insert
+        :param keys: the notification keys
+        :param now: the current time
+        :return: True if any of the keys was already in the database, the keys are not added
+        """
+        self._db.execute('BEGIN IMMEDIATE')
+        try:
+            self._db.executemany('DELETE FROM seen WHERE key = ? AND seen < ?',
+                                 [(key, now - self.ttl) for key in keys])
+            added = sum(self._db.execute('INSERT OR IGNORE INTO seen (key, seen) VALUES (?, ?)', (key, now)).rowcount
+                        for key in keys)
+        except BaseException:
+            self._db.execute('ROLLBACK')
+            raise
+        if added < len(keys):
+            self._db.execute('ROLLBACK')
+            return True
+        self._db.execute('COMMIT')
+        self._added += 1
+        if self._added % self.prune_interval == 0:
+            self._db_prune(now)
+        return False
+
+    def check_and_add(self, *keys):
+        """
+        Check if any of the {keys} was already seen, if not all the {keys} are saved
+        :param keys: the notification keys
+        :return: True if the notification is a duplicate
+        """
+        now = time.time()
+        with self._lock:
+            self.checked += 1
+            if any(self._seen(key, now) for key in keys) or \
+                    (self._db is not None and self._db_check_and_add(keys, now)):
+                self.duplicates += 1
+                return True
+            for key in keys:
+                self._add(key, now)
+            return False
+
+    def discard(self, *keys):
+        """
+        Remove the {keys}, for example when the notification was not processed and will be sent again
+        :param keys: the notification keys
+        :return None
+        """
+        with self._lock:
+            for key in keys:
+                self._keys.pop(key, None)
+                if self._db is not None:
+                    self._db.execute('DELETE FROM seen WHERE key = ?', (key,))
+
+    def stats(self):
+        """
+        :return: the number of keys in memory, notifications checked, duplicates suppressed and keys deleted from the
+        database
+        """
+        with self._lock:
+            return {
+                'size': len(self._keys),
+                'checked': self.checked,
+                'duplicates': self.duplicates,
+                'pruned': self.pruned
+            }
@@ -0,0 +1,349 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import time
+
+import requests
+import urllib3
+
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth  # for Basic Auth
+from urllib3.exceptions import InsecureRequestWarning  # for insecure https warnings
+
+import dnac_json
+from dnac_metrics import ApiMetrics
+from dnac_resilience import CircuitBreaker, DnacApiError, RetryPolicy
+from token_cache import TokenCache
+
+urllib3.disable_warnings(InsecureRequestWarning)  # disable insecure https warnings
+
+DEFAULT_POOL_SIZE = 10
+SITE_PAGE_SIZE = 500  # max number of sites in each API call
+
+
+class DnacClient:
+    """
+    Cisco DNA Center API client used by the report apps.
+    All the API calls share one requests.Session, the TCP/TLS connections to Cisco DNA Center are pooled and
+    kept alive between calls, instead of a new connection for each call.
+    The JWT token is cached, and requested again only when it expires or Cisco DNA Center rejects it.
+    The latency, bytes and status code of each API call are recorded to the ApiMetrics {metrics}, by operation.
+    The transient errors are retried by the {retry_policy}, and the {circuit_breaker} stops the API calls while
+    Cisco DNA Center is degraded.
+    """
+
+    def __init__(self, dnac_url, dnac_user, dnac_pass, pool_size=DEFAULT_POOL_SIZE, keep_alive=True, verify=False,
+                 token_cache=None, metrics=None, retry_policy=None, circuit_breaker=None):
+        """
+        :param dnac_url: Cisco DNA Center URL, for example https://10.93.141.35
+        :param dnac_user: Cisco DNA Center username
+        :param dnac_pass: Cisco DNA Center password
+        :param pool_size: max number of connections kept open to Cisco DNA Center
+        :param keep_alive: reuse the connections between the API calls
+        :param verify: verify the Cisco DNA Center certificate
+        :param token_cache: TokenCache to use, a new cache is created if not provided
+        :param metrics: ApiMetrics where to record the API calls, new metrics are created if not provided
+        :param retry_policy: RetryPolicy for the API calls, the default policy is used if not provided
+        :param circuit_breaker: CircuitBreaker to use, a new circuit breaker is created if not provided
+        """
+        self.dnac_url = dnac_url
+        self.dnac_auth = HTTPBasicAuth(dnac_user, dnac_pass)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.verify = verify
+        self.session.headers.update({'Content-Type': 'application/json'})
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+        self.token_cache = token_cache or TokenCache(self._request_token)
+        self.metrics = metrics or ApiMetrics()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+
+    def close(self):
+        """
+        Close all the pooled connections and stop the token refresh
+        :return None
+        """
+        self.token_cache.close()
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _request_token(self):
+        """
+        Create the authorization token required to access DNA C
+        :return: Cisco DNA Center JWT token
+        """
+        url = self.dnac_url + '/dna/system/api/v1/auth/token'
+        response = self._send('auth', 'POST', url, auth=self.dnac_auth)
+        dnac_jwt_token = self._json(response).get('Token')
+        if not dnac_jwt_token:
+            raise DnacApiError('Token not received, ' + response.text[:200], response=response)
+        return dnac_jwt_token
+
+    def get_dnac_jwt_token(self):
+        """
+        Return the cached authorization token, a new token is created only if the cached token expired
+        :return: Cisco DNA Center JWT token
+        """
+        return self.token_cache.get()
+
+    def _send(self, operation, method, url, **kwargs):
+        """
+        Send the request, retry the transient errors, and record the API call metrics. The streamed responses are
+        timed until the response headers are received, the content bytes are recorded when the report is downloaded.
+        :param operation: the API operation name, for the metrics and the retry policy
+        :param method: HTTP method
+        :param url: request URL
+        :return: the API response, raises CircuitOpenError if the circuit is open
+        """
+        data = kwargs.get('data')
+        bytes_sent = len(data) if isinstance(data, (str, bytes)) else 0
+        attempt = 0
+        while True:
+            self.circuit_breaker.before_call()
+            start = time.monotonic()
+            # any exception is a failure, not only the connection errors, the trial call of the half open circuit
+            # must always be recorded
+            failed = True
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException as error:
+                self.metrics.record_call(operation, 'error', time.monotonic() - start, bytes_sent)
+                if not self.retry_policy.should_retry(operation, attempt, error=error):
+                    raise
+                delay = self.retry_policy.delay(attempt)
+            else:
+                bytes_received = 0 if kwargs.get('stream') else len(response.content)
+                self.metrics.record_call(operation, response.status_code, time.monotonic() - start, bytes_sent,
+                                         bytes_received)
+                # 429 is the rate limit of a healthy Cisco DNA Center, it is retried but it is not a failure
+                failed = response.status_code in self.retry_policy.retry_statuses and response.status_code != 429
+                if not self.retry_policy.should_retry(operation, attempt, response=response):
+                    return response
+                delay = self.retry_policy.delay(attempt, response)
+                response.close()
+            finally:
+                if failed:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+            attempt += 1
+            time.sleep(delay)
+
+    @staticmethod
+    def _json(response):
+        """
+        Parse the API response
+        :param response: the API response
+        :return: the response payload, raises DnacApiError if the API call failed or the response is not JSON
+        """
+        if response.status_code >= 400:
+            raise DnacApiError('API call failed, status code ' + str(response.status_code) + ', ' +
+                               response.text[:200], response=response)
+        try:
+            return dnac_json.loads(response.content)
+        except ValueError:
+            raise DnacApiError('API response is not JSON, ' + response.text[:200], response=response)
+
+    def request(self, method, path, operation='other', **kwargs):
+        """
+        Send an authenticated request to Cisco DNA Center.
+        If the token is rejected with 401, a new token is requested and the request is sent one more time.
+        :param method: HTTP method
+        :param path: API resource path
+        :param operation: the API operation name, for the metrics
+        :return: the API response
+        """
+        url = self.dnac_url + path
+        headers = dict(kwargs.pop('headers', None) or {})
+        dnac_jwt_token = self.token_cache.get()
+        headers['X-Auth-Token'] = dnac_jwt_token
+        response = self._send(operation, method, url, headers=headers, **kwargs)
+        if response.status_code == 401:
+            response.close()
+            self.token_cache.invalidate(dnac_jwt_token)
+            headers['X-Auth-Token'] = self.token_cache.get()
+            response = self._send(operation, method, url, headers=headers, **kwargs)
+        return response
+
+    def get(self, path, operation='other', **kwargs):
+        """
+        Send a GET request to Cisco DNA Center
+        :param path: API resource path
+        :param operation: the API operation name, for the metrics
+        :return: the API response
+        """
+        return self.request('GET', path, operation, **kwargs)
+
+    def post(self, path, operation='other', **kwargs):
+        """
+        Send a POST request to Cisco DNA Center
+        :param path: API resource path
+        :param operation: the API operation name, for the metrics
+        :return: the API response
+        """
+        return self.request('POST', path, operation, **kwargs)
+
+    def get_report_view_groups(self):
+        """
+        This function will return the report view groups
+        :return: report view groups
+        """
+        response = self.get('/dna/intent/api/v1/data/view-groups', 'view_groups')
+        report_view_groups = self._json(response)
+        return report_view_groups
+
+    def get_report_view_ids(self, view_group_id):
+        """
+        This function will get return the views for the groups id {view_group_id}
+        :param view_group_id: report view group id
+        :return: the report view ids
+        """
+        response = self.get('/dna/intent/api/v1/data/view-groups/' + view_group_id, 'views')
+        report_view_ids = self._json(response)
+        return report_view_ids
+
+    def get_detailed_report_views(self, view_id, group_id):
+        """
+        This function will retrieve the view details for the view group id {group_id} and the view id {view_id}
+        :param view_id: report view id
+        :param group_id: report group id
+        :return: the report report view details
+        """
+        response = self.get('/dna/intent/api/v1/data/view-groups/' + group_id + '/views/' + view_id, 'view_details')
+        report_detailed_views = self._json(response)
+        return report_detailed_views
+
+    def create_report(self, payload):
+        """
+        This function will create a new Client Detail report
+        :param payload: request payload
+        :return: return the API response
+        """
+        response = self.post('/dna/intent/api/v1/data/reports', 'create_report', data=dnac_json.dumpb(payload))
+        if response.status_code == 200:
+            # the report execution duration is measured from the report submission
+            self.metrics.report_submitted(self._json(response).get('reportId'))
+        return response
+
+    def get_reports(self, view_group_id=None, view_id=None):
+        """
+        This function will return the reports, for the view group id {view_group_id} and the view id {view_id}
+        :param view_group_id: report view group id, all the view groups if not provided
+        :param view_id: report view id, all the views if not provided
+        :return: list of the reports
+        """
+        params = {key: value for key, value in (('viewGroupId', view_group_id), ('viewId', view_id)) if value}
+        response = self.get('/dna/intent/api/v1/data/reports', 'reports', params=params)
+        reports = self._json(response)
+        return reports
+
+    def execute_report(self, report_id):
+        """
+        This function will start a new execution of the existing report {report_id}
+        :param report_id: the report id
+        :return: return the API response
+        """
+        response = self.post('/dna/data/api/v1/flexible-report/report/' + report_id + '/execute', 'execute_report')
+        if response.status_code == 200:
+            # the report execution duration is measured from the execution start
+            self.metrics.report_submitted(report_id)
+        return response
+
+    def delete_report(self, report_id):
+        """
+        This function will delete the report {report_id} and its executions
+        :param report_id: the report id
+        :return: return the API response
+        """
+        response = self.request('DELETE', '/dna/intent/api/v1/data/reports/' + report_id, 'delete_report')
+        return response
+
+    def get_report_executions(self, report_id):
+        """
+        This function will get the report executions info for the {report_id}
+        :param report_id: the report id
+        :return: return the response payload
+        """
+        response = self.get('/dna/intent/api/v1/data/reports/' + report_id + '/executions', 'report_executions')
+        response_json = self._json(response)
+        return response_json
+
+    def get_report_file(self, report_id, execution_id):
+        """
+        This function will return the report content specified by the {report_id} and {execution_id}
+        :param report_id: report id
+        :param execution_id: execution id
+        :return: report data
+        """
+        response = self.get('/dna/intent/api/v1/data/reports/' + report_id + '/executions/' + execution_id,
+                            'report_file')
+        report = self._json(response)
+        return report
+
+    def stream_report_file(self, report_id, execution_id):
+        """
+        This function will return the streamed response for the report specified by the {report_id} and
+        {execution_id}, the report content is not loaded in memory
+        :param report_id: report id
+        :param execution_id: execution id
+        :return: the API response, the caller must close it
+        """
+        response = self.get('/dna/intent/api/v1/data/reports/' + report_id + '/executions/' + execution_id,
+                            'report_file', stream=True)
+        return response
+
+    def get_sites(self, page_size=SITE_PAGE_SIZE):
+        """
+        This function will return all the sites, the sites are requested in pages of {page_size} sites
+        :param page_size: number of sites in each API call
+        :return: list of the sites, with the site id and siteNameHierarchy
+        """
+        sites = []
+        while True:
+            response = self.get('/dna/intent/api/v1/site', 'sites',
+                                params={'offset': len(sites) + 1, 'limit': page_size})
+            page = self._json(response).get('response') or []
+            sites.extend(page)
+            if len(page) < page_size:
+                return sites
+
+    def get_destination_by_name(self, webhook_name):
+        """
+        This function will return the REST (webhook) configuration for the {webhook_name}
+        :param webhook_name: webhook name for which we will get the configuration
+        :return: webhook details
+        """
+        response = self.get('/dna/intent/api/v1/event/subscription-details/rest', 'subscription_details',
+                            params={'connectorType': 'REST', 'name': webhook_name})
+        response_json = self._json(response)
+        if not response_json:
+            raise DnacApiError('Webhook not found: ' + webhook_name, response=response)
+        webhook_info = response_json[0]
+        return webhook_info
@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import asyncio
+import copy
+import json
+import logging
+import os
+import re
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+from dnac_client import DEFAULT_POOL_SIZE, DnacClient
+from dnac_logging import setup_logging
+from report_catalog import ReportCatalog
+from report_orchestrator import OUTPUT_DIR, ReportOrchestrator, log_result
+from report_poller import HISTORY_FILE, ExecutionHistory, ExecutionPoller
+from report_profiles import ProfileHistory
+
+load_dotenv('environment.env')
+
+CLUSTERS_FILE = os.getenv('CLUSTERS_FILE', 'clusters.json')  # inventory of the Cisco DNA Center clusters
+MAX_CONCURRENCY = int(os.getenv('CLUSTERS_MAX_CONCURRENCY', '20'))  # max reports in progress, all the clusters
+CLUSTER_CONCURRENCY = 5  # max reports in progress for each cluster, if not in the inventory
+CLUSTER_NAME = re.compile(r'^[\w.-]+$')  # the cluster name is used in the output file names
+
+logger = logging.getLogger(__name__)
+
+
+def get_credential(cluster, key):
+    """
+    Read the cluster {key} from the inventory, or from the environment variable named by "{key}_env"
+    :param cluster: cluster inventory entry
+    :param key: "username" or "password"
+    :return: the credential
+    """
+    if cluster.get(key + '_env'):
+        value = os.getenv(cluster[key + '_env'])
+        if value is None:
+            raise ValueError('Cluster ' + cluster['name'] + ', environment variable not set: ' +
+                             cluster[key + '_env'])
+        return value
+    if cluster.get(key) is None:
+        raise ValueError('Cluster ' + cluster['name'] + ', ' + key + ' or ' + key + '_env required')
+    return cluster[key]
+
+
+def load_inventory(filename=CLUSTERS_FILE):
+    """
+    Load the Cisco DNA Center clusters inventory, a JSON file with a list of clusters:
+    [{"name": "sjc", "url": "https://10.93.141.35", "username": "admin", "password_env": "DNAC_SJC_PASS",
+      "pool_size": 10, "concurrency": 5, "verify": false}]
+    The credentials are read from the inventory, or from the environment variables "username_env" and "password_env".
+    :param filename: inventory file
+    :return: list of the clusters, with the credentials
+    """
+    with open(filename) as file:
+        inventory = json.load(file)
+    clusters = []
+    names = set()
+    for cluster in inventory:
+        name = cluster.get('name')
+        if not name or not CLUSTER_NAME.match(name):
+            raise ValueError('Invalid cluster name: ' + str(name))
+        if name in names:
+            raise ValueError('Duplicate cluster name: ' + name)
+        if not cluster.get('url'):
+            raise ValueError('Cluster ' + name + ', url required')
+        names.add(name)
+        clusters.append(dict(cluster, username=get_credential(cluster, 'username'),
+                             password=get_credential(cluster, 'password')))
+    return clusters
+
+
+def cluster_specs(specs, cluster_name):
+    """
+    Tag the report spec output files with the cluster name, the same reports are created in all the clusters
+    :param specs: list of report specs
+    :param cluster_name: cluster name
+    :return: the report specs for the cluster
+    """
+    specs = copy.deepcopy(specs)
+    for spec in specs:
+        if spec.get('output'):
+            root, extension = os.path.splitext(spec['output'])
+            spec['output'] = root + '-' + cluster_name + extension
+    return specs
+
+
+def get_history_file(cluster_name):
+    """
+    :param cluster_name: cluster name
+    :return: the execution history file of the cluster, the execution durations are different for each cluster
+    """
+    root, extension = os.path.splitext(HISTORY_FILE)
+    return root + '-' + cluster_name + extension
+
+
+class DnacCluster:
+    """
+    One Cisco DNA Center cluster: the API client, with its own connection pool and token cache, the report catalog
+    and the report orchestrator. The reports are saved to the {output_dir}/{name} folder.
+    """
+
+    def __init__(self, cluster, output_dir=OUTPUT_DIR, profile_history=None, refresh_catalog=False):
+        """
+        :param cluster: cluster inventory entry, from load_inventory
+        :param output_dir: folder where to save the reports, one sub folder for each cluster
+        :param profile_history: ProfileHistory shared by the clusters
+        :param refresh_catalog: discover the report view groups and views again
+        """
+        self.name = cluster['name']
+        concurrency = cluster.get('concurrency', CLUSTER_CONCURRENCY)
+        self.dnac = DnacClient(cluster['url'], cluster['username'], cluster['password'],
+                               pool_size=cluster.get('pool_size', max(concurrency, DEFAULT_POOL_SIZE)),
+                               verify=cluster.get('verify', False))
+        self.orchestrator = ReportOrchestrator(
+            self.dnac, max_concurrency=concurrency, output_dir=os.path.join(output_dir, self.name),
+            poller=ExecutionPoller(self.dnac, history=ExecutionHistory(get_history_file(self.name))),
+            catalog=ReportCatalog(self.dnac, refresh=refresh_catalog), profile_history=profile_history,
+            history_scope=self.name)
+
+    async def run(self, specs, global_semaphore=None, on_complete=None):
+        """
+        Run all the reports in {specs} on this cluster
+        :param specs: list of report specs
+        :param global_semaphore: limits the number of reports in progress in all the clusters
+        :param on_complete: function called with each report result, tagged with the cluster name
+        :return: the cluster summary, with the report results and timing
+        """
+        def tag_result(result):
+            result['cluster'] = self.name
+            if on_complete:
+                on_complete(result)
+
+        results, total_time = await self.orchestrator.run(cluster_specs(specs, self.name), on_complete=tag_result,
+                                                          global_semaphore=global_semaphore)
+        completed = [result for result in results if result['status'] == 'SUCCESS']
+        return {
+            'cluster': self.name,
+            'dnac_url': self.dnac.dnac_url,
+            'reports': len(results),
+            'completed': len(completed),
+            'failed': len(results) - len(completed),
+            'bytes': sum(result['size'] for result in completed),
+            'total_time': total_time,
+            'max_execution_time': max((result['execution_time'] for result in completed), default=0),
+            'max_download_time': max((result['download_time'] for result in completed), default=0),
+            'results': results
+        }
+
+    def close(self):
+        self.dnac.close()
+
+
+class ClusterFanout:
+    """
+    Run the same reports on many Cisco DNA Center clusters at the same time. The reports of all the clusters share
+    the {max_concurrency} limit, and each cluster has its own limit, from the inventory. The run time is the time of
+    the slowest cluster, not the sum of the clusters.
+    """
+
+    def __init__(self, clusters, max_concurrency=MAX_CONCURRENCY, output_dir=OUTPUT_DIR, refresh_catalog=False):
+        """
+        :param clusters: list of the clusters, from load_inventory
+        :param max_concurrency: max number of reports in progress, all the clusters
+        :param output_dir: folder where to save the reports, one sub folder for each cluster
+        :param refresh_catalog: discover the report view groups and views again
+        """
+        self.max_concurrency = max_concurrency
+        profile_history = ProfileHistory()
+        self.clusters = [DnacCluster(cluster, output_dir, profile_history, refresh_catalog) for cluster in clusters]
+
+    async def run(self, specs, on_complete=None):
+        """
+        Run all the reports in {specs} on all the clusters
+        :param specs: list of report specs
+        :param on_complete: function called with each report result, tagged with the cluster name
+        :return: the cluster summaries, in the inventory order, and the total time
+        """
+        # the API calls and the downloads run in threads, enough threads for all the reports in progress
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=self.max_concurrency + 4))
+        global_semaphore = asyncio.Semaphore(self.max_concurrency)
+        start = time.monotonic()
+        summaries = await asyncio.gather(*[cluster.run(specs, global_semaphore, on_complete)
+                                           for cluster in self.clusters])
+        return list(summaries), time.monotonic() - start
+
+    def close(self):
+        for cluster in self.clusters:
+            cluster.close()
+
+
+def log_cluster_timing(summaries, total_time):
+    """
+    Log the timing of each cluster, the slowest cluster first, and the run time compared with running the clusters
+    one after another
+    :param summaries: the cluster summaries
+    :param total_time: the run time
+    :return None
+    """
+    for summary in sorted(summaries, key=lambda item: item['total_time'], reverse=True):
+        logger.info('Cluster timing', extra={
+            'cluster': summary['cluster'], 'reports': summary['reports'], 'completed': summary['completed'],
+            'failed': summary['failed'], 'bytes': summary['bytes'], 'total_time': round(summary['total_time'], 1),
+            'max_execution_time': round(summary['max_execution_time'], 1),
+            'max_download_time': round(summary['max_download_time'], 1)})
+    logger.info('Clusters completed', extra={
+        'clusters': len(summaries), 'total_time': round(total_time, 1),
+        'slowest_cluster_time': round(max((summary['total_time'] for summary in summaries), default=0), 1),
+        'sum_cluster_time': round(sum(summary['total_time'] for summary in summaries), 1)})
+
+
+def main():
+    """
+    This application will create the reports from a JSON file with a list of report specs on all the Cisco DNA Center
+    clusters in the inventory at the same time, and save the reports of each cluster to its own folder
+    """
+    parser = argparse.ArgumentParser(description='Create and download the reports on many Cisco DNA Center clusters')
+    parser.add_argument('specs', help='JSON file with the list of report specs')
+    parser.add_argument('--inventory', default=CLUSTERS_FILE, help='JSON file with the list of clusters')
+    parser.add_argument('--clusters', help='comma separated cluster names, all the clusters if not provided')
+    parser.add_argument('--concurrency', type=int, default=MAX_CONCURRENCY,
+                        help='max number of reports in progress, all the clusters')
+    parser.add_argument('--output-dir', default=OUTPUT_DIR, help='folder where to save the reports')
+    parser.add_argument('--refresh-catalog', action='store_true',
+                        help='discover the report view groups and views again, do not use the cached catalog')
+    parser.add_argument('--timing-file', help='JSON file where to save the cluster timing and report results')
+    args = parser.parse_args()
+
+    with open(args.specs) as file:
+        specs = json.load(file)
+    clusters = load_inventory(args.inventory)
+    if args.clusters:
+        names = set(args.clusters.split(','))
+        unknown = names - {cluster['name'] for cluster in clusters}
+        if unknown:
+            parser.error('Clusters not in the inventory: ' + ', '.join(sorted(unknown)))
+        clusters = [cluster for cluster in clusters if cluster['name'] in names]
+
+    setup_logging()
+    logger.info('Cluster Reports App Run Start', extra={'clusters': len(clusters), 'reports': len(specs),
+                                                        'concurrency': args.concurrency})
+
+    fanout = ClusterFanout(clusters, max_concurrency=args.concurrency, output_dir=args.output_dir,
+                           refresh_catalog=args.refresh_catalog)
+    try:
+        summaries, total_time = asyncio.run(fanout.run(specs, on_complete=log_result))
+    finally:
+        fanout.close()
+
+    log_cluster_timing(summaries, total_time)
+    for cluster, summary in zip(fanout.clusters, summaries):
+        logger.info('Cisco DNA Center API metrics', extra={'cluster': summary['cluster'],
+                                                           'metrics': cluster.dnac.metrics.summary()})
+    if args.timing_file:
+        with open(args.timing_file, 'w') as file:
+            json.dump({'total_time': total_time, 'clusters': summaries}, file, indent=4)
+    logger.info('Cluster Reports App Run End')
+
+
+if __name__ == '__main__':
+    main()
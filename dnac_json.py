@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import io
+import json
+
+try:
+    import orjson
+except ImportError:  # the fast JSON codec is optional, the stdlib json module is used if not installed
+    orjson = None
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+
+def loads(data):
+    """
+    Decode the JSON data
+    :param data: JSON data, bytes or str
+    :return: the decoded data, raises ValueError if the data is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumpb(obj):
+    """
+    Encode the data to JSON, compact format
+    :param obj: data to encode
+    :return: UTF-8 encoded JSON, bytes
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # not supported by orjson, for example integers larger than 64 bits
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def dumps(obj):
+    """
+    Encode the data to JSON, compact format
+    :param obj: data to encode
+    :return: JSON, str
+    """
+    return dumpb(obj).decode('utf-8')
+
+
+def load(file):
+    """
+    Decode the JSON data from the file
+    :param file: binary or text file object
+    :return: the decoded data
+    """
+    return loads(file.read())
+
+
+def dump(obj, file):
+    """
+    Encode the data to JSON and write it to the file, the JSON bytes are written as is to the binary files
+    :param obj: data to encode
+    :param file: binary or text file object
+    :return None
+    """
+    if isinstance(file, io.TextIOBase) or 'b' not in getattr(file, 'mode', 'b'):
+        file.write(dumps(obj))
+    else:
+        file.write(dumpb(obj))
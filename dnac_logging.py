@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+import time
+
+from logging.handlers import QueueHandler, QueueListener
+
+import dnac_json
+
+LOG_FILE = os.getenv('LOG_FILE', 'application_run.log')  # JSON lines log file, empty to log only to the console
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_LEVELS = os.getenv('LOG_LEVELS', '')  # per module levels, for example "dnac_client=DEBUG,urllib3=WARNING"
+LOG_CONSOLE_FORMAT = os.getenv('LOG_CONSOLE_FORMAT', 'text')  # console log format, "text" or "json"
+TEXT_FORMAT = '%(asctime)s.%(msecs)03d %(levelname)s %(module)s - %(funcName)s: %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+MAX_TEXT_LENGTH = 200  # the text longer than this is truncated in the log messages
+
+# the standard log record attributes, the other attributes are the fields provided with "extra"
+RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+_listener = None
+
+
+def truncate(text, max_length=MAX_TEXT_LENGTH):
+    """
+    Size-bounded text for the log messages, for example an API response
+    :param text: text to log
+    :param max_length: max length
+    :return: the text, truncated to {max_length} characters, with the original length
+    """
+    text = str(text)
+    if len(text) <= max_length:
+        return text
+    return text[:max_length] + '... (' + str(len(text)) + ' characters)'
+
+
+def get_extra_fields(record):
+    """
+    :param record: log record
+    :return: dict with the fields provided with "extra", for example report_id, execution_id, bytes
+    """
+    return {key: value for key, value in vars(record).items() if key not in RECORD_ATTRIBUTES}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format the log records as JSON lines, with the time, level, logger, function, message, the "extra" fields and
+    the exception
+    """
+
+    def format(self, record):
+        entry = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record.created)) + '.%03d' % record.msecs,
+            'level': record.levelname,
+            'logger': record.name,
+            'function': record.funcName,
+            'thread': record.threadName,
+            'message': record.getMessage()
+        }
+        entry.update(get_extra_fields(record))
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        try:
+            return dnac_json.dumps(entry)
+        except TypeError:
+            return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """
+    Format the log records as text, the "extra" fields are added as key=value
+    """
+
+    def __init__(self):
+        super().__init__(TEXT_FORMAT, DATE_FORMAT)
+
+    def format(self, record):
+        text = super().format(record)
+        extra_fields = get_extra_fields(record)
+        if extra_fields:
+            fields = ' '.join(key + '=' + (value if isinstance(value, str) else json.dumps(value, default=str))
+                              for key, value in extra_fields.items())
+            first_line, _, other_lines = text.partition('\n')
+            text = first_line + ' ' + fields + ('\n' + other_lines if other_lines else '')
+        return text
+
+
+class LogQueueHandler(QueueHandler):
+    """
+    Add the log records to the queue, the records are formatted and written by the QueueListener thread.
+    The message arguments are merged and the exception traceback is formatted before the record is queued, in the
+    application thread that logs the record: the arguments may change and the traceback frames are released after
+    the logging call. The "extra" fields are kept for the JSON format.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def parse_module_levels(module_levels):
+    """
+    :param module_levels: per module levels, for example "dnac_client=DEBUG,urllib3=WARNING"
+    :return: dict logger name: level
+    """
+    levels = {}
+    for item in module_levels.split(','):
+        if not item.strip():
+            continue
+        name, _, level = item.partition('=')
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging(log_file=LOG_FILE, level=LOG_LEVEL, module_levels=LOG_LEVELS, console_format=LOG_CONSOLE_FORMAT):
+    """
+    Configure the logging: the log records are added to a queue, and written to the console and the {log_file} by a
+    QueueListener thread, the console and file I/O do not block the application threads
+    :param log_file: JSON lines log file, None to log only to the console
+    :param level: the root logger level
+    :param module_levels: per module levels, dict logger name: level, or text "dnac_client=DEBUG,urllib3=WARNING"
+    :param console_format: the console log format, "text" or "json"
+    :return: the QueueListener, stopped at exit by stop_logging
+    """
+    global _listener
+    stop_logging()
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(JsonFormatter() if console_format == 'json' else TextFormatter())
+    handlers = [console_handler]
+    if log_file:
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+
+    log_queue = queue.Queue()
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(LogQueueHandler(log_queue))
+    root_logger.setLevel(level.upper())
+    if isinstance(module_levels, str):
+        module_levels = parse_module_levels(module_levels)
+    for name, module_level in (module_levels or {}).items():
+        logging.getLogger(name).setLevel(module_level)
+    _listener.start()
+    return _listener
+
+
+@atexit.register
+def stop_logging():
+    """
+    Write the log records still in the queue and stop the QueueListener thread
+    :return None
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
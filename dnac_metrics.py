@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import bisect
+import collections
+import threading
+import time
+
+# histogram buckets, in seconds
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+EXECUTION_BUCKETS = [5, 10, 30, 60, 120, 300, 600, 1200, 1800, 3600]
+DOWNLOAD_BUCKETS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600]
+
+
+class Histogram:
+    """
+    Cumulative histogram, same buckets as the Prometheus histograms, with the sum, count and max of the values
+    """
+
+    def __init__(self, buckets):
+        """
+        :param buckets: the bucket upper bounds, sorted
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q):
+        """
+        Estimate the quantile from the buckets, with linear interpolation inside the bucket
+        :param q: the quantile, for example 0.99
+        :return: the estimated value, None if there are no values
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - cumulative) / count, self.max)
+            cumulative += count
+        return self.max
+
+    def summary(self):
+        """
+        :return: the count, average, p50, p99 and max
+        """
+        return {
+            'count': self.count,
+            'avg': self.sum / self.count if self.count else None,
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99),
+            'max': self.max
+        }
+
+    def prometheus(self, name, labels=''):
+        """
+        :param name: metric name
+        :param labels: metric labels, for example 'operation="auth"'
+        :return: the histogram lines, in the Prometheus text format
+        """
+        separator = ',' if labels else ''
+        lines = []
+        cumulative = 0
+        for bucket, count in zip(self.buckets + ['+Inf'], self.counts):
+            cumulative += count
+            lines.append('%s_bucket{%s%sle="%s"} %d' % (name, labels, separator, bucket, cumulative))
+        labels = '{' + labels + '}' if labels else ''
+        lines.append('%s_sum%s %s' % (name, labels, repr(self.sum)))
+        lines.append('%s_count%s %d' % (name, labels, self.count))
+        return lines
+
+
+class ApiMetrics:
+    """
+    Thread safe metrics of the Cisco DNA Center API calls, by operation:
+     - the API call latency histogram, the bytes sent and received, and the status codes
+     - the report execution duration, from the report submission to the execution completed
+     - the report download duration
+    """
+
+    def __init__(self):
+        self._latency = collections.defaultdict(lambda: Histogram(LATENCY_BUCKETS))  # operation: histogram
+        self._status = collections.Counter()  # (operation, status code): count
+        self._bytes_sent = collections.Counter()  # operation: bytes
+        self._bytes_received = collections.Counter()  # operation: bytes
+        self._executions = collections.defaultdict(lambda: Histogram(EXECUTION_BUCKETS))  # status: histogram
+        self._downloads = Histogram(DOWNLOAD_BUCKETS)
+        self._submitted = {}  # report id: submit time
+        self._lock = threading.Lock()
+
+    def record_call(self, operation, status, latency, bytes_sent=0, bytes_received=0):
+        """
+        Record one API call
+        :param operation: the API operation, for example "create_report"
+        :param status: the response status code, or "error" if no response was received
+        :param latency: the API call time, in seconds
+        :param bytes_sent: request body size
+        :param bytes_received: response body size
+        :return None
+        """
+        with self._lock:
+            self._latency[operation].observe(latency)
+            self._status[(operation, str(status))] += 1
+            self._bytes_sent[operation] += bytes_sent
+            self._bytes_received[operation] += bytes_received
+
+    def record_download(self, operation, size, duration):
+        """
+        Record a streamed report download, the report file bytes are read after the API call completed
+        :param operation: the API operation
+        :param size: the report file size, in bytes
+        :param duration: the download time, in seconds
+        :return None
+        """
+        with self._lock:
+            self._bytes_received[operation] += size
+            self._downloads.observe(duration)
+
+    def report_submitted(self, report_id):
+        """
+        Save the report submission time, for the report execution duration
+        :param report_id: the report id
+        :return None
+        """
+        with self._lock:
+            self._submitted[report_id] = time.monotonic()
+
+    def report_completed(self, report_id, status):
+        """
+        Record the report execution duration, from the report submission to the execution completed
+        :param report_id: the report id
+        :param status: the execution status, for example "SUCCESS"
+        :return None
+        """
+        with self._lock:
+            submit_time = self._submitted.pop(report_id, None)
+            if submit_time is not None:
+                self._executions[status].observe(time.monotonic() - submit_time)
+
+    def summary(self):
+        """
+        :return: dict with the API calls by operation, the report executions by status, and the report downloads
+        """
+        with self._lock:
+            api = {}
+            for operation, histogram in sorted(self._latency.items()):
+                api[operation] = dict(
+                    histogram.summary(),
+                    status={status: count for (status_operation, status), count in sorted(self._status.items())
+                            if status_operation == operation},
+                    bytes_sent=self._bytes_sent[operation],
+                    bytes_received=self._bytes_received[operation])
+            return {
+                'api': api,
+                'report_executions': {status: histogram.summary() for status, histogram in self._executions.items()},
+                'report_downloads': self._downloads.summary()
+            }
+
+    def prometheus(self):
+        """
+        :return: all the metrics, in the Prometheus text format
+        """
+        with self._lock:
+            lines = ['# HELP dnac_api_request_duration_seconds Cisco DNA Center API call latency',
+                     '# TYPE dnac_api_request_duration_seconds histogram']
+            for operation, histogram in sorted(self._latency.items()):
+                lines += histogram.prometheus('dnac_api_request_duration_seconds', 'operation="%s"' % operation)
+            lines += ['# HELP dnac_api_requests_total Cisco DNA Center API calls, by status code',
+                      '# TYPE dnac_api_requests_total counter']
+            for (operation, status), count in sorted(self._status.items()):
+                lines.append('dnac_api_requests_total{operation="%s",status="%s"} %d' % (operation, status, count))
+            lines += ['# HELP dnac_api_request_bytes_total Cisco DNA Center API request body bytes',
+                      '# TYPE dnac_api_request_bytes_total counter']
+            for operation, size in sorted(self._bytes_sent.items()):
+                lines.append('dnac_api_request_bytes_total{operation="%s"} %d' % (operation, size))
+            lines += ['# HELP dnac_api_response_bytes_total Cisco DNA Center API response body bytes',
+                      '# TYPE dnac_api_response_bytes_total counter']
+            for operation, size in sorted(self._bytes_received.items()):
+                lines.append('dnac_api_response_bytes_total{operation="%s"} %d' % (operation, size))
+            lines += ['# HELP dnac_report_execution_duration_seconds Report submission to execution completed',
+                      '# TYPE dnac_report_execution_duration_seconds histogram']
+            for status, histogram in sorted(self._executions.items()):
+                lines += histogram.prometheus('dnac_report_execution_duration_seconds', 'status="%s"' % status)
+            lines += ['# HELP dnac_report_download_duration_seconds Report file download time',
+                      '# TYPE dnac_report_download_duration_seconds histogram']
+            lines += self._downloads.prometheus('dnac_report_download_duration_seconds')
+        return '\n'.join(lines) + '\n'
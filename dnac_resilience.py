@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import email.utils
+import random
+import threading
+import time
+
+import requests
+
+MAX_RETRIES = 4
+BACKOFF = 0.5  # first retry delay, in seconds
+MAX_BACKOFF = 30  # max retry delay, in seconds
+MAX_RETRY_AFTER = 120  # max delay accepted from the Retry-After header, in seconds
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# the operations that change Cisco DNA Center, retried only if the request was not processed
+NON_IDEMPOTENT_OPERATIONS = {'create_report', 'execute_report'}
+
+FAILURE_THRESHOLD = 5  # consecutive failures that open the circuit
+RESET_TIMEOUT = 30  # time the circuit stays open before a trial call, in seconds
+
+
+class DnacApiError(requests.exceptions.RequestException):
+    """
+    Cisco DNA Center returned an error, or a response that is not the expected API response
+    """
+
+
+class CircuitOpenError(DnacApiError):
+    """
+    The API call was not sent, the circuit is open while Cisco DNA Center is degraded
+    """
+
+
+def get_retry_after(response):
+    """
+    Read the Retry-After header, in seconds or HTTP date format
+    :param response: the API response
+    :return: the time to wait, in seconds, None if there is no valid Retry-After header
+    """
+    retry_after = response.headers.get('Retry-After')
+    if not retry_after:
+        return None
+    try:
+        return max(float(retry_after), 0)
+    except ValueError:
+        pass
+    try:
+        return max(email.utils.parsedate_to_datetime(retry_after).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Retry the API calls that failed with a transient error, connection errors, 5xx and 429 (rate limit) responses,
+    with jittered exponential backoff, or the time requested by the Retry-After header.
+    The non idempotent operations, for example create_report, are retried only when Cisco DNA Center did not process
+    the request: the connection was not established, or the request was rejected with 429.
+    """
+
+    def __init__(self, max_retries=MAX_RETRIES, backoff=BACKOFF, max_backoff=MAX_BACKOFF,
+                 max_retry_after=MAX_RETRY_AFTER, retry_statuses=RETRY_STATUSES,
+                 non_idempotent_operations=NON_IDEMPOTENT_OPERATIONS):
+        """
+        :param max_retries: max number of retries for each API call
+        :param backoff: first retry delay, doubled for each retry, in seconds
+        :param max_backoff: max retry delay, in seconds
+        :param max_retry_after: max delay accepted from the Retry-After header, in seconds
+        :param retry_statuses: the response status codes retried
+        :param non_idempotent_operations: the operations not retried if the request may have been processed
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = retry_statuses
+        self.non_idempotent_operations = non_idempotent_operations
+
+    def should_retry(self, operation, attempt, response=None, error=None):
+        """
+        :param operation: the API operation name
+        :param attempt: the number of retries already done
+        :param response: the API response, None if the request failed
+        :param error: the request error, None if a response was received
+        :return: True if the API call should be sent again
+        """
+        if attempt >= self.max_retries:
+            return False
+        idempotent = operation not in self.non_idempotent_operations
+        if error is not None:
+            if isinstance(error, CircuitOpenError):
+                return False
+            if isinstance(error, requests.exceptions.ConnectTimeout):
+                return True  # the request was not sent
+            return idempotent and isinstance(error, (requests.exceptions.ConnectionError,
+                                                     requests.exceptions.Timeout))
+        if response.status_code == 429:
+            return True  # the request was rejected, not processed
+        return idempotent and response.status_code in self.retry_statuses
+
+    def delay(self, attempt, response=None):
+        """
+        :param attempt: the number of retries already done
+        :param response: the API response, the Retry-After header is used if provided
+        :return: the time to wait before the retry, in seconds
+        """
+        if response is not None:
+            retry_after = get_retry_after(response)
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_after)
+        # full jitter, the clients retrying at the same time are spread over the backoff interval
+        return random.uniform(0, min(self.backoff * 2 ** attempt, self.max_backoff))
+
+
+class CircuitBreaker:
+    """
+    Stop sending API calls while Cisco DNA Center is degraded.
+    The circuit opens after {failure_threshold} consecutive failures, the API calls fail right away with
+    CircuitOpenError for {reset_timeout} seconds, then one trial call is sent: the circuit closes if it succeeds, or
+    opens again if it fails.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        """
+        :param failure_threshold: consecutive failures that open the circuit
+        :param reset_timeout: time the circuit stays open before a trial call, in seconds
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened = 0  # number of times the circuit opened
+        self.rejected = 0  # number of API calls not sent
+        self._opened_at = 0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """
+        Check if the API call can be sent
+        :return None, raises CircuitOpenError if the circuit is open
+        """
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial = False
+            if self.state == self.HALF_OPEN and not self._trial:
+                self._trial = True  # only one trial call
+                return
+            if self.state != self.CLOSED:
+                self.rejected += 1
+                raise CircuitOpenError('Cisco DNA Center API calls suspended, circuit open after ' +
+                                       str(self.failures) + ' failures')
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and
+                                                self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self.opened += 1
+                self._opened_at = time.monotonic()
+
+    def stats(self):
+        """
+        :return: the circuit state, consecutive failures, number of times opened and API calls rejected
+        """
+        with self._lock:
+            return {
+                'state': self.state,
+                'failures': self.failures,
+                'opened': self.opened,
+                'rejected': self.rejected
+            }
@@ -20,149 +20,61 @@ __version__ = "0.1.0"
 __copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
 __license__ = "Cisco Sample Code License, Version 1.1"
 
-import datetime
+import argparse
 import logging
 import os
 import time
-import urllib3
-import json
+
 import requests
 
-from datetime import datetime
 from dotenv import load_dotenv
-from requests.auth import HTTPBasicAuth  # for Basic Auth
-from urllib3.exceptions import InsecureRequestWarning  # for insecure https warnings
+
+import dnac_json
+from dnac_client import DnacClient
+from dnac_logging import setup_logging, truncate
+from report_catalog import ReportCatalog
+from report_definitions import (DEFAULT_PROFILE, FIELD_PROFILES, build_report_request, get_profile_fields,
+                                get_view_fields)
+from report_delta import DeltaStore
+from report_download import ReportDownloadError
+from report_index import ReportIndex
+from report_poller import ExecutionPoller, ReportExecutionError
+from report_profiles import ProfileHistory
+from report_registry import ReportRegistry
+from report_store import REPORT_COMPRESSION, RETENTION_DAYS, ReportStore
 
 load_dotenv('environment.env')
 
 DNAC_URL = os.getenv('DNAC_URL')
 DNAC_USER = os.getenv('DNAC_USER')
 DNAC_PASS = os.getenv('DNAC_PASS')
+DNAC_POOL_SIZE = int(os.getenv('DNAC_POOL_SIZE', '10'))  # max connections kept open to Cisco DNA Center
 
 os.environ['TZ'] = 'America/Los_Angeles'  # define the timezone for PST
 time.tzset()  # adjust the timezone, more info https://help.pythonanywhere.com/pages/SettingTheTimezone/
 
-urllib3.disable_warnings(InsecureRequestWarning)  # disable insecure https warnings
-
-
-DNAC_AUTH = HTTPBasicAuth(DNAC_USER, DNAC_PASS)
 
 REPORT_CATEGORY = 'Client'
 VIEW_NAME = 'Client Detail'
 WEBHOOK_NAME = 'LinuxMint_Report'
 REPORT_NAME = 'Client Report Detail 24 h'
 WEBHOOK_DELIVERY = True
+REPORT_STORE = os.getenv('REPORT_STORE', 'report_store')  # folder where the report executions are saved
+REPORT_COMPRESSION = os.getenv('REPORT_COMPRESSION', REPORT_COMPRESSION)  # zstd, gzip or none
+REPORT_RETENTION_DAYS = int(os.getenv('REPORT_RETENTION_DAYS', str(RETENTION_DAYS)))  # the older reports are deleted
+REPORT_STORE_MAX_MB = os.getenv('REPORT_STORE_MAX_MB')  # optional max size of the saved reports, in MB
+REPORT_INDEX_DB = 'report_index.db'
+REPORT_PROFILE = os.getenv('REPORT_PROFILE', DEFAULT_PROFILE)  # the report fields, from the field profiles
 
+POLL_MAX_INTERVAL = 30  # max time between the report execution status checks, in seconds
+POLL_DEADLINE = 3600  # max time to wait for the report execution to complete, in seconds
 
-def pprint(json_data):
-    """
-    Pretty print JSON formatted data
-   :param json_data: data to pretty print
-   :return None
-    """
-    print(json.dumps(json_data, indent=4, separators=(', ', ': ')))
-
-
-def get_dnac_jwt_token(dnac_auth):
-    """
-    Create the authorization token required to access DNA C
-   :param dnac_auth - Cisco DNA Center Basic Auth string
-   :return: Cisco DNA Center JWT token
-    """
-    url = DNAC_URL + '/dna/system/api/v1/auth/token'
-    header = {'content-type': 'application/json'}
-    response = requests.post(url, auth=dnac_auth, headers=header, verify=False)
-    dnac_jwt_token = response.json()['Token']
-    return dnac_jwt_token
-
-
-def get_report_view_groups(dnac_auth):
-    """
-    This function will return the report view groups
-   :param dnac_auth: Cisco DNA Center Auth
-   :return: report view groups
-    """
-    url = DNAC_URL + '/dna/intent/api/v1/data/view-groups'
-    header = {'Content-Type': 'application/json', 'X-Auth-Token': dnac_auth}
-    response = requests.get(url, headers=header, verify=False)
-    report_view_groups = response.json()
-    return report_view_groups
-
-
-def get_report_view_ids(view_group_id, dnac_auth):
-    """
-    This function will get return the views for the groups id {view_group_id}
-   :param view_group_id: report view group id
-   :param dnac_auth: Cisco DNA Center Auth
-   :return: the report view ids
-    """
-    url = DNAC_URL + '/dna/intent/api/v1/data/view-groups/' + view_group_id
-    header = {'Content-Type': 'application/json', 'X-Auth-Token': dnac_auth}
-    response = requests.get(url, headers=header, verify=False)
-    report_view_ids = response.json()
-    return report_view_ids
-
-
-def get_detailed_report_views(view_id, group_id, dnac_auth):
-    """
-    This function will retrieve the view details for the view group id {group_id} and the view id {view_id}
-   :param view_id: report view id
-   :param group_id: report group id
-   :param dnac_auth: Cisco DNA Center Auth
-   :return: the report report view details
-    """
-    url = DNAC_URL + '/dna/intent/api/v1/data/view-groups/' + group_id + '/views/' + view_id
-    header = {'Content-Type': 'application/json', 'X-Auth-Token': dnac_auth}
-    response = requests.get(url, headers=header, verify=False)
-    report_detailed_views = response.json()
-    return report_detailed_views
-
-
-def create_report(payload, dnac_auth):
-    """
-    This function will create a new Client Detail report
-   :param payload: request payload
-   :param dnac_auth: Cisco DNA Center Auth
-   :return: return the API response
-    """
-    url = DNAC_URL + '/dna/intent/api/v1/data/reports'
-    header = {'Content-Type': 'application/json', 'X-Auth-Token': dnac_auth}
-    response = requests.post(url, headers=header, data=json.dumps(payload), verify=False)
-    return response
-
-
-def get_report_executions(report_id, dnac_auth):
-    """
-    This function will get the report executions info for the {report_id}
-    :param report_id: the report id
-    :param dnac_auth: Cisco DNA Center Auth
-    :return: return the response payload
-    """
-    url = DNAC_URL + '/dna/intent/api/v1/data/reports/' + report_id + '/executions'
-    header = {'Content-Type': 'application/json', 'X-Auth-Token': dnac_auth}
-    response = requests.get(url, headers=header, verify=False)
-    response_json = response.json()
-    return response_json
-
-
-def get_report_file(report_id, execution_id, dnac_auth):
-    """
-    This function will return the report content specified by the {report_id} and {execution_id}
-    :param report_id: report id
-    :param execution_id: execution id
-    :param dnac_auth: Cisco DNA Center Auth
-    :return: report data
-    """
-    url = DNAC_URL + '/dna/intent/api/v1/data/reports' + report_id + '/executions/' + execution_id
-    header = {'Content-Type': 'application/json', 'X-Auth-Token': dnac_auth}
-    response = requests.get(url, headers=header, verify=False)
-    report = response.json()
-    return report
+logger = logging.getLogger('dnacenter_create_report_download')
 
 
 def main():
     """
-    This application will create a new Client Detail Report:
+    This application will create a Client Detail Report, or execute again the report created by the previous runs:
      - for the Global site
      - all client details
      - run now schedule
@@ -171,335 +83,125 @@ def main():
      - will check when report execution is completed and save the report to a file
     """
 
-    # logging, debug level, to file {application_run.log}
-    logging.basicConfig(
-        filename='application_run.log',
-        level=logging.DEBUG,
-        format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s - %(funcName)s: %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S')
+    parser = argparse.ArgumentParser(description='Create a Cisco DNA Center Client Detail report')
+    parser.add_argument('--refresh-catalog', action='store_true',
+                        help='discover the report view groups and views again, do not use the cached catalog')
+    parser.add_argument('--profile', choices=sorted(FIELD_PROFILES), default=REPORT_PROFILE,
+                        help='report field profile, the report includes only the profile fields')
+    parser.add_argument('--delta-store', help='folder where to save the report changes from the previous report')
+    parser.add_argument('--new-report', action='store_true',
+                        help='create a new report, do not execute again the report created by the previous runs')
+    args = parser.parse_args()
+
+    # logging to the console and, JSON format, to the file {LOG_FILE}, the log records are written by a separate
+    # thread, the levels for each module are configured with {LOG_LEVELS}
+    setup_logging()
 
-    current_time = str(datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-    print('\nCreate Report App Run Start, ', current_time)
+    logger.info('Create Report App Run Start')
+
+    # one pooled, keep-alive connection to Cisco DNA Center for all the API calls
+    dnac = DnacClient(DNAC_URL, DNAC_USER, DNAC_PASS, pool_size=DNAC_POOL_SIZE)
 
     # get the Cisco DNA Center Auth token
-    dnac_auth = get_dnac_jwt_token(DNAC_AUTH)
-
-    # find out the report view group id
-    report_view_groups = get_report_view_groups(dnac_auth)
-    for view in report_view_groups:
-        if view['category'] == REPORT_CATEGORY:
-            view_group_id = view['viewGroupId']
-    print('\nReport Category:', REPORT_CATEGORY)
-    print('Report View Group Id is:', view_group_id)
-
-    # find out the report view id's
-    report_view_ids = get_report_view_ids(view_group_id, dnac_auth)
-    report_views = report_view_ids['views']
-    for view in report_views:
-        if view['viewName'] == VIEW_NAME:
-            report_view_id = view['viewId']
-    print('Report View Name:', VIEW_NAME)
-    print('Report View Id is:', report_view_id)
+    dnac.get_dnac_jwt_token()
+
+    # find out the report view group id and view id, from the cached report catalog
+    catalog = ReportCatalog(dnac, refresh=args.refresh_catalog)
+    view_group_id, report_view_id = catalog.discover(REPORT_CATEGORY, VIEW_NAME)
+    logger.info('Report view found', extra={'report_category': REPORT_CATEGORY, 'view_group_id': view_group_id,
+                                            'view_name': VIEW_NAME, 'view_id': report_view_id})
 
     # get the detailed report views
-    report_detail_view = get_detailed_report_views(report_view_id, view_group_id, dnac_auth)
-    print('\nClient Report Detail \n')
-    pprint(report_detail_view)
-
-    # create the report request payload
-    
-    report_request = {
-        'name': REPORT_NAME,
-        'description': '',
-        'dataCategory': REPORT_CATEGORY,
-        'viewGroupId': view_group_id,
-        'viewGroupVersion': '2.0.0',
-        'schedule': {
-            'type': 'SCHEDULE_NOW'
-        },
-        'deliveries': [
-            {
-                'type': 'DOWNLOAD',
-                "default": True
-            }
-        ],
-        'view': {
-            'name': VIEW_NAME,
-            'viewId': report_view_id,
-            'description': 'Client Report',
-            'fieldGroups': [
-                {
-                    'fieldGroupName': 'client_details',
-                    'fieldGroupDisplayName': 'Client Data',
-                    'fields': [
-                        {
-                            'name': 'hostName',
-                            'displayName': 'Host Name'
-                        },
-                        {
-                            'name': 'username',
-                            'displayName': 'User ID'
-                        },
-                        {
-                            'name': 'macAddress',
-                            'displayName': 'MAC Address'
-                        },
-                        {
-                            'name': 'ipv4',
-                            'displayName': 'IPv4 Address'
-                        },
-                        {
-                            'name': 'ipv6',
-                            'displayName': 'IPv6 Address'
-                        },
-                        {
-                            'name': 'deviceType',
-                            'displayName': 'Device Type'
-                        },
-                        {
-                            'name': 'connectionStatus',
-                            'displayName': 'Current Status'
-                        },
-                        {
-                            'name': 'averageHealthScore_min',
-                            'displayName': 'Min Health Score'
-                        },
-                        {
-                            'name': 'averageHealthScore_max',
-                            'displayName': 'Max Health Score'
-                        },
-                        {
-                            'name': 'averageHealthScore_median',
-                            'displayName': 'Median Health Score'
-                        },
-                        {
-                            'name': 'usage_sum',
-                            'displayName': 'Usage (MB)'
-                        },
-                        {
-                            'name': 'connectedDeviceName',
-                            'displayName': 'Connected Device Name'
-                        },
-                        {
-                            'name': 'frequency',
-                            'displayName': 'Band'
-                        },
-                        {
-                            'name': 'rssi_median',
-                            'displayName': 'RSSI (dBm)'
-                        },
-                        {
-                            'name': 'snr_median',
-                            'displayName': 'SNR (dB)'
-                        },
-                        {
-                            'name': 'site',
-                            'displayName': 'Last Location'
-                        },
-                        {
-                            'name': 'lastUpdated',
-                            'displayName': 'Last Seen'
-                        },
-                        {
-                            'name': 'apGroup',
-                            'displayName': 'AP Group'
-                        },
-                        {
-                            'name': 'ssid',
-                            'displayName': 'SSID'
-                        },
-                        {
-                            'name': 'vlan',
-                            'displayName': 'VLAN ID'
-                        },
-                        {
-                            'name': 'vnid',
-                            'displayName': 'VNID'
-                        },
-                        {
-                            'name': 'onboardingEventTime',
-                            'displayName': 'Onboarding Time'
-                        },
-                        {
-                            'name': 'assocDoneTimestamp',
-                            'displayName': 'Association Time'
-                        },
-                        {
-                            'name': 'authDoneTimestamp',
-                            'displayName': 'Authentication Time'
-                        },
-                        {
-                            'name': 'aaaServerIp',
-                            'displayName': 'Authentication Server'
-                        },
-                        {
-                            'name': 'dhcpDoneTimestamp',
-                            'displayName': 'Last DHCP Request'
-                        },
-                        {
-                            'name': 'maxDhcpDuration_max',
-                            'displayName': 'DHCP Response Time (ms)'
-                        },
-                        {
-                            'name': 'dhcpServerIp',
-                            'displayName': 'DHCP Server'
-                        },
-                        {
-                            'name': 'linkSpeed',
-                            'displayName': 'Link Speed (Mbps)'
-                        },
-                        {
-                            'name': 'txRate_min',
-                            'displayName': 'Min Tx Rate (bps)'
-                        },
-                        {
-                            'name': 'txRate_max',
-                            'displayName': 'Max Tx Rate (bps)'
-                        },
-                        {
-                            'name': 'txRate_avg',
-                            'displayName': 'Average Tx Rate (bps)'
-                        },
-                        {
-                            'name': 'rxRate_min',
-                            'displayName': 'Min Rx Rate (bps)'
-                        },
-                        {
-                            'name': 'rxRate_max',
-                            'displayName': 'Max Rx Rate (bps)'
-                        },
-                        {
-                            'name': 'rxRate_avg',
-                            'displayName': 'Average Rx Rate (bps)'
-                        },
-                        {
-                            'name': 'txBytes_sum',
-                            'displayName': 'Tx (MB)'
-                        },
-                        {
-                            'name': 'rxBytes_sum',
-                            'displayName': 'Rx (MB)'
-                        },
-                        {
-                            'name': 'dataRate_median',
-                            'displayName': 'Data Rate (Mbps)'
-                        },
-                        {
-                            'name': 'dot11Protocol',
-                            'displayName': 'Client Protocol'
-                        }
-                    ]
-                }
-            ],
-            'filters': [
-                {
-                    'name': 'Location',
-                    'displayName': 'Location',
-                    'type': 'MULTI_SELECT_TREE',
-                    'value': []
-                },
-                {
-                    'name': 'DeviceType',
-                    'displayName': 'Device Type',
-                    'type': 'SINGLE_SELECT_ARRAY',
-                    'value': []
-                },
-                {
-                    'name': 'SSID',
-                    'displayName': 'SSID',
-                    'type': 'MULTI_SELECT',
-                    'value': []
-                },
-                {
-                    'name': 'Band',
-                    'displayName': 'Band',
-                    'type': 'MULTI_SELECT',
-                    'value': []
-                },
-                {
-                    'name': 'TimeRange',
-                    'type': 'TIME_RANGE',
-                    'displayName': 'Time Range',
-                    'value': {
-                        'timeRangeOption': 'LAST_24_HOURS',
-                        'startDateTime': 0,
-                        'endDateTime': 0
-                    }
-                }
-            ],
-            'format': {
-                'name': 'JSON',
-                'formatType': 'JSON',
-                'default': False
-            }
-        }
-    }
-
-    create_report_status = create_report(report_request, dnac_auth)
-
-    if create_report_status.status_code == 200:
-        print('\nReport submitted')
-
-        # parsing the response from create new report API
-        create_report_json = create_report_status.json()
-        report_id = create_report_json['reportId']
-        print('Report id: ', report_id)
-
-        # verify when the report execution starts
-        # this app will create a new report, not execute an existing report again
-        # due to this there will be always execution count "0" when the report is triggered
-        # for a new report, not executed yet
-
-        print('\nWait for report execution to start')
-        execution_count = 0
-        while execution_count == 0:
-            time.sleep(1)
-            print('!', end="")
-            report_details = get_report_executions(report_id, dnac_auth)
-            execution_count = report_details['executionCount']
-
-        # report execution started
-        print('\n\nReport execution started, wait for process to complete')
-
-        # check when the report is completed
-        process_status = None
-        while process_status != 'SUCCESS':
-            time.sleep(1)
-            print('!', end="")
-            report_details = get_report_executions(report_id, dnac_auth)
-            execution_info = report_details['executions'][0]
-            process_status = execution_info['processStatus']
-
-        # execution completed successfully
-
-        print('\n\nReport execution completed')
-        execution_id = report_details['executions'][0]['executionId']
-        print('Report execution id: ', execution_id)
-
-        # download the report
-        # call the API to download the report file
-        report_content = get_report_file(report_id, execution_id, dnac_auth)
-        print('\nReport content:\n', report_content)
-
-        # save the report to a file
-        try:
-            report = json.dumps(report_content)
-
-            # verify if report file exists, if the "error" key exists
-            if 'error' in report_content:
-                raise ValueError('Report error received')
-            with open('report.json', 'w') as file:
-                file.write(report)
-                print('Client report file saved')
-                file.close()
-        except:
-            report_error = report_content['error']
-            print('Client report not saved, error received: ', report_error)
-
-    else:
-        print('\nReport not submitted, ', report_status.text)
-    current_time = str(datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-    print('\nCreate Report App Run End, ', current_time)
+    report_detail_view = catalog.get_view_details(view_group_id, report_view_id)
+    logger.info('Client report detail view', extra={'view_fields': len(get_view_fields(report_detail_view))})
+
+    # create the report request payload, with the fields of the field profile, validated against the view fields
+    report_fields = get_profile_fields(args.profile, report_detail_view)
+    logger.info('Report field profile', extra={'profile': args.profile, 'fields': len(report_fields)})
+    report_request = build_report_request(REPORT_NAME, REPORT_CATEGORY, view_group_id, VIEW_NAME, report_view_id,
+                                          fields=report_fields)
+
+    # execute again the report created by the previous runs, the report is created only on the first run, or when
+    # the report definition changes, the report with the old definition is deleted
+    since = None
+    registry = ReportRegistry(dnac)
+    try:
+        if args.new_report:
+            create_report_status = dnac.create_report(report_request)
+            if create_report_status.status_code != 200:
+                logger.error('Report not submitted, %s', truncate(create_report_status.text),
+                             extra={'status_code': create_report_status.status_code})
+                dnac.close()
+                return
+            report_id = dnac_json.loads(create_report_status.content)['reportId']
+        else:
+            report_id, since = registry.run(report_request)
+    except (requests.exceptions.RequestException, KeyError, TypeError, ValueError) as error:
+        # the API call failed, or the response does not have the report id
+        logger.error('Report not submitted, %s', truncate(repr(error)))
+        dnac.close()
+        return
+    logger.info('Report submitted', extra={'report_id': report_id, 'since': since})
+
+    # wait for the report execution to complete
+    # the report executions are polled with an increasing interval, until the execution completes,
+    # fails, or the {POLL_DEADLINE} is reached, for a report executed again only the executions started after
+    # the last execution seen are checked
+
+    logger.info('Wait for report execution to complete', extra={'report_id': report_id})
+    # the execution duration depends on the report fields, the durations are saved by view and profile
+    history_key = report_view_id if args.profile == DEFAULT_PROFILE else report_view_id + '/' + args.profile
+    poller = ExecutionPoller(dnac, max_interval=POLL_MAX_INTERVAL, deadline=POLL_DEADLINE)
+    try:
+        execution_info = poller.wait_for_execution(
+            report_id, view_id=history_key,
+            on_poll=lambda report_details: logger.debug('Report execution not completed',
+                                                        extra={'report_id': report_id}), since=since)
+    except ReportExecutionError as error:
+        logger.error('Report execution not completed, %s', error, extra={'report_id': report_id})
+        logger.info('Cisco DNA Center API metrics', extra={'metrics': dnac.metrics.summary()})
+        dnac.close()
+        return
+
+    # execution completed successfully
+
+    execution_id = execution_info['executionId']
+    if not args.new_report:
+        registry.update(REPORT_NAME, execution_info)
+    logger.info('Report execution completed', extra={'report_id': report_id, 'execution_id': execution_id})
+
+    # download the report
+    # call the API to download the report file, the report is streamed and compressed to a file in the report
+    # store {REPORT_STORE}, one file for each report execution
+    report_store = ReportStore(REPORT_STORE, compression=REPORT_COMPRESSION, retention_days=REPORT_RETENTION_DAYS,
+                               max_bytes=int(float(REPORT_STORE_MAX_MB) * 1024 * 1024) if REPORT_STORE_MAX_MB
+                               else None)
+    try:
+        report_file, report_size = report_store.download(dnac, report_id, execution_id,
+                                                         start_time=execution_info.get('startTime'))
+        logger.info('Client report file saved', extra={'file': report_file, 'bytes': report_size,
+                                                       'compressed_bytes': os.path.getsize(report_file)})
+
+        # save the execution time and the report size, to compare the field profiles
+        ProfileHistory().add(args.profile, execution_info, report_size)
+
+        # add the report clients to the report index, for the client lookups
+        clients = ReportIndex(REPORT_INDEX_DB).ingest(report_file, report_id, execution_id)
+        logger.info('Client report added to the report index', extra={'clients': clients})
+
+        # save the changes from the previous report
+        if args.delta_store:
+            delta = DeltaStore(args.delta_store).add_report(report_file, report_id, execution_id)
+            logger.info('Client report added to the delta store', extra={'delta': delta})
+    except ReportDownloadError as error:
+        logger.error('Client report not saved, error received: %s', truncate(error),
+                     extra={'report_id': report_id, 'execution_id': execution_id})
+
+    # the API calls latency, bytes and status codes, and the report execution duration
+    logger.info('Cisco DNA Center API metrics', extra={'metrics': dnac.metrics.summary()})
+
+    dnac.close()
+    logger.info('Create Report App Run End')
 
 
 if __name__ == '__main__':
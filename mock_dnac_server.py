@@ -0,0 +1,464 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import base64
+import json
+import random
+import threading
+import time
+import uuid
+
+import requests
+import urllib3
+
+from flask import Flask, Response, request, jsonify
+from requests.auth import HTTPBasicAuth  # for Basic Auth
+from urllib3.exceptions import InsecureRequestWarning  # for insecure https warnings
+
+from report_definitions import CLIENT_DETAIL_FIELDS, CLIENT_DETAIL_FILTERS
+
+urllib3.disable_warnings(InsecureRequestWarning)  # disable insecure https warnings
+
+MOCK_PORT = 8443
+API_LATENCY = 0.05  # added to each API call, in seconds
+EXECUTION_TIME = 5  # time for a 24 hours report execution to complete, in seconds
+REPORT_CLIENTS = 1000  # number of clients in each report
+ERROR_RATE = 0  # fraction of the API calls that fail with 503, for the retry tests
+TOKEN_LIFETIME = 3600
+
+VIEW_GROUP_ID = 'd7afe5c9-4941-4251-8bf5-0fb643e90847'
+VIEW_ID = 'e8e66b17-4aeb-4857-af81-f472023bb05e'
+WEBHOOK_ID = '6ad1ab4b-a1f4-4e6d-a8d7-ea3a9f4e5a7e'
+
+CLIENT_TEMPLATE = {
+    'hostName': 'Galaxy-Tab-A', 'username': '--', 'macAddress': 'F0:8A:76:25:1F:5A', 'ipv4': '192.168.159.220',
+    'ipv6': 'fe80::4c48:9d4:b8d2:bbf', 'deviceType': 'Wireless', 'connectionStatus': 'Disconnected',
+    'averageHealthScore_min': '10', 'averageHealthScore_max': '10', 'averageHealthScore_median': '10',
+    'usage_sum': '0.69', 'connectedDeviceName': 'AP2800.BFA0', 'frequency': '5.0', 'rssi_median': '-65.0',
+    'snr_median': '28.0', 'site': 'Global/San Francisco/One Bush/Fl1', 'lastUpdated': '30 Mar, 01:57:00 PM',
+    'apGroup': 'default-group', 'ssid': '@CorpSSID_SF', 'vlan': '0', 'vnid': '0',
+    'onboardingEventTime': '30 Mar, 11:55:31 AM', 'assocDoneTimestamp': '30 Mar, 11:55:31 AM',
+    'authDoneTimestamp': '30 Mar, 11:55:31 AM', 'aaaServerIp': '--', 'dhcpDoneTimestamp': '30 Mar, 11:55:31 AM',
+    'maxDhcpDuration_max': '180', 'dhcpServerIp': '192.168.159.129', 'linkSpeed': '--', 'txRate_min': '0.0',
+    'txRate_max': '5664.0', 'txRate_avg': '617.92', 'rxRate_min': '0.0', 'rxRate_max': '3116.53',
+    'rxRate_avg': '219.38', 'txBytes_sum': '0.53', 'rxBytes_sum': '0.17', 'dataRate_median': '173.0',
+    'dot11Protocol': '802.11ac'
+}
+
+# the site hierarchy, the clients are spread over the floors
+SITES = [{'id': str(uuid.uuid5(uuid.NAMESPACE_DNS, 'Global')), 'name': 'Global', 'siteNameHierarchy': 'Global'}]
+for area in ['San Francisco', 'San Jose', 'New York', 'London']:
+    for building in [None, 'Building 1', 'Building 2']:
+        for floor in ([None] if building is None else [None, 'Floor 1', 'Floor 2']):
+            hierarchy = '/'.join(['Global', area] + [name for name in (building, floor) if name])
+            SITES.append({'id': str(uuid.uuid5(uuid.NAMESPACE_DNS, hierarchy)), 'name': hierarchy.rsplit('/', 1)[1],
+                          'siteNameHierarchy': hierarchy})
+FLOORS = [site['siteNameHierarchy'] for site in SITES if site['siteNameHierarchy'].count('/') == 3]
+
+REPORT_FILTERS = [
+    {'name': 'Location', 'displayName': 'Location', 'values': ['Global']},
+    {'name': 'DeviceType', 'displayName': 'Device Type', 'values': ['Wireless']},
+    {'name': 'SSID', 'displayName': 'SSID', 'values': []},
+    {'name': 'Band', 'displayName': 'Band', 'values': []},
+    {'name': 'startTime', 'displayName': 'Start Time', 'values': ['2021-03-29 21:13:19.769 PM UTC']},
+    {'name': 'endTime', 'displayName': 'End Time', 'values': ['2021-03-30 21:13:19.769 PM UTC']}
+]
+
+
+app = Flask(__name__)
+
+# the mock settings, updated from the command line arguments
+settings = {
+    'latency': API_LATENCY,
+    'execution_time': EXECUTION_TIME,
+    'clients': REPORT_CLIENTS,
+    'error_rate': ERROR_RATE,
+    'fail_requests': 0,  # the next API calls that fail with {fail_status}, for the retry tests
+    'fail_status': 503,
+    'webhook_url': None,
+    'webhook_user': None,
+    'webhook_pass': None
+}
+
+reports = {}  # report id: report name and executions
+reports_lock = threading.Lock()
+tokens = set()  # the tokens issued, the API calls with another token are rejected with 401
+request_host = 'localhost'  # the mock server address, for the report links in the notifications
+
+stats = {'requests': 0, 'errors': 0, 'tokens': 0, 'reports': 0, 'executions': 0, 'downloads': 0, 'notifications': 0}
+
+
+def count(name):
+    with reports_lock:
+        stats[name] += 1
+
+
+@app.before_request
+def api_latency():
+    count('requests')
+    time.sleep(settings['latency'])
+    if not request.path.startswith('/dna/'):
+        return None
+    with reports_lock:
+        fail_request = settings['fail_requests'] > 0
+        if fail_request:
+            settings['fail_requests'] -= 1
+    if fail_request or random.random() < settings['error_rate']:
+        count('errors')
+        status = settings['fail_status'] if fail_request else 503
+        return jsonify({'error': 'Service temporarily unavailable'}), status, {'Retry-After': '1'}
+    if request.endpoint != 'auth_token':
+        with reports_lock:
+            valid_token = request.headers.get('X-Auth-Token') in tokens
+        if not valid_token:
+            return jsonify({'error': 'Invalid token'}), 401
+    return None
+
+
+def create_token():
+    """
+    Create a JWT formatted token, with the "exp" claim, the signature is not valid
+    :return: the token
+    """
+    def encode(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip('=')
+    claims = {'sub': 'mock', 'exp': int(time.time()) + TOKEN_LIFETIME}
+    return encode({'alg': 'HS256', 'typ': 'JWT'}) + '.' + encode(claims) + '.' + encode(str(uuid.uuid4()))
+
+
+def execution_status(execution):
+    """
+    Update the execution status, the execution completes {execution_time} seconds after the report is created
+    :param execution: the report execution
+    :return: the execution
+    """
+    if execution['processStatus'] != 'SUCCESS' and time.time() * 1000 >= execution['endTime']:
+        execution['processStatus'] = 'SUCCESS'
+    return execution
+
+
+def build_notification(report_id, execution_id, report_name, host):
+    """
+    Create the report completed notification, same format as Cisco DNA Center
+    :param report_id: report id
+    :param execution_id: execution id
+    :param report_name: report name
+    :param host: Cisco DNA Center address, for the report link
+    :return: the notification payload
+    """
+    report_url = ('https://' + host + '/data-sets-reports?report-tab=list&list-tab=my-reports&data-set-id=' +
+                  report_id + '&execution-id=' + execution_id)
+    return {
+        'Event Id': str(uuid.uuid4()),
+        'Event Timestamp': int(time.time() * 1000),
+        'Event Name': 'Report [' + report_name + '] - Success',
+        'Event Type': 'APP',
+        'Cisco DNA Center Event Context link. **This link is active only in the context of Cisco DNA Center. You must '
+        'have necessary permissions to login': report_url,
+        'Event Details': {
+            'name': 'Report [' + report_name + ']',
+            'status': 'Success',
+            'status update @': time.strftime('%a %b %d %H:%M:%S UTC %Y', time.gmtime()),
+            'execution id': execution_id,
+            'data set id': report_id
+        }
+    }
+
+
+def send_notification(report_id, execution_id, report_name):
+    """
+    Send the report completed notification to the webhook
+    :param report_id: report id
+    :param execution_id: execution id
+    :param report_name: report name
+    :return None
+    """
+    notification = build_notification(report_id, execution_id, report_name, request_host)
+    try:
+        requests.post(settings['webhook_url'], json=notification, verify=False, timeout=30,
+                      auth=HTTPBasicAuth(settings['webhook_user'], settings['webhook_pass']))
+        count('notifications')
+    except requests.exceptions.RequestException as error:
+        print('Notification not sent, ', error)
+
+
+@app.route('/dna/system/api/v1/auth/token', methods=['POST'])
+def auth_token():
+    if request.authorization is None:
+        return jsonify({'error': 'Authentication required'}), 401
+    count('tokens')
+    token = create_token()
+    with reports_lock:
+        tokens.add(token)
+    return jsonify({'Token': token}), 200
+
+
+@app.route('/dna/intent/api/v1/data/view-groups')
+def view_groups():
+    return jsonify([{'category': 'Client', 'viewGroupId': VIEW_GROUP_ID, 'name': 'Client',
+                     'description': 'This report shows client details'}]), 200
+
+
+@app.route('/dna/intent/api/v1/data/view-groups/<view_group_id>')
+def views(view_group_id):
+    if view_group_id != VIEW_GROUP_ID:
+        return jsonify({'error': 'View group not found'}), 404
+    return jsonify({'viewGroupId': VIEW_GROUP_ID, 'views': [
+        {'viewId': VIEW_ID, 'viewName': 'Client Detail', 'description': 'Client details'}]}), 200
+
+
+@app.route('/dna/intent/api/v1/data/view-groups/<view_group_id>/views/<view_id>')
+def view_details(view_group_id, view_id):
+    if view_group_id != VIEW_GROUP_ID or view_id != VIEW_ID:
+        return jsonify({'error': 'View not found'}), 404
+    return jsonify({'viewId': VIEW_ID, 'viewName': 'Client Detail', 'description': 'Client details',
+                    'fieldGroups': [{'fieldGroupName': 'client_details', 'fieldGroupDisplayName': 'Client Data',
+                                     'fields': CLIENT_DETAIL_FIELDS}],
+                    'filters': [{'name': report_filter['name'], 'displayName': report_filter['displayName'],
+                                 'type': report_filter['type']} for report_filter in CLIENT_DETAIL_FILTERS],
+                    'formats': [{'format': 'JSON', 'name': 'JSON', 'default': True}]}), 200
+
+
+def report_time_range(report_request):
+    """
+    The report time range, the execution time is proportional to the time range
+    :param report_request: the report request payload
+    :return: the time range in milliseconds, 24 hours if the time range is not custom
+    """
+    for report_filter in report_request.get('view', {}).get('filters', []):
+        value = report_filter.get('value')
+        if report_filter.get('type') == 'TIME_RANGE' and isinstance(value, dict) and \
+                value.get('timeRangeOption') == 'CUSTOM':
+            return max(value.get('endDateTime', 0) - value.get('startDateTime', 0), 0)
+    return 24 * 3600 * 1000
+
+
+def report_locations(report_request):
+    """
+    :param report_request: the report request payload
+    :return: the site hierarchies in the Location filter, None for all the sites
+    """
+    sites = {site['id']: site['siteNameHierarchy'] for site in SITES}
+    for report_filter in report_request.get('view', {}).get('filters', []):
+        if report_filter.get('name') == 'Location' and report_filter.get('value'):
+            return [sites.get(value.get('value'), value.get('displayValue')) for value in report_filter['value']]
+    return None
+
+
+@app.route('/dna/intent/api/v1/site')
+def sites():
+    offset = request.args.get('offset', 1, type=int)
+    limit = request.args.get('limit', 500, type=int)
+    return jsonify({'response': SITES[offset - 1:offset - 1 + limit]}), 200
+
+
+def start_execution(report_id):
+    """
+    Start a new execution of the report {report_id}, the execution time is proportional to the report time range and
+    the number of floors in the report, the notification is sent to the webhook when the execution completes
+    :param report_id: report id
+    :return: the execution
+    """
+    global request_host
+    with reports_lock:
+        report = reports[report_id]
+    report_request = report['request']
+    start_time = time.time() * 1000
+    execution_time = settings['execution_time'] * report_time_range(report_request) / (24 * 3600 * 1000)
+    if report['locations']:
+        # the execution time is proportional to the number of floors in the report
+        floors = [floor for floor in FLOORS if any(floor == location or floor.startswith(location + '/')
+                                                   for location in report['locations'])]
+        execution_time *= len(floors) / len(FLOORS)
+    execution = {'executionId': str(uuid.uuid4()), 'startTime': start_time,
+                 'endTime': start_time + execution_time * 1000, 'processStatus': 'IN_PROGRESS',
+                 'requestStatus': 'SUCCESS'}
+    with reports_lock:
+        report['executions'].append(execution)
+    webhook = any(delivery.get('type') == 'WEBHOOK' for delivery in report_request.get('deliveries', []))
+    if webhook and settings['webhook_url']:
+        request_host = request.host
+        threading.Timer(execution_time, send_notification,
+                        (report_id, execution['executionId'], report_request.get('name'))).start()
+    return execution
+
+
+def report_summary(report_id, report):
+    """
+    :param report_id: report id
+    :param report: the mock report
+    :return: the report, same format as the Cisco DNA Center reports API
+    """
+    report_request = report['request']
+    return {'reportId': report_id, 'name': report_request.get('name'), 'tags': report_request.get('tags') or [],
+            'dataCategory': report_request.get('dataCategory'), 'viewGroupId': report_request.get('viewGroupId'),
+            'viewGroupVersion': report_request.get('viewGroupVersion'), 'view': report_request.get('view'),
+            'deliveries': report_request.get('deliveries'), 'schedule': report_request.get('schedule'),
+            'executionCount': len(report['executions']),
+            'executions': [execution_status(dict(execution)) for execution in report['executions']]}
+
+
+@app.route('/dna/intent/api/v1/data/reports', methods=['POST'])
+def create_report():
+    report_request = request.get_json(force=True)
+    report_id = str(uuid.uuid4())
+    fields = [field['name'] for field_group in report_request.get('view', {}).get('fieldGroups', [])
+              for field in field_group.get('fields', [])]
+    with reports_lock:
+        reports[report_id] = {'name': report_request.get('name'), 'fields': fields,
+                              'locations': report_locations(report_request), 'request': report_request,
+                              'executions': []}
+    count('reports')
+    start_execution(report_id)
+    return jsonify({'reportId': report_id, 'name': report_request.get('name'), 'viewGroupId': VIEW_GROUP_ID}), 200
+
+
+@app.route('/dna/intent/api/v1/data/reports')
+def list_reports():
+    view_group_id = request.args.get('viewGroupId')
+    view_id = request.args.get('viewId')
+    with reports_lock:
+        report_list = [report_summary(report_id, report) for report_id, report in reports.items()
+                       if (not view_group_id or report['request'].get('viewGroupId') == view_group_id) and
+                       (not view_id or report['request'].get('view', {}).get('viewId') == view_id)]
+    return jsonify(report_list), 200
+
+
+@app.route('/dna/intent/api/v1/data/reports/<report_id>', methods=['DELETE'])
+def delete_report(report_id):
+    with reports_lock:
+        if reports.pop(report_id, None) is None:
+            return jsonify({'error': 'Report not found'}), 404
+    return jsonify({'reportId': report_id}), 200
+
+
+@app.route('/dna/data/api/v1/flexible-report/report/<report_id>/execute', methods=['POST'])
+def execute_report(report_id):
+    with reports_lock:
+        if report_id not in reports:
+            return jsonify({'error': 'Report not found'}), 404
+    count('executions')
+    execution = start_execution(report_id)
+    return jsonify(dict(execution, errors=[], warnings=[])), 200
+
+
+@app.route('/dna/intent/api/v1/data/reports/<report_id>/executions')
+def report_executions(report_id):
+    with reports_lock:
+        report = reports.get(report_id)
+        if report is None:
+            return jsonify({'error': 'Report not found'}), 404
+        executions = [execution_status(dict(execution)) for execution in report['executions']]
+    return jsonify({'reportId': report_id, 'reportName': report['name'], 'executions': executions}), 200
+
+
+def generate_report(clients, fields=None, locations=None):
+    """
+    Generate the Client Detail report, the clients are streamed and not built in memory
+    :param clients: number of clients
+    :param fields: the report fields, all the fields if not provided
+    :param locations: the site hierarchies in the Location filter, all the sites if not provided
+    :return: generator of the report content
+    """
+    yield '{"client_details": ['
+    first = True
+    for number in range(clients):
+        site = FLOORS[number % len(FLOORS)]
+        if locations and not any(site == location or site.startswith(location + '/') for location in locations):
+            continue
+        client = dict(CLIENT_TEMPLATE)
+        client['site'] = site
+        mac = '%012X' % number
+        client['macAddress'] = ':'.join(mac[i:i + 2] for i in range(0, 12, 2))
+        client['hostName'] = 'client-%06d' % number
+        client['ipv4'] = '10.%d.%d.%d' % (number >> 16 & 255, number >> 8 & 255, number & 255)
+        if fields:
+            client = {field: client.get(field) for field in fields}
+        yield ('' if first else ', ') + json.dumps(client)
+        first = False
+    report_filters = json.loads(json.dumps(REPORT_FILTERS))
+    report_filters[0]['values'] = locations or ['Global']
+    yield '], "filters": ' + json.dumps(report_filters) + '}'
+
+
+@app.route('/dna/intent/api/v1/data/reports/<report_id>/executions/<execution_id>')
+def report_file(report_id, execution_id):
+    # the report content is returned for any report, for the webhook receiver tests
+    count('downloads')
+    clients = request.args.get('clients', settings['clients'], type=int)
+    with reports_lock:
+        fields = reports.get(report_id, {}).get('fields')
+        locations = reports.get(report_id, {}).get('locations')
+    return Response(generate_report(clients, fields, locations), mimetype='application/json')
+
+
+@app.route('/dna/intent/api/v1/event/subscription-details/rest')
+def subscription_details():
+    name = request.args.get('name', 'LinuxMint_Report')
+    return jsonify([{'instanceId': WEBHOOK_ID, 'name': name, 'connectorType': 'REST',
+                     'url': settings['webhook_url'], 'method': 'POST', 'trustCert': False}]), 200
+
+
+@app.route('/mock/revoke-tokens', methods=['POST'])  # the API calls with the tokens issued before are rejected
+def revoke_tokens():
+    with reports_lock:
+        tokens.clear()
+    return jsonify({}), 200
+
+
+@app.route('/mock/stats')  # the mock server statistics
+def mock_stats():
+    with reports_lock:
+        return jsonify(dict(stats, settings={key: value for key, value in settings.items()
+                                             if key != 'webhook_pass'})), 200
+
+
+def main():
+    """
+    This application will run a local Cisco DNA Center stand-in, for the report APIs used by the report apps.
+    The API latency, report execution time and report size are configurable.
+    """
+    parser = argparse.ArgumentParser(description='Mock Cisco DNA Center server, for the report APIs')
+    parser.add_argument('--host', default='127.0.0.1', help='listen address')
+    parser.add_argument('--port', type=int, default=MOCK_PORT, help='listen port')
+    parser.add_argument('--latency', type=float, default=API_LATENCY, help='added to each API call, in seconds')
+    parser.add_argument('--execution-time', type=float, default=EXECUTION_TIME,
+                        help='time for a report execution to complete, in seconds')
+    parser.add_argument('--clients', type=int, default=REPORT_CLIENTS, help='number of clients in each report')
+    parser.add_argument('--error-rate', type=float, default=ERROR_RATE,
+                        help='fraction of the API calls that fail with 503 and Retry-After, for example 0.1')
+    parser.add_argument('--webhook-url', help='send the report completed notifications to this webhook')
+    parser.add_argument('--webhook-user', help='webhook username')
+    parser.add_argument('--webhook-pass', help='webhook password')
+    parser.add_argument('--https', action='store_true', help='use https, with a self signed certificate')
+    args = parser.parse_args()
+
+    settings.update({'latency': args.latency, 'execution_time': args.execution_time, 'clients': args.clients,
+                     'error_rate': args.error_rate,
+                     'webhook_url': args.webhook_url, 'webhook_user': args.webhook_user,
+                     'webhook_pass': args.webhook_pass})
+    app.run(host=args.host, port=args.port, threaded=True, ssl_context='adhoc' if args.https else None)
+
+
+if __name__ == '__main__':
+    main()
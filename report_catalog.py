@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+import dnac_json
+
+CATALOG_DIR = '.report_catalog'
+CATALOG_TTL = 24 * 3600  # the report catalog is discovered again after 24 hours
+
+
+class ReportCatalog:
+    """
+    On disk cache of the Cisco DNA Center report catalog: the view groups, the views and the view details.
+    The catalog is saved to a file for each Cisco DNA Center URL, and indexed by category and view name.
+    The API is called only for the catalog entries not in the cache, or after the cache expired.
+    """
+
+    def __init__(self, dnac, catalog_dir=CATALOG_DIR, ttl=CATALOG_TTL, refresh=False):
+        """
+        :param dnac: DnacClient
+        :param catalog_dir: folder where to save the catalog files
+        :param ttl: catalog time to live, in seconds
+        :param refresh: discard the saved catalog and discover it again
+        """
+        self.dnac = dnac
+        self.ttl = ttl
+        url_hash = hashlib.sha1(dnac.dnac_url.encode()).hexdigest()[:16]
+        self.filename = os.path.join(catalog_dir, 'catalog-' + url_hash + '.json')
+        self._lock = threading.Lock()
+        self._catalog = None if refresh else self._load()
+        if self._catalog is None:
+            self._catalog = self._empty()
+
+    def _empty(self):
+        return {
+            'dnac_url': self.dnac.dnac_url,
+            'created': time.time(),
+            'view_groups': None,  # category: view group
+            'views': {},  # view group id: {view name: view}
+            'view_details': {}  # view group id + '/' + view id: view details
+        }
+
+    def _load(self):
+        try:
+            with open(self.filename) as file:
+                catalog = dnac_json.load(file)
+        except (OSError, ValueError):
+            return None
+        if catalog.get('dnac_url') != self.dnac.dnac_url or time.time() - catalog.get('created', 0) > self.ttl:
+            return None
+        return catalog
+
+    def _save(self):
+        folder = os.path.dirname(self.filename)
+        os.makedirs(folder, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', dir=folder, suffix='.tmp', delete=False) as file:
+            dnac_json.dump(self._catalog, file)
+        os.replace(file.name, self.filename)
+
+    def refresh(self):
+        """
+        Discard the cached catalog, the catalog will be discovered again
+        :return None
+        """
+        with self._lock:
+            self._catalog = self._empty()
+
+    def get_view_group(self, report_category):
+        """
+        :param report_category: report category, for example "Client"
+        :return: the report view group for the category {report_category}, None if not found
+        """
+        with self._lock:
+            if self._catalog['view_groups'] is None:
+                report_view_groups = self.dnac.get_report_view_groups()
+                self._catalog['view_groups'] = {view['category']: view for view in report_view_groups}
+                self._save()
+            return self._catalog['view_groups'].get(report_category)
+
+    def get_view(self, view_group_id, view_name):
+        """
+        :param view_group_id: report view group id
+        :param view_name: report view name, for example "Client Detail"
+        :return: the report view with the name {view_name}, None if not found
+        """
+        with self._lock:
+            views = self._catalog['views'].get(view_group_id)
+            if views is None:
+                report_view_ids = self.dnac.get_report_view_ids(view_group_id)
+                views = {view['viewName']: view for view in report_view_ids['views']}
+                self._catalog['views'][view_group_id] = views
+                self._save()
+            return views.get(view_name)
+
+    def get_view_details(self, view_group_id, report_view_id):
+        """
+        :param view_group_id: report view group id
+        :param report_view_id: report view id
+        :return: the report view details
+        """
+        key = view_group_id + '/' + report_view_id
+        with self._lock:
+            report_detail_view = self._catalog['view_details'].get(key)
+            if report_detail_view is None:
+                report_detail_view = self.dnac.get_detailed_report_views(report_view_id, view_group_id)
+                self._catalog['view_details'][key] = report_detail_view
+                self._save()
+            return report_detail_view
+
+    def discover(self, report_category, view_name):
+        """
+        Find the report view group id and view id for the report category {report_category} and view {view_name}
+        :param report_category: report category, for example "Client"
+        :param view_name: report view name, for example "Client Detail"
+        :return: the report view group id and the report view id
+        """
+        view_group = self.get_view_group(report_category)
+        if view_group is None:
+            raise ValueError('Report category not found: ' + report_category)
+        view = self.get_view(view_group['viewGroupId'], view_name)
+        if view is None:
+            raise ValueError('Report view not found: ' + view_name)
+        return view_group['viewGroupId'], view['viewId']
@@ -0,0 +1,356 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import array
+import calendar
+import datetime
+import json
+import math
+import os
+import re
+
+from report_stream import iter_client_details
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # the Parquet format is optional
+    pyarrow = None
+
+try:
+    import numpy
+except ImportError:  # the NumPy format is optional
+    numpy = None
+
+try:
+    import zoneinfo
+except ImportError:  # the report time zones other than UTC require Python 3.9
+    zoneinfo = None
+
+# Client Detail report fields types, the fields not listed are saved as strings
+NUMERIC_FIELDS = {
+    'averageHealthScore_min', 'averageHealthScore_max', 'averageHealthScore_median', 'usage_sum', 'frequency',
+    'rssi_median', 'snr_median', 'vlan', 'vnid', 'maxDhcpDuration_max', 'linkSpeed', 'txRate_min', 'txRate_max',
+    'txRate_avg', 'rxRate_min', 'rxRate_max', 'rxRate_avg', 'txBytes_sum', 'rxBytes_sum', 'dataRate_median'
+}
+TIMESTAMP_FIELDS = {
+    'lastUpdated', 'onboardingEventTime', 'assocDoneTimestamp', 'authDoneTimestamp', 'dhcpDoneTimestamp'
+}
+CATEGORICAL_FIELDS = {
+    'deviceType', 'connectionStatus', 'connectedDeviceName', 'site', 'apGroup', 'ssid', 'aaaServerIp',
+    'dhcpServerIp', 'dot11Protocol'
+}
+MISSING_VALUES = {None, '', '--'}
+
+FORMAT_PARQUET = 'parquet'
+FORMAT_NUMPY = 'numpy'
+
+# report timestamps, for example "30 Mar, 01:57:00 PM", the year is not included
+TIMESTAMP_PATTERN = re.compile(r'(\d{1,2}) (\w{3}), (\d{1,2}):(\d{2}):(\d{2}) ([AP]M)')
+DATE_PATTERN = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
+# the report time zone is the last word of the start and end time filters, for example "2021-03-30 21:13:19.769 PM UTC"
+TIMEZONE_PATTERN = re.compile(r'.*\s([\w/+-]+)$')
+UTC_NAMES = {'UTC', 'GMT', 'Z', 'Etc/UTC'}
+MONTHS = {calendar.month_abbr[month]: month for month in range(1, 13)}
+
+
+def parse_timestamp(value):
+    """
+    Parse the report timestamp, without the year
+    :param value: report timestamp, for example "30 Mar, 01:57:00 PM"
+    :return: the timestamp as the integer MMDDhhmmss, -1 if missing or not valid
+    """
+    match = TIMESTAMP_PATTERN.match(value) if isinstance(value, str) else None
+    if match is None or match.group(2) not in MONTHS:
+        return -1
+    day, month_name, hour, minute, second, am_pm = match.groups()
+    hour = int(hour) % 12 + (12 if am_pm == 'PM' else 0)
+    return (((MONTHS[month_name] * 100 + int(day)) * 100 + hour) * 100 + int(minute)) * 100 + int(second)
+
+
+def get_report_end_date(filters):
+    """
+    Find the report end date in the report filters
+    :param filters: report filters
+    :return: the report end date, today if not found
+    """
+    for report_filter in filters or []:
+        if report_filter.get('name') == 'endTime' and report_filter.get('values'):
+            match = DATE_PATTERN.match(report_filter['values'][0])
+            if match:
+                return datetime.date(*[int(part) for part in match.groups()])
+    return datetime.date.today()
+
+
+def get_report_timezone(filters, name=None):
+    """
+    Find the report time zone, the report timestamps are in the time zone of the report start and end time filters
+    :param filters: report filters
+    :param name: time zone name, for example "America/Los_Angeles", overrides the report filters time zone
+    :return: the report time zone, UTC if not found
+    """
+    if name is not None:
+        if name in UTC_NAMES:
+            return datetime.timezone.utc
+        if zoneinfo is None:
+            raise ImportError('The time zone ' + name + ' requires Python 3.9')
+        try:
+            return zoneinfo.ZoneInfo(name)
+        except (ValueError, zoneinfo.ZoneInfoNotFoundError):
+            raise ValueError('Unknown time zone: ' + name)
+    for report_filter in filters or []:
+        if report_filter.get('name') == 'endTime' and report_filter.get('values'):
+            match = TIMEZONE_PATTERN.match(str(report_filter['values'][0]))
+            if match and match.group(1) not in UTC_NAMES and zoneinfo is not None:
+                try:
+                    return zoneinfo.ZoneInfo(match.group(1))
+                except (ValueError, zoneinfo.ZoneInfoNotFoundError):
+                    pass  # not a time zone name, the report timestamps are UTC
+    return datetime.timezone.utc
+
+
+def to_epoch(packed_timestamp, end_date, timezone=datetime.timezone.utc):
+    """
+    Convert the timestamp without the year to epoch seconds, the year is the year of the report end date, or the
+    previous year for the timestamps after the report end date
+    :param packed_timestamp: timestamp as the integer MMDDhhmmss
+    :param end_date: report end date
+    :param timezone: the report time zone
+    :return: epoch seconds
+    """
+    month_day, time_of_day = divmod(packed_timestamp, 1000000)
+    month, day = divmod(month_day, 100)
+    hour, minute_second = divmod(time_of_day, 10000)
+    minute, second = divmod(minute_second, 100)
+    year = end_date.year - 1 if (month, day) > (end_date.month, end_date.day) else end_date.year
+    if timezone is datetime.timezone.utc:
+        return calendar.timegm((year, month, day, hour, minute, second))
+    return int(datetime.datetime(year, month, day, hour, minute, second, tzinfo=timezone).timestamp())
+
+
+class ColumnBuilder:
+    """
+    Build the typed columns from the report records, the values are saved in compact arrays, not as Python objects
+    """
+
+    def __init__(self):
+        self.fields = []
+        self.columns = {}
+        self.categories = {}
+        self.rows = 0
+
+    def _add_field(self, name):
+        self.fields.append(name)
+        if name in NUMERIC_FIELDS:
+            self.columns[name] = array.array('d', [math.nan]) * self.rows
+        elif name in TIMESTAMP_FIELDS:
+            self.columns[name] = array.array('q', [-1]) * self.rows
+        elif name in CATEGORICAL_FIELDS:
+            self.columns[name] = array.array('i', [-1]) * self.rows
+            self.categories[name] = {}
+        else:
+            self.columns[name] = [None] * self.rows
+
+    def add(self, record):
+        """
+        Add the report record to the columns
+        :param record: report record
+        :return None
+        """
+        for name in record:
+            if name not in self.columns:
+                self._add_field(name)
+        for name in self.fields:
+            value = record.get(name)
+            if name in NUMERIC_FIELDS:
+                try:
+                    value = math.nan if value in MISSING_VALUES else float(value)
+                except (TypeError, ValueError):
+                    value = math.nan
+            elif name in TIMESTAMP_FIELDS:
+                value = parse_timestamp(value)
+            elif name in CATEGORICAL_FIELDS:
+                categories = self.categories[name]
+                value = -1 if value in MISSING_VALUES else categories.setdefault(value, len(categories))
+            elif value in MISSING_VALUES:
+                value = None
+            self.columns[name].append(value)
+        self.rows += 1
+
+    def timestamps(self, name, end_date, timezone=datetime.timezone.utc):
+        """
+        :param name: timestamp field name
+        :param end_date: report end date
+        :param timezone: the report time zone
+        :return: the timestamp column as epoch seconds, and the missing values mask
+        """
+        packed_timestamps = self.columns[name]
+        epoch = [to_epoch(value, end_date, timezone) if value >= 0 else 0 for value in packed_timestamps]
+        missing = [value < 0 for value in packed_timestamps]
+        return epoch, missing
+
+
+def write_parquet(builder, output, end_date, metadata, timezone=datetime.timezone.utc):
+    """
+    Save the columns to the Parquet file {output}
+    :param builder: ColumnBuilder with the report columns
+    :param output: Parquet file name
+    :param end_date: report end date, used for the timestamps year
+    :param timezone: the report time zone, the timestamps are saved as UTC
+    :param metadata: the other report fields, saved in the file metadata
+    :return None
+    """
+    columns = []
+    for name in builder.fields:
+        column = builder.columns[name]
+        if name in NUMERIC_FIELDS:
+            columns.append(pyarrow.array(column.tolist(), type=pyarrow.float64(), from_pandas=True))
+        elif name in TIMESTAMP_FIELDS:
+            epoch, missing = builder.timestamps(name, end_date, timezone)
+            columns.append(pyarrow.array(epoch, type=pyarrow.timestamp('s', tz='UTC'), mask=pyarrow.array(missing)))
+        elif name in CATEGORICAL_FIELDS:
+            missing = pyarrow.array([code < 0 for code in column])
+            codes = pyarrow.array(column.tolist(), type=pyarrow.int32(), mask=missing)
+            values = pyarrow.array(list(builder.categories[name]), type=pyarrow.string())
+            columns.append(pyarrow.DictionaryArray.from_arrays(codes, values))
+        else:
+            columns.append(pyarrow.array(column, type=pyarrow.string()))
+    table = pyarrow.table(columns, names=builder.fields)
+    table = table.replace_schema_metadata({'report': json.dumps(metadata)})
+    pyarrow.parquet.write_table(table, output)
+
+
+def write_numpy(builder, output, end_date, metadata, timezone=datetime.timezone.utc):
+    """
+    Save the columns to the folder {output}, a .npy file for each field and the schema.json file
+    :param builder: ColumnBuilder with the report columns
+    :param output: folder name
+    :param end_date: report end date, used for the timestamps year
+    :param timezone: the report time zone, the timestamps are saved as UTC
+    :param metadata: the other report fields, saved in the schema.json file
+    :return None
+    """
+    os.makedirs(output, exist_ok=True)
+    schema = {'rows': builder.rows, 'fields': {}, 'metadata': metadata}
+    for name in builder.fields:
+        column = builder.columns[name]
+        if name in NUMERIC_FIELDS:
+            values = numpy.frombuffer(column, dtype=numpy.float64)
+            schema['fields'][name] = 'float64'
+        elif name in TIMESTAMP_FIELDS:
+            epoch, missing = builder.timestamps(name, end_date, timezone)
+            values = numpy.array(epoch, dtype='datetime64[s]')
+            values[numpy.array(missing, dtype=bool)] = numpy.datetime64('NaT')
+            schema['fields'][name] = 'datetime64[s]'
+        elif name in CATEGORICAL_FIELDS:
+            values = numpy.frombuffer(column, dtype=numpy.int32)
+            numpy.save(os.path.join(output, name + '.categories.npy'), numpy.array(list(builder.categories[name]),
+                                                                                    dtype=str))
+            schema['fields'][name] = 'category'
+        else:
+            values = numpy.array(['' if value is None else value for value in column], dtype=str)
+            schema['fields'][name] = 'str'
+        numpy.save(os.path.join(output, name + '.npy'), values)
+    with open(os.path.join(output, 'schema.json'), 'w') as file:
+        json.dump(schema, file)
+
+
+def convert_report(source, output, output_format=None, timezone=None):
+    """
+    Convert the Client Detail report to a typed columnar file: numeric fields as float64, timestamps as UTC
+    timestamps, and the site, SSID, AP group, connected device... as dictionary encoded categories.
+    The Parquet format requires pyarrow, the NumPy format (a folder with a .npy file for each field) requires numpy.
+    :param source: report file name, file object, or streamed response
+    :param output: output file name for the Parquet format, or folder name for the NumPy format
+    :param output_format: "parquet" or "numpy", the first format available if not provided
+    :param timezone: the report timestamps time zone name, the time zone of the report filters if not provided,
+    UTC if the filters have no time zone
+    :return: the number of clients saved
+    """
+    if output_format is None:
+        output_format = FORMAT_PARQUET if pyarrow is not None else FORMAT_NUMPY
+    if output_format == FORMAT_PARQUET and pyarrow is None:
+        raise ImportError('The Parquet format requires pyarrow')
+    if output_format == FORMAT_NUMPY and numpy is None:
+        raise ImportError('The NumPy format requires numpy')
+
+    builder = ColumnBuilder()
+    other_fields = {}
+    for record in iter_client_details(source, other_fields=other_fields):
+        builder.add(record)
+    end_date = get_report_end_date(other_fields.get('filters'))
+    report_timezone = get_report_timezone(other_fields.get('filters'), timezone)
+
+    if output_format == FORMAT_PARQUET:
+        write_parquet(builder, output, end_date, other_fields, report_timezone)
+    elif output_format == FORMAT_NUMPY:
+        write_numpy(builder, output, end_date, other_fields, report_timezone)
+    else:
+        raise ValueError('Unknown format: ' + output_format)
+    return builder.rows
+
+
+def load_report(path):
+    """
+    Load the columnar report, the file is memory mapped, the data is read from disk only when used
+    :param path: Parquet file name, or NumPy folder name
+    :return: pyarrow Table for the Parquet format, or for the NumPy format a dict with the "columns" (field name:
+    array), the "categories" (field name: category values, the column has the category index, -1 if missing) and
+    the report "metadata"
+    """
+    if os.path.isdir(path):
+        if numpy is None:
+            raise ImportError('The NumPy format requires numpy')
+        with open(os.path.join(path, 'schema.json')) as file:
+            schema = json.load(file)
+        columns = {}
+        categories = {}
+        for name, field_type in schema['fields'].items():
+            columns[name] = numpy.load(os.path.join(path, name + '.npy'), mmap_mode='r')
+            if field_type == 'category':
+                categories[name] = numpy.load(os.path.join(path, name + '.categories.npy'))
+        return {'columns': columns, 'categories': categories, 'metadata': schema['metadata']}
+    if pyarrow is None:
+        raise ImportError('The Parquet format requires pyarrow')
+    return pyarrow.parquet.read_table(path, memory_map=True)
+
+
+def main():
+    """
+    This application will convert a Client Detail report to a typed columnar file
+    """
+    parser = argparse.ArgumentParser(description='Convert a Client Detail report to a typed columnar file')
+    parser.add_argument('report', help='report file, for example report.json')
+    parser.add_argument('output', help='Parquet file name, or folder name for the NumPy format')
+    parser.add_argument('--format', choices=[FORMAT_PARQUET, FORMAT_NUMPY],
+                        help='output format, Parquet if pyarrow is installed, NumPy otherwise')
+    parser.add_argument('--timezone', help='the report timestamps time zone, for example America/Los_Angeles, the '
+                                           'time zone of the report filters by default, or UTC')
+    args = parser.parse_args()
+
+    rows = convert_report(args.report, args.output, args.format, args.timezone)
+    print('Report saved to', args.output, ', clients:', rows)
+
+
+if __name__ == '__main__':
+    main()
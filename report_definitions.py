@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import copy
+
+# Client Detail report fields, the "client_details" field group
+CLIENT_DETAIL_FIELDS = [
+    {'name': 'hostName', 'displayName': 'Host Name'},
+    {'name': 'username', 'displayName': 'User ID'},
+    {'name': 'macAddress', 'displayName': 'MAC Address'},
+    {'name': 'ipv4', 'displayName': 'IPv4 Address'},
+    {'name': 'ipv6', 'displayName': 'IPv6 Address'},
+    {'name': 'deviceType', 'displayName': 'Device Type'},
+    {'name': 'connectionStatus', 'displayName': 'Current Status'},
+    {'name': 'averageHealthScore_min', 'displayName': 'Min Health Score'},
+    {'name': 'averageHealthScore_max', 'displayName': 'Max Health Score'},
+    {'name': 'averageHealthScore_median', 'displayName': 'Median Health Score'},
+    {'name': 'usage_sum', 'displayName': 'Usage (MB)'},
+    {'name': 'connectedDeviceName', 'displayName': 'Connected Device Name'},
+    {'name': 'frequency', 'displayName': 'Band'},
+    {'name': 'rssi_median', 'displayName': 'RSSI (dBm)'},
+    {'name': 'snr_median', 'displayName': 'SNR (dB)'},
+    {'name': 'site', 'displayName': 'Last Location'},
+    {'name': 'lastUpdated', 'displayName': 'Last Seen'},
+    {'name': 'apGroup', 'displayName': 'AP Group'},
+    {'name': 'ssid', 'displayName': 'SSID'},
+    {'name': 'vlan', 'displayName': 'VLAN ID'},
+    {'name': 'vnid', 'displayName': 'VNID'},
+    {'name': 'onboardingEventTime', 'displayName': 'Onboarding Time'},
+    {'name': 'assocDoneTimestamp', 'displayName': 'Association Time'},
+    {'name': 'authDoneTimestamp', 'displayName': 'Authentication Time'},
+    {'name': 'aaaServerIp', 'displayName': 'Authentication Server'},
+    {'name': 'dhcpDoneTimestamp', 'displayName': 'Last DHCP Request'},
+    {'name': 'maxDhcpDuration_max', 'displayName': 'DHCP Response Time (ms)'},
+    {'name': 'dhcpServerIp', 'displayName': 'DHCP Server'},
+    {'name': 'linkSpeed', 'displayName': 'Link Speed (Mbps)'},
+    {'name': 'txRate_min', 'displayName': 'Min Tx Rate (bps)'},
+    {'name': 'txRate_max', 'displayName': 'Max Tx Rate (bps)'},
+    {'name': 'txRate_avg', 'displayName': 'Average Tx Rate (bps)'},
+    {'name': 'rxRate_min', 'displayName': 'Min Rx Rate (bps)'},
+    {'name': 'rxRate_max', 'displayName': 'Max Rx Rate (bps)'},
+    {'name': 'rxRate_avg', 'displayName': 'Average Rx Rate (bps)'},
+    {'name': 'txBytes_sum', 'displayName': 'Tx (MB)'},
+    {'name': 'rxBytes_sum', 'displayName': 'Rx (MB)'},
+    {'name': 'dataRate_median', 'displayName': 'Data Rate (Mbps)'},
+    {'name': 'dot11Protocol', 'displayName': 'Client Protocol'}
+]
+
+# Client Detail report field profiles, the fields requested for each report consumer, the smaller reports execute
+# faster and the downloads are smaller
+FIELD_PROFILES = {
+    'all': [field['name'] for field in CLIENT_DETAIL_FIELDS],
+    'lookup': ['macAddress', 'hostName', 'ipv4', 'username', 'site', 'ssid'],
+    'inventory': ['macAddress', 'hostName', 'ipv4', 'ipv6', 'deviceType', 'dot11Protocol', 'connectedDeviceName',
+                  'site', 'lastUpdated'],
+    'health': ['macAddress', 'hostName', 'site', 'connectionStatus', 'averageHealthScore_min',
+               'averageHealthScore_max', 'averageHealthScore_median', 'rssi_median', 'snr_median', 'lastUpdated'],
+    'usage': ['macAddress', 'hostName', 'username', 'site', 'ssid', 'usage_sum', 'txBytes_sum', 'rxBytes_sum',
+              'lastUpdated'],
+    'onboarding': ['macAddress', 'hostName', 'site', 'ssid', 'onboardingEventTime', 'assocDoneTimestamp',
+                   'authDoneTimestamp', 'aaaServerIp', 'dhcpDoneTimestamp', 'maxDhcpDuration_max', 'dhcpServerIp']
+}
+DEFAULT_PROFILE = 'all'
+
+# Client Detail report filters, all sites, device types, SSIDs and bands, for the last 24 hours
+CLIENT_DETAIL_FILTERS = [
+    {
+        'name': 'Location',
+        'displayName': 'Location',
+        'type': 'MULTI_SELECT_TREE',
+        'value': []
+    },
+    {
+        'name': 'DeviceType',
+        'displayName': 'Device Type',
+        'type': 'SINGLE_SELECT_ARRAY',
+        'value': []
+    },
+    {
+        'name': 'SSID',
+        'displayName': 'SSID',
+        'type': 'MULTI_SELECT',
+        'value': []
+    },
+    {
+        'name': 'Band',
+        'displayName': 'Band',
+        'type': 'MULTI_SELECT',
+        'value': []
+    },
+    {
+        'name': 'TimeRange',
+        'type': 'TIME_RANGE',
+        'displayName': 'Time Range',
+        'value': {
+            'timeRangeOption': 'LAST_24_HOURS',
+            'startDateTime': 0,
+            'endDateTime': 0
+        }
+    }
+]
+
+
+def get_view_fields(report_detail_view, field_group_name='client_details'):
+    """
+    Find the fields of the {field_group_name} field group in the report view details
+    :param report_detail_view: the report view details, from get_detailed_report_views
+    :param field_group_name: the field group name
+    :return: list of the field dicts, with the name and displayName
+    """
+    for field_group in report_detail_view.get('fieldGroups') or []:
+        if field_group.get('fieldGroupName') == field_group_name:
+            return field_group.get('fields') or []
+    raise ValueError('Field group ' + field_group_name + ' not found in the report view')
+
+
+def get_profile_fields(profile, report_detail_view=None):
+    """
+    Create the report fields for the field {profile}, validated against the fields of the report view
+    :param profile: field profile name, from FIELD_PROFILES
+    :param report_detail_view: the report view details, from get_detailed_report_views, the fields are not
+    validated if not provided
+    :return: list of the field dicts, with the name and displayName
+    """
+    if profile not in FIELD_PROFILES:
+        raise ValueError('Field profile not found: ' + profile + ', profiles: ' + ', '.join(FIELD_PROFILES))
+    if report_detail_view is None:
+        view_fields = CLIENT_DETAIL_FIELDS
+    else:
+        view_fields = get_view_fields(report_detail_view)
+    display_names = {field['name']: field.get('displayName', field['name']) for field in view_fields}
+    missing = [name for name in FIELD_PROFILES[profile] if name not in display_names]
+    if missing:
+        raise ValueError('Fields not available in the report view: ' + ', '.join(missing))
+    return [{'name': name, 'displayName': display_names[name]} for name in FIELD_PROFILES[profile]]
+
+
+def build_report_request(report_name, report_category, view_group_id, view_name, report_view_id, fields=None,
+                         filters=None, webhook_id=None):
+    """
+    Create the report request payload, a JSON format report, scheduled to run now
+    :param report_name: new report name
+    :param report_category: report category
+    :param view_group_id: report view group id
+    :param view_name: report view name
+    :param report_view_id: report view id
+    :param fields: report fields, all the Client Detail fields if not provided
+    :param filters: report filters, all the clients for the last 24 hours if not provided
+    :param webhook_id: webhook id where to send the report notifications, no webhook delivery if not provided
+    :return: the report request payload
+    """
+    deliveries = [
+        {
+            'type': 'DOWNLOAD',
+            'default': True
+        }
+    ]
+    if webhook_id:
+        deliveries.append({
+            'type': 'WEBHOOK',
+            'webhookId': webhook_id,
+            'default': False
+        })
+    report_request = {
+        'name': report_name,
+        'description': '',
+        'dataCategory': report_category,
+        'viewGroupId': view_group_id,
+        'viewGroupVersion': '2.0.0',
+        'schedule': {
+            'type': 'SCHEDULE_NOW'
+        },
+        'deliveries': deliveries,
+        'view': {
+            'name': view_name,
+            'viewId': report_view_id,
+            'description': 'Client Report',
+            'fieldGroups': [
+                {
+                    'fieldGroupName': 'client_details',
+                    'fieldGroupDisplayName': 'Client Data',
+                    'fields': copy.deepcopy(fields if fields is not None else CLIENT_DETAIL_FIELDS)
+                }
+            ],
+            'filters': copy.deepcopy(filters if filters is not None else CLIENT_DETAIL_FILTERS),
+            'format': {
+                'name': 'JSON',
+                'formatType': 'JSON',
+                'default': False
+            }
+        }
+    }
+    return report_request
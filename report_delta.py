@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import dnac_json
+from report_stream import iter_client_details
+
+DELTA_STORE = 'report_deltas'
+SNAPSHOT_INTERVAL = 24  # a full snapshot is saved after this many deltas
+CLIENT_KEY = 'macAddress'
+
+
+def load_snapshot(source):
+    """
+    Load the report clients, by MAC address
+    :param source: report file name, file object, or streamed response
+    :return: dict MAC address: client details, the clients without a MAC address are not included
+    """
+    return {record[CLIENT_KEY]: record for record in iter_client_details(source) if record.get(CLIENT_KEY)}
+
+
+def diff_snapshots(old_clients, new_source):
+    """
+    Compare the new report with the previous report clients
+    :param old_clients: dict MAC address: client details, for the previous report
+    :param new_source: the new report file name, file object, or streamed response
+    :return: the delta, dict with the "added" clients, the "removed" MAC addresses, the "changed" clients, each
+    with the changed fields as [old value, new value], and the "removed_fields" of the changed clients, a removed
+    field is in "changed" with the new value None, a field with the JSON null value is not removed
+    """
+    added = {}
+    changed = {}
+    removed_fields = {}
+    seen = set()
+    for record in iter_client_details(new_source):
+        mac_address = record.get(CLIENT_KEY)
+        if not mac_address or mac_address in seen:
+            continue
+        seen.add(mac_address)
+        old_record = old_clients.get(mac_address)
+        if old_record is None:
+            added[mac_address] = record
+            continue
+        changes = {field: [old_record.get(field), record.get(field)] for field in set(old_record) | set(record)
+                   if field not in old_record or field not in record or old_record[field] != record[field]}
+        if changes:
+            changed[mac_address] = changes
+        fields = [field for field in old_record if field not in record]
+        if fields:
+            removed_fields[mac_address] = fields
+    removed = [mac_address for mac_address in old_clients if mac_address not in seen]
+    return {'added': added, 'removed': removed, 'changed': changed, 'removed_fields': removed_fields}
+
+
+def apply_delta(clients, delta):
+    """
+    Apply the delta to the report clients
+    :param clients: dict MAC address: client details, updated in place
+    :param delta: delta from diff_snapshots
+    :return: the updated clients
+    """
+    for mac_address in delta['removed']:
+        clients.pop(mac_address, None)
+    removed_fields = delta.get('removed_fields')
+    for mac_address, changes in delta['changed'].items():
+        record = clients[mac_address]
+        for field, (old_value, new_value) in changes.items():
+            if removed_fields is None and new_value is None:
+                record.pop(field, None)  # the deltas saved without "removed_fields", None was a removed field
+            else:
+                record[field] = new_value
+    for mac_address, fields in (removed_fields or {}).items():
+        for field in fields:
+            clients[mac_address].pop(field, None)
+    clients.update(delta['added'])
+    return clients
+
+
+class DeltaStore:
+    """
+    Store the successive reports as a chain of a full snapshot followed by deltas.
+    A new full snapshot is saved every {snapshot_interval} reports, any report can be rebuilt from the closest
+    snapshot and the deltas after it.
+    """
+
+    def __init__(self, folder=DELTA_STORE, snapshot_interval=SNAPSHOT_INTERVAL):
+        """
+        :param folder: folder where to save the snapshots, deltas and the chain.json index
+        :param snapshot_interval: a full snapshot is saved after this many deltas
+        """
+        self.folder = folder
+        self.snapshot_interval = snapshot_interval
+        os.makedirs(folder, exist_ok=True)
+        self.index_file = os.path.join(folder, 'chain.json')
+        if os.path.exists(self.index_file):
+            with open(self.index_file, 'rb') as file:
+                self.chain = dnac_json.load(file)
+        else:
+            self.chain = []
+
+    def _write(self, filename, data):
+        # atomic write, the file is complete or not saved
+        with tempfile.NamedTemporaryFile('wb', dir=self.folder, suffix='.tmp', delete=False) as file:
+            dnac_json.dump(data, file)
+        os.replace(file.name, os.path.join(self.folder, filename))
+
+    def _read(self, filename):
+        with open(os.path.join(self.folder, filename), 'rb') as file:
+            return dnac_json.load(file)
+
+    def add_report(self, source, report_id=None, execution_id=None):
+        """
+        Add the report to the store, as a delta from the previous report, or as a full snapshot
+        :param source: report file name, file object, or streamed response
+        :param report_id: report id, saved in the index
+        :param execution_id: execution id, saved in the index
+        :return: the chain entry for the report, with the number of added, removed and changed clients
+        """
+        seq = len(self.chain)
+        entry = {'seq': seq, 'report_id': report_id, 'execution_id': execution_id, 'created': time.time()}
+        deltas_since_snapshot = 0
+        for previous in reversed(self.chain):
+            if previous['type'] == 'snapshot':
+                break
+            deltas_since_snapshot += 1
+        if not self.chain or deltas_since_snapshot + 1 >= self.snapshot_interval:
+            clients = load_snapshot(source)
+            entry.update({'type': 'snapshot', 'file': 'snapshot-%06d.json' % seq, 'clients': len(clients)})
+            self._write(entry['file'], clients)
+        else:
+            delta = diff_snapshots(self.reconstruct(seq - 1), source)
+            entry.update({'type': 'delta', 'file': 'delta-%06d.json' % seq, 'added': len(delta['added']),
+                          'removed': len(delta['removed']), 'changed': len(delta['changed'])})
+            self._write(entry['file'], delta)
+        self.chain.append(entry)
+        self._write('chain.json', self.chain)
+        return entry
+
+    def get_delta(self, seq):
+        """
+        :param seq: report sequence number in the chain
+        :return: the delta from the previous report, None if the report was saved as a full snapshot
+        """
+        entry = self.chain[seq]
+        return self._read(entry['file']) if entry['type'] == 'delta' else None
+
+    def iter_deltas(self, since_seq=-1):
+        """
+        Iterate the deltas after the report {since_seq}, for the downstream systems that process only the changes
+        :param since_seq: the last report sequence number already processed
+        :return: generator of the chain entry and the delta, the delta is None for the full snapshots
+        """
+        for entry in self.chain[since_seq + 1:]:
+            yield entry, self.get_delta(entry['seq'])
+
+    def reconstruct(self, seq=-1):
+        """
+        Rebuild the report {seq}, from the closest full snapshot and the deltas after it
+        :param seq: report sequence number in the chain, the last report if not provided
+        :return: dict MAC address: client details
+        """
+        if seq < 0:
+            seq += len(self.chain)
+        snapshot_seq = seq
+        while self.chain[snapshot_seq]['type'] != 'snapshot':
+            snapshot_seq -= 1
+        clients = self._read(self.chain[snapshot_seq]['file'])
+        for entry in self.chain[snapshot_seq + 1:seq + 1]:
+            apply_delta(clients, self._read(entry['file']))
+        return clients
+
+
+def main():
+    """
+    This application will add a Client Detail report to the delta store, or rebuild a report from the store
+    """
+    parser = argparse.ArgumentParser(description='Save the Client Detail reports as snapshots and deltas')
+    parser.add_argument('--store', default=DELTA_STORE, help='delta store folder')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    add_parser = subparsers.add_parser('add', help='add a report to the store')
+    add_parser.add_argument('report', help='report file, for example report.json')
+    show_parser = subparsers.add_parser('show', help='rebuild a report from the store')
+    show_parser.add_argument('--seq', type=int, default=-1, help='report sequence number, default the last report')
+    show_parser.add_argument('output', help='file where to save the rebuilt report')
+    subparsers.add_parser('list', help='list the reports in the store')
+    args = parser.parse_args()
+
+    store = DeltaStore(args.store)
+    if args.command == 'add':
+        entry = store.add_report(args.report)
+        print('Report added:', json.dumps(entry))
+    elif args.command == 'show':
+        clients = store.reconstruct(args.seq)
+        with open(args.output, 'wb') as file:
+            dnac_json.dump({'client_details': list(clients.values())}, file)
+        print('Report saved to', args.output, ', clients:', len(clients))
+    else:
+        for entry in store.chain:
+            print(json.dumps(entry))
+
+
+if __name__ == '__main__':
+    main()
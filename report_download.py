@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import os
+import re
+import tempfile
+import time
+
+import dnac_json
+from report_stream import wrap_compression
+
+CHUNK_SIZE = 1024 * 1024  # report download chunk size, in bytes
+SNIFF_SIZE = 64 * 1024  # reports smaller than this are fully parsed to check for errors
+
+ERROR_KEY_PATTERN = re.compile(rb'^\s*\{\s*"error"\s*:')
+
+
+class ReportDownloadError(ValueError):
+    """
+    The report file was not downloaded, Cisco DNA Center returned an error instead of the report
+    """
+
+
+def sniff_report_error(head, complete):
+    """
+    Check if the report file is an error response, without parsing the full report
+    :param head: the first bytes of the report file
+    :param complete: True if {head} is the full report file
+    :return: the error, or None if the report file is not an error response
+    """
+    if complete:
+        try:
+            report_content = dnac_json.loads(head)
+        except ValueError:
+            return 'Report file is not valid JSON'
+        if isinstance(report_content, dict) and 'error' in report_content:
+            return report_content['error']
+        return None
+    if ERROR_KEY_PATTERN.match(head):
+        return 'Report error received'
+    return None
+
+
+def save_report_stream(response, filename, chunk_size=CHUNK_SIZE, compression=None):
+    """
+    Save the streamed report file to {filename}. The report is written in chunks to a temporary file, that is renamed
+    to {filename} only if the report is not an error response.
+    :param response: streamed response, from DnacClient.stream_report_file
+    :param filename: report file name
+    :param chunk_size: download chunk size, in bytes
+    :param compression: "gzip" or "zstd" to compress the report as it is written, not compressed if not provided
+    :return: the report size, in bytes, before compression
+    """
+    try:
+        if response.status_code != 200:
+            raise ReportDownloadError('Report not downloaded, status code ' + str(response.status_code) + ', ' +
+                                      response.text[:SNIFF_SIZE])
+        folder = os.path.dirname(os.path.abspath(filename))
+        temp_file = tempfile.NamedTemporaryFile(dir=folder, prefix='.report-', suffix='.tmp', delete=False)
+        try:
+            head = b''
+            size = 0
+            with temp_file as file, wrap_compression(file, 'wb', compression) as report_file:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if len(head) <= SNIFF_SIZE:
+                        head += chunk[:SNIFF_SIZE + 1 - len(head)]
+                    report_file.write(chunk)
+                    size += len(chunk)
+            report_error = sniff_report_error(head, size <= SNIFF_SIZE)
+            if report_error is not None:
+                raise ReportDownloadError(report_error)
+            os.replace(temp_file.name, filename)
+        except BaseException:
+            os.remove(temp_file.name)
+            raise
+    finally:
+        response.close()
+    return size
+
+
+def download_report(dnac, report_id, execution_id, filename, chunk_size=CHUNK_SIZE, compression=None):
+    """
+    Download the report file specified by the {report_id} and {execution_id} to {filename}
+    :param dnac: DnacClient
+    :param report_id: report id
+    :param execution_id: execution id
+    :param filename: report file name
+    :param chunk_size: download chunk size, in bytes
+    :param compression: "gzip" or "zstd" to compress the report as it is written, not compressed if not provided
+    :return: the report size, in bytes, before compression
+    """
+    start = time.monotonic()
+    response = dnac.stream_report_file(report_id, execution_id)
+    size = save_report_stream(response, filename, chunk_size=chunk_size, compression=compression)
+    dnac.metrics.record_download('report_file', size, time.monotonic() - start)
+    return size
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import itertools
+import sqlite3
+import time
+
+import dnac_json
+from report_stream import iter_client_details
+
+REPORT_INDEX_DB = 'report_index.db'
+BATCH_SIZE = 10000  # clients inserted in each batch
+QUERY_LIMIT = 100
+
+# the client fields indexed for the lookups
+INDEXED_FIELDS = ['macAddress', 'hostName', 'ipv4', 'username', 'site', 'ssid']
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS reports (report_id TEXT, execution_id TEXT, ingested REAL, clients INTEGER, '
+    'PRIMARY KEY (report_id, execution_id))',
+    'CREATE TABLE IF NOT EXISTS clients (report_id TEXT, execution_id TEXT, ' +
+    ', '.join(field + ' TEXT COLLATE NOCASE' for field in INDEXED_FIELDS) + ', record TEXT)',
+    'CREATE INDEX IF NOT EXISTS clients_execution ON clients (report_id, execution_id)'
+] + ['CREATE INDEX IF NOT EXISTS clients_' + field + ' ON clients (' + field + ')' for field in INDEXED_FIELDS]
+
+
+class ReportIndex:
+    """
+    SQLite index of the downloaded Client Detail reports, for fast client lookups across many reports
+    """
+
+    def __init__(self, db_file=REPORT_INDEX_DB):
+        """
+        :param db_file: SQLite database file
+        """
+        self.db_file = db_file
+        with self._connect() as db:
+            db.execute('PRAGMA journal_mode=WAL')  # the lookups are not blocked by the report ingestion
+            for statement in SCHEMA:
+                db.execute(statement)
+
+    def _connect(self):
+        # a new connection for each operation, the index is used by many report worker threads
+        return sqlite3.connect(self.db_file, timeout=60)
+
+    def ingest(self, source, report_id, execution_id):
+        """
+        Bulk load the report clients to the index, the clients of the same report execution are replaced
+        :param source: report file name, file object, or streamed response
+        :param report_id: report id
+        :param execution_id: execution id
+        :return: the number of clients loaded
+        """
+        rows = ((report_id, execution_id) + tuple(record.get(field) for field in INDEXED_FIELDS) +
+                (dnac_json.dumps(record),) for record in iter_client_details(source))
+        insert = 'INSERT INTO clients VALUES (' + ', '.join('?' * (len(INDEXED_FIELDS) + 3)) + ')'
+        clients = 0
+        db = self._connect()
+        try:
+            with db:
+                db.execute('DELETE FROM clients WHERE report_id = ? AND execution_id = ?', (report_id, execution_id))
+                while True:
+                    batch = list(itertools.islice(rows, BATCH_SIZE))
+                    if not batch:
+                        break
+                    db.executemany(insert, batch)
+                    clients += len(batch)
+                db.execute('INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?)',
+                           (report_id, execution_id, time.time(), clients))
+        finally:
+            db.close()
+        return clients
+
+    def query(self, limit=QUERY_LIMIT, **fields):
+        """
+        Find the clients, in all the reports, newest reports first
+        :param limit: max number of clients returned
+        :param fields: the client fields to match, for example macAddress='F0:8A:76:25:1F:5A', the match is case
+        insensitive and "%" can be used as wildcard
+        :return: list of dicts with the report id, execution id, report ingestion time and the client details
+        """
+        conditions = []
+        values = []
+        for field, value in fields.items():
+            if field not in INDEXED_FIELDS:
+                raise ValueError('Field not indexed: ' + field)
+            if value is None:
+                continue
+            conditions.append('clients.' + field + (' LIKE ?' if '%' in value else ' = ?'))
+            values.append(value)
+        statement = ('SELECT clients.report_id, clients.execution_id, reports.ingested, clients.record FROM clients '
+                     'JOIN reports ON clients.report_id = reports.report_id '
+                     'AND clients.execution_id = reports.execution_id')
+        if conditions:
+            statement += ' WHERE ' + ' AND '.join(conditions)
+        statement += ' ORDER BY reports.ingested DESC LIMIT ?'
+        db = self._connect()
+        try:
+            rows = db.execute(statement, values + [limit]).fetchall()
+        finally:
+            db.close()
+        return [{'report_id': report_id, 'execution_id': execution_id, 'ingested': ingested,
+                 'client': dnac_json.loads(record)} for report_id, execution_id, ingested, record in rows]
+
+
+def main():
+    """
+    This application will look up the clients in the report index, or add a report to the index
+    """
+    parser = argparse.ArgumentParser(description='Look up the clients in the downloaded Client Detail reports')
+    parser.add_argument('--db', default=REPORT_INDEX_DB, help='report index SQLite file')
+    parser.add_argument('--ingest', metavar='REPORT', help='add the report file to the index')
+    parser.add_argument('--report-id', help='report id, for the report added to the index')
+    parser.add_argument('--execution-id', help='execution id, for the report added to the index')
+    parser.add_argument('--mac', help='client MAC address')
+    parser.add_argument('--host', help='client host name, "%%" can be used as wildcard')
+    parser.add_argument('--ipv4', help='client IPv4 address')
+    parser.add_argument('--username', help='client username')
+    parser.add_argument('--site', help='client site, "%%" can be used as wildcard')
+    parser.add_argument('--ssid', help='client SSID')
+    parser.add_argument('--limit', type=int, default=QUERY_LIMIT, help='max number of clients listed')
+    args = parser.parse_args()
+
+    report_index = ReportIndex(args.db)
+    if args.ingest:
+        if not args.report_id or not args.execution_id:
+            parser.error('--report-id and --execution-id are required with --ingest')
+        start = time.monotonic()
+        clients = report_index.ingest(args.ingest, args.report_id, args.execution_id)
+        print('Report added to the index, clients: %d, time: %.2fs' % (clients, time.monotonic() - start))
+        return
+
+    start = time.monotonic()
+    results = report_index.query(limit=args.limit, macAddress=args.mac, hostName=args.host, ipv4=args.ipv4,
+                                 username=args.username, site=args.site, ssid=args.ssid)
+    for result in results:
+        client = result['client']
+        print(time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(result['ingested'])), result['report_id'],
+              client.get('macAddress'), client.get('hostName'), client.get('ipv4'), client.get('username'),
+              client.get('site'), client.get('ssid'), client.get('lastUpdated'))
+    print('\nClients found: %d, query time: %.1f ms' % (len(results), (time.monotonic() - start) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import time
+
+from dotenv import load_dotenv
+
+import dnac_json
+from dnac_client import DnacClient
+from dnac_logging import setup_logging, truncate
+from report_catalog import ReportCatalog
+from report_definitions import DEFAULT_PROFILE, build_report_request, get_profile_fields
+from report_download import download_report
+from report_poller import ExecutionPoller, ReportExecutionError
+from report_profiles import ProfileHistory
+from report_registry import ReportRegistry
+
+load_dotenv('environment.env')
+
+DNAC_URL = os.getenv('DNAC_URL')
+DNAC_USER = os.getenv('DNAC_USER')
+DNAC_PASS = os.getenv('DNAC_PASS')
+
+MAX_CONCURRENCY = 5  # max number of reports in progress at the same time
+OUTPUT_DIR = 'reports'
+
+logger = logging.getLogger(__name__)
+
+
+class ReportOrchestrator:
+    """
+    Create, track and download many reports at the same time.
+    Each report spec is a dict with the keys:
+     - name: report name
+     - category: report category, default "Client"
+     - view_name: report view name, default "Client Detail"
+     - profile: field profile name, from FIELD_PROFILES, optional
+     - fields: report fields, optional, used instead of the profile fields
+     - filters: report filters, optional
+     - output: file name where to save the report, optional
+     - baseline: save the execution time and bytes to the profile history, default True, False for the reports not
+       comparable with the full reports, for example the shard reports
+    """
+
+    def __init__(self, dnac, max_concurrency=MAX_CONCURRENCY, output_dir=OUTPUT_DIR, poller=None, catalog=None,
+                 profile_history=None, registry=None, history_scope=None):
+        """
+        :param dnac: DnacClient
+        :param max_concurrency: max number of reports in progress at the same time
+        :param output_dir: folder where to save the reports
+        :param poller: ExecutionPoller used to track the report executions
+        :param catalog: ReportCatalog used to find the report views
+        :param profile_history: ProfileHistory where to save the execution time and bytes for each field profile
+        :param registry: ReportRegistry used to execute again the reports created by the previous runs, instead of a
+        new report for each run, a new report is created for each spec if not provided
+        :param history_scope: the profile history scope, for example the cluster name
+        """
+        self.dnac = dnac
+        self.max_concurrency = max_concurrency
+        self.output_dir = output_dir
+        self.poller = poller or ExecutionPoller(dnac)
+        self.catalog = catalog or ReportCatalog(dnac)
+        self.profile_history = profile_history if profile_history is not None else ProfileHistory()
+        self.registry = registry
+        self.history_scope = history_scope
+
+    async def run_report(self, spec, semaphore, global_semaphore=None):
+        """
+        Create the report for the {spec}, wait for the execution to complete and download the report
+        :param spec: report spec
+        :param semaphore: limits the number of reports in progress
+        :param global_semaphore: limits the number of reports in progress shared with other orchestrators, optional
+        :return: the report result, with the report id, execution id, status and timing
+        """
+        result = {'name': spec['name'], 'report_id': None, 'execution_id': None, 'output': None,
+                  'status': 'FAILED', 'error': None}
+        async with semaphore, global_semaphore or contextlib.nullcontext():
+            start = time.monotonic()
+            try:
+                report_category = spec.get('category', 'Client')
+                view_name = spec.get('view_name', 'Client Detail')
+                view_group_id, report_view_id = await asyncio.to_thread(self.catalog.discover, report_category,
+                                                                         view_name)
+                fields = spec.get('fields')
+                profile = spec.get('profile', DEFAULT_PROFILE) if fields is None else None
+                if profile is not None:
+                    # the profile fields are validated against the report view fields
+                    report_detail_view = await asyncio.to_thread(self.catalog.get_view_details, view_group_id,
+                                                                 report_view_id)
+                    fields = get_profile_fields(profile, report_detail_view)
+                report_request = build_report_request(spec['name'], report_category, view_group_id, view_name,
+                                                      report_view_id, fields=fields, filters=spec.get('filters'))
+
+                since = None
+                if self.registry is not None:
+                    # the report with the same name and definition is executed again, only the executions started
+                    # after the last execution seen are checked
+                    report_id, since = await asyncio.to_thread(self.registry.run, report_request)
+                else:
+                    create_report_status = await asyncio.to_thread(self.dnac.create_report, report_request)
+                    if create_report_status.status_code != 200:
+                        raise ReportExecutionError('Report not submitted, ' + create_report_status.text)
+                    try:
+                        report_id = dnac_json.loads(create_report_status.content)['reportId']
+                    except (KeyError, TypeError, ValueError):
+                        raise ReportExecutionError('Report id not found, ' + create_report_status.text[:200])
+                result['report_id'] = report_id
+                result['submit_time'] = time.monotonic() - start
+
+                # the execution duration depends on the fields, the durations are saved by view and profile
+                history_key = report_view_id if profile in (None, DEFAULT_PROFILE) else report_view_id + '/' + profile
+                execution_info = await self.poller.wait_for_execution_async(report_id, view_id=history_key,
+                                                                            since=since)
+                if self.registry is not None:
+                    await asyncio.to_thread(self.registry.update, spec['name'], execution_info)
+                execution_id = execution_info['executionId']
+                result['execution_id'] = execution_id
+                result['execution_time'] = time.monotonic() - start - result['submit_time']
+
+                download_start = time.monotonic()
+                output = spec.get('output') or os.path.join(self.output_dir, report_id + '.json')
+                result['size'] = await asyncio.to_thread(download_report, self.dnac, report_id, execution_id, output)
+                result['output'] = output
+                result['download_time'] = time.monotonic() - download_start
+                if profile is not None and spec.get('baseline', True):
+                    self.profile_history.add(profile, execution_info, result['size'], scope=self.history_scope)
+                result['status'] = 'SUCCESS'
+            except Exception as error:
+                result['error'] = str(error)
+            result['total_time'] = time.monotonic() - start
+        return result
+
+    async def run(self, specs, on_complete=None, global_semaphore=None):
+        """
+        Run all the reports in {specs}, the reports are downloaded as soon as each execution completes
+        :param specs: list of report specs
+        :param on_complete: function called with each report result, when the report is completed
+        :param global_semaphore: limits the number of reports in progress shared with other orchestrators, for
+        example one orchestrator for each Cisco DNA Center cluster, optional
+        :return: the report results, in the order the reports completed, and the total time
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        start = time.monotonic()
+        results = []
+        for task in asyncio.as_completed([self.run_report(spec, semaphore, global_semaphore) for spec in specs]):
+            result = await task
+            results.append(result)
+            if on_complete:
+                on_complete(result)
+        return results, time.monotonic() - start
+
+
+def log_result(result):
+    """
+    Log the report result, with the report ids and timing
+    :param result: report result
+    :return None
+    """
+    log_fields = {'report_name': result['name'], 'report_id': result['report_id'],
+                  'execution_id': result['execution_id'], 'total_time': round(result['total_time'], 1)}
+    if result.get('cluster'):
+        log_fields['cluster'] = result['cluster']
+    if result['status'] == 'SUCCESS':
+        logger.info('Report saved', extra=dict(log_fields, output=result['output'], bytes=result['size'],
+                                               submit_time=round(result['submit_time'], 1),
+                                               execution_time=round(result['execution_time'], 1),
+                                               download_time=round(result['download_time'], 1)))
+    else:
+        logger.error('Report failed, %s', truncate(result['error']), extra=log_fields)
+
+
+def main():
+    """
+    This application will create all the reports from a JSON file with a list of report specs, and save the reports
+    when the executions are completed
+    """
+    parser = argparse.ArgumentParser(description='Create and download many Cisco DNA Center reports')
+    parser.add_argument('specs', help='JSON file with the list of report specs')
+    parser.add_argument('--concurrency', type=int, default=MAX_CONCURRENCY,
+                        help='max number of reports in progress at the same time')
+    parser.add_argument('--output-dir', default=OUTPUT_DIR, help='folder where to save the reports')
+    parser.add_argument('--refresh-catalog', action='store_true',
+                        help='discover the report view groups and views again, do not use the cached catalog')
+    args = parser.parse_args()
+
+    with open(args.specs) as file:
+        specs = json.load(file)
+
+    setup_logging()
+    logger.info('Report Orchestrator App Run Start', extra={'reports': len(specs), 'concurrency': args.concurrency})
+
+    dnac = DnacClient(DNAC_URL, DNAC_USER, DNAC_PASS, pool_size=max(args.concurrency, 10))
+    catalog = ReportCatalog(dnac, refresh=args.refresh_catalog)
+    orchestrator = ReportOrchestrator(dnac, max_concurrency=args.concurrency, output_dir=args.output_dir,
+                                      catalog=catalog)
+    results, total_time = asyncio.run(orchestrator.run(specs, on_complete=log_result))
+    dnac.close()
+
+    completed = len([result for result in results if result['status'] == 'SUCCESS'])
+    logger.info('Reports completed', extra={'completed': completed, 'reports': len(results),
+                                            'total_time': round(total_time, 1)})
+    logger.info('Cisco DNA Center API metrics', extra={'metrics': dnac.metrics.summary()})
+    logger.info('Report Orchestrator App Run End')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import asyncio
+import logging
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+import requests
+
+import dnac_json
+
+SUCCESS_STATUS = 'SUCCESS'
+FAILED_STATUSES = {'FAILED', 'FAILURE', 'ERROR', 'CANCELLED', 'ABORTED'}
+
+HISTORY_FILE = 'execution_history.json'
+HISTORY_SIZE = 20  # execution durations kept for each report view
+
+logger = logging.getLogger(__name__)
+
+
+class ReportExecutionError(Exception):
+    """
+    The report execution completed with a failed status
+    """
+
+    def __init__(self, message, execution_info=None):
+        super().__init__(message)
+        self.execution_info = execution_info
+
+
+class PollTimeoutError(ReportExecutionError):
+    """
+    The report execution did not complete before the poller deadline
+    """
+
+
+def get_new_executions(report_details, since=None):
+    """
+    Find the executions started after the execution start time {since}
+    :param report_details: the report executions info, from get_report_executions
+    :param since: start time of the last execution already seen, epoch milliseconds, all the executions if None
+    :return: list of the new executions
+    """
+    executions = report_details.get('executions') or []
+    if since is None:
+        return executions
+    return [execution for execution in executions if (execution.get('startTime') or 0) > since]
+
+
+def get_latest_execution(report_details, since=None):
+    """
+    Find the most recent execution in the report executions info
+    :param report_details: the report executions info, from get_report_executions
+    :param since: start time of the last execution already seen, the older executions are ignored
+    :return: the most recent execution, or None if the report was not executed yet
+    """
+    executions = get_new_executions(report_details, since)
+    if not executions:
+        return None
+    return max(executions, key=lambda execution: execution.get('startTime') or 0)
+
+
+def get_execution_duration(execution_info):
+    """
+    :param execution_info: report execution info
+    :return: the execution duration in seconds, or None if the execution did not complete
+    """
+    start_time = execution_info.get('startTime')
+    end_time = execution_info.get('endTime')
+    if not start_time or not end_time or end_time < start_time:
+        return None
+    return (end_time - start_time) / 1000  # Cisco DNA Center times are epoch milliseconds
+
+
+class ExecutionHistory:
+    """
+    Durations of the past report executions, for each report view, saved to the {HISTORY_FILE} file
+    """
+
+    def __init__(self, filename=HISTORY_FILE, size=HISTORY_SIZE):
+        self.filename = filename
+        self.size = size
+        self._durations = {}
+        self._lock = threading.Lock()
+        if filename and os.path.exists(filename):
+            try:
+                with open(filename, 'rb') as file:
+                    self._durations = dnac_json.load(file)
+            except (OSError, ValueError) as error:
+                logger.warning('Execution history not loaded, %s', error, extra={'file': filename})
+                self._durations = {}
+
+    def _write(self):
+        # atomic write, the file is complete or not saved, the lock is held by the caller
+        with tempfile.NamedTemporaryFile('wb', dir=os.path.dirname(self.filename) or '.', suffix='.tmp',
+                                         delete=False) as file:
+            dnac_json.dump(self._durations, file)
+        os.replace(file.name, self.filename)
+
+    def add(self, view_id, duration):
+        """
+        Save the execution duration for the report view {view_id}
+        :param view_id: report view id
+        :param duration: execution duration in seconds
+        :return None
+        """
+        with self._lock:
+            durations = self._durations.setdefault(view_id, [])
+            durations.append(duration)
+            del durations[:-self.size]
+            if self.filename:
+                try:
+                    self._write()
+                except OSError as error:
+                    logger.warning('Execution history not saved, %s', error, extra={'file': self.filename})
+
+    def estimate(self, view_id):
+        """
+        :param view_id: report view id
+        :return: the expected execution duration in seconds, or None if there are no past executions
+        """
+        with self._lock:
+            durations = self._durations.get(view_id)
+            if not durations:
+                return None
+            return statistics.median(durations)
+
+
+class ExecutionPoller:
+    """
+    Poll the report executions until the most recent execution completes.
+    The poll interval grows exponentially, with jitter, up to {max_interval}. When past executions of the same view
+    are known, the next poll is scheduled close to the expected completion time.
+    """
+
+    def __init__(self, dnac, initial_interval=1, max_interval=30, multiplier=2, jitter=0.2, deadline=1800,
+                 history=None):
+        """
+        :param dnac: DnacClient
+        :param initial_interval: first poll interval, in seconds
+        :param max_interval: max poll interval, in seconds
+        :param multiplier: poll interval growth for each poll
+        :param jitter: random variation of the poll interval, as a fraction of the interval
+        :param deadline: max time to wait for the execution to complete, in seconds
+        :param history: ExecutionHistory used to estimate the execution duration
+        """
+        self.dnac = dnac
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.deadline = deadline
+        self.history = history if history is not None else ExecutionHistory()
+
+    def next_interval(self, interval, elapsed, expected_duration):
+        """
+        Calculate the time to wait before the next poll
+        :param interval: the current backoff interval
+        :param elapsed: time since the polling started
+        :param expected_duration: expected execution duration, None if not known
+        :return: time to wait, in seconds
+        """
+        wait = interval
+        if expected_duration is not None and expected_duration - elapsed > interval:
+            wait = expected_duration - elapsed
+        wait = min(wait, self.max_interval)
+        return wait * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def check_execution(self, report_id, report_details, view_id=None, since=None):
+        """
+        Check the status of the most recent execution of the report {report_id}
+        :param report_id: the report id
+        :param report_details: the report executions info, from get_report_executions
+        :param view_id: report view id, the execution duration is saved to the history
+        :param since: start time of the last execution already seen, wait for an execution started after it
+        :return: the execution info if the execution completed successfully, None if still in progress
+        """
+        execution_info = get_latest_execution(report_details, since)
+        if execution_info is None:
+            return None
+        process_status = execution_info.get('processStatus')
+        if process_status == SUCCESS_STATUS:
+            duration = get_execution_duration(execution_info)
+            if view_id and duration is not None:
+                self.history.add(view_id, duration)
+            self.dnac.metrics.report_completed(report_id, process_status)
+            return execution_info
+        if process_status in FAILED_STATUSES:
+            self.dnac.metrics.report_completed(report_id, process_status)
+            raise ReportExecutionError('Report ' + report_id + ' execution ' + process_status, execution_info)
+        return None
+
+    def _poll_waits(self, report_id, view_id):
+        # generate the time to wait before each poll, until the deadline is reached
+        expected_duration = self.history.estimate(view_id) if view_id else None
+        start = time.monotonic()
+        interval = self.initial_interval
+        while True:
+            elapsed = time.monotonic() - start
+            if elapsed >= self.deadline:
+                raise PollTimeoutError('Report ' + report_id + ' execution not completed in ' +
+                                       str(self.deadline) + ' seconds')
+            wait = self.next_interval(interval, elapsed, expected_duration)
+            yield min(wait, self.deadline - elapsed)
+            interval = min(interval * self.multiplier, self.max_interval)
+
+    def wait_for_execution(self, report_id, view_id=None, on_poll=None, since=None):
+        """
+        Wait for the most recent execution of the report {report_id} to complete
+        :param report_id: the report id
+        :param view_id: report view id, used to estimate the execution duration
+        :param on_poll: function called with the report executions info after each poll
+        :param since: start time of the last execution already seen, for the existing reports executed again, the
+        older executions are ignored
+        :return: the completed execution info
+        """
+        for wait in self._poll_waits(report_id, view_id):
+            time.sleep(wait)
+            try:
+                report_details = self.dnac.get_report_executions(report_id)
+            except requests.exceptions.RequestException as error:
+                # the API call failed after the retries, or the circuit is open, poll again until the deadline
+                logger.warning('Report executions not received, %s', error, extra={'report_id': report_id})
+                continue
+            if on_poll:
+                on_poll(report_details)
+            execution_info = self.check_execution(report_id, report_details, view_id, since)
+            if execution_info is not None:
+                return execution_info
+
+    async def wait_for_execution_async(self, report_id, view_id=None, on_poll=None, since=None):
+        """
+        Wait for the most recent execution of the report {report_id} to complete, without blocking the event loop
+        :param report_id: the report id
+        :param view_id: report view id, used to estimate the execution duration
+        :param on_poll: function called with the report executions info after each poll
+        :param since: start time of the last execution already seen, for the existing reports executed again, the
+        older executions are ignored
+        :return: the completed execution info
+        """
+        for wait in self._poll_waits(report_id, view_id):
+            await asyncio.sleep(wait)
+            try:
+                report_details = await asyncio.to_thread(self.dnac.get_report_executions, report_id)
+            except requests.exceptions.RequestException as error:
+                logger.warning('Report executions not received, %s', error, extra={'report_id': report_id})
+                continue
+            if on_poll:
+                on_poll(report_details)
+            execution_info = self.check_execution(report_id, report_details, view_id, since)
+            if execution_info is not None:
+                return execution_info
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import os
+import statistics
+import threading
+import time
+
+import dnac_json
+from report_definitions import DEFAULT_PROFILE, FIELD_PROFILES
+from report_poller import get_execution_duration
+
+PROFILE_HISTORY_FILE = 'profile_history.json'
+PROFILE_HISTORY_SIZE = 50  # measurements kept for each field profile
+
+
+class ProfileHistory:
+    """
+    Execution time and downloaded bytes of the past reports, for each field profile, saved to the
+    {PROFILE_HISTORY_FILE} file. The reports of a scope, for example a Cisco DNA Center cluster, are saved apart from
+    the other reports, the execution time depends on the cluster.
+    """
+
+    def __init__(self, filename=PROFILE_HISTORY_FILE, size=PROFILE_HISTORY_SIZE):
+        self.filename = filename
+        self.size = size
+        self._measurements = {}
+        self._lock = threading.Lock()
+        if filename and os.path.exists(filename):
+            try:
+                with open(filename) as file:
+                    self._measurements = dnac_json.load(file)
+            except ValueError:
+                self._measurements = {}
+
+    def add(self, profile, execution_info, size, scope=None):
+        """
+        Save the report measurements for the field {profile}
+        :param profile: field profile name
+        :param execution_info: the completed report execution info, the execution time is read from the execution
+        start and end time
+        :param size: the report file size, in bytes
+        :param scope: the measurements scope, for example the cluster name, None for the reports of the default
+        Cisco DNA Center
+        :return None
+        """
+        measurement = {'time': time.time(), 'execution_time': get_execution_duration(execution_info), 'bytes': size}
+        with self._lock:
+            measurements = self._measurements.setdefault(profile if scope is None else scope + '/' + profile, [])
+            measurements.append(measurement)
+            del measurements[:-self.size]
+            if self.filename:
+                with open(self.filename, 'w') as file:
+                    dnac_json.dump(self._measurements, file)
+
+    def summary(self, scope=None):
+        """
+        :param scope: the measurements scope, None for the reports of the default Cisco DNA Center
+        :return: dict profile: number of reports, median execution time in seconds and median bytes
+        """
+        with self._lock:
+            summary = {}
+            for key, measurements in self._measurements.items():
+                key_scope, _, profile = key.rpartition('/')
+                if key_scope != (scope or ''):
+                    continue
+                execution_times = [item['execution_time'] for item in measurements
+                                   if item['execution_time'] is not None]
+                summary[profile] = {
+                    'reports': len(measurements),
+                    'execution_time': statistics.median(execution_times) if execution_times else None,
+                    'bytes': statistics.median([item['bytes'] for item in measurements])
+                }
+            return summary
+
+
+def main():
+    """
+    This application will compare the report execution time and the bytes downloaded, for each field profile, with
+    the reports with all the fields
+    """
+    parser = argparse.ArgumentParser(description='Compare the Client Detail reports field profiles')
+    parser.add_argument('--history', default=PROFILE_HISTORY_FILE, help='profile history file')
+    parser.add_argument('--scope', help='the reports of this scope, for example the cluster name')
+    args = parser.parse_args()
+
+    summary = ProfileHistory(args.history).summary(args.scope)
+    baseline = summary.get(DEFAULT_PROFILE)
+    print('%-12s %6s %8s %14s %10s %14s %10s' % ('Profile', 'Fields', 'Reports', 'Execution (s)', 'vs all',
+                                                 'Bytes', 'vs all'))
+    for profile, measurement in sorted(summary.items()):
+        execution_change = bytes_change = ''
+        if baseline and profile != DEFAULT_PROFILE:
+            if baseline['execution_time'] and measurement['execution_time'] is not None:
+                execution_change = '%+.0f%%' % ((measurement['execution_time'] / baseline['execution_time'] - 1) * 100)
+            if baseline['bytes']:
+                bytes_change = '%+.0f%%' % ((measurement['bytes'] / baseline['bytes'] - 1) * 100)
+        execution_time = measurement['execution_time']
+        print('%-12s %6s %8d %14s %10s %14d %10s' % (
+            profile, len(FIELD_PROFILES.get(profile, [])) or '-', measurement['reports'],
+            '%.1f' % execution_time if execution_time is not None else '-', execution_change, measurement['bytes'],
+            bytes_change))
+
+
+if __name__ == '__main__':
+    main()
@@ -21,20 +21,27 @@ __copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
 __license__ = "Cisco Sample Code License, Version 1.1"
 
 
+import logging
 import os
+import queue
 import time
+
 import requests
-import urllib3
-import json
 
-from flask import Flask, request
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_basicauth import BasicAuth
-from requests.auth import HTTPBasicAuth  # for Basic Auth
-from urllib3.exceptions import InsecureRequestWarning  # for insecure https warnings
 from dotenv import load_dotenv
 
+import dnac_json
+from dedup_cache import DedupCache
+from dnac_client import DnacClient
+from dnac_logging import setup_logging, truncate
+from report_download import ReportDownloadError
+from report_index import ReportIndex
+from report_store import REPORT_COMPRESSION, RETENTION_DAYS, ReportStore
+from report_workers import ReportWorkerPool
 
-urllib3.disable_warnings(InsecureRequestWarning)  # disable insecure https warnings
 
 load_dotenv('environment.env')
 
@@ -44,116 +51,195 @@ WEBHOOK_PASSWORD = os.getenv('WEBHOOK_PASSWORD')
 DNAC_URL = os.getenv('DNAC_URL')
 DNAC_USER = os.getenv('DNAC_USER')
 DNAC_PASS = os.getenv('DNAC_PASS')
+DNAC_POOL_SIZE = int(os.getenv('DNAC_POOL_SIZE', '10'))  # max connections kept open to Cisco DNA Center
+
+REPORT_STORE = os.getenv('REPORT_STORE', 'report_store')  # folder where the report executions are saved
+REPORT_COMPRESSION = os.getenv('REPORT_COMPRESSION', REPORT_COMPRESSION)  # zstd, gzip or none
+REPORT_RETENTION_DAYS = int(os.getenv('REPORT_RETENTION_DAYS', str(RETENTION_DAYS)))  # the older reports are deleted
+REPORT_STORE_MAX_MB = os.getenv('REPORT_STORE_MAX_MB')  # optional max size of the saved reports, in MB
+REPORT_INDEX_DB = os.getenv('REPORT_INDEX_DB', 'report_index.db')  # SQLite index of the downloaded reports
+REPORT_WORKERS = int(os.getenv('REPORT_WORKERS', '4'))  # number of threads downloading the reports
+REPORT_QUEUE_SIZE = int(os.getenv('REPORT_QUEUE_SIZE', '100'))  # max number of reports waiting for download
+DEDUP_CACHE_SIZE = int(os.getenv('DEDUP_CACHE_SIZE', '10000'))  # max number of notifications kept for duplicates check
+DEDUP_TTL = int(os.getenv('DEDUP_TTL', '86400'))  # notifications older than this are not duplicates, in seconds
+DEDUP_DB = os.getenv('DEDUP_DB')  # optional SQLite file, to detect the duplicates after a restart
+WEBHOOK_MAX_CONTENT_LENGTH = int(os.getenv('WEBHOOK_MAX_CONTENT_LENGTH', str(1024 * 1024)))  # max notification size
 
 os.environ['TZ'] = 'America/Los_Angeles'  # define the timezone for PST
 time.tzset()  # adjust the timezone, more info https://help.pythonanywhere.com/pages/SettingTheTimezone/
 
+# logging to the console and, JSON format, to the file {LOG_FILE}, the log records are written by a separate thread,
+# not by the request threads and the report workers
+setup_logging()
+logger = logging.getLogger('report_receiver')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Decode the webhook notifications, request.json, with the fast JSON codec when installed
+    """
+
+    def loads(self, s, **kwargs):
+        return dnac_json.loads(s)
+
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 
 app.config['BASIC_AUTH_USERNAME'] = WEBHOOK_USERNAME
 app.config['BASIC_AUTH_PASSWORD'] = WEBHOOK_PASSWORD
 # app.config['BASIC_AUTH_FORCE'] = True  # enable if all API endpoints support HTTP basic auth
+app.config['MAX_CONTENT_LENGTH'] = WEBHOOK_MAX_CONTENT_LENGTH  # larger requests are rejected with 413
 
 basic_auth = BasicAuth(app)
 
-DNAC_AUTH = HTTPBasicAuth(DNAC_USER, DNAC_PASS)
+# one pooled, keep-alive connection to Cisco DNA Center shared by all the notifications
+dnac = DnacClient(DNAC_URL, DNAC_USER, DNAC_PASS, pool_size=DNAC_POOL_SIZE)
 
 
-def pprint(json_data):
-    """
-    Pretty print JSON formatted data
-    :param json_data: data to pretty print
-    :return None
-    """
-    print(json.dumps(json_data, indent=4, separators=(' , ', ' : ')))
+@app.route('/')  # create a decorator for testing the Flask framework
+@basic_auth.required
+def index():
+    return '<h1>Flask Receiver App is Up!</h1>', 200
 
 
-def get_dnac_jwt_token(dnac_auth):
+def parse_report_notification(webhook_json):
     """
-    Create the authorization token required to access DNA C
-    Call to Cisco DNA Center - /api/system/v1/auth/login
-    :param dnac_auth - Cisco DNA Center Basic Auth string
-    :return: Cisco DNA Center JWT token
+    Parse the report id and execution id from the report completed notification
+    :param webhook_json: webhook notification payload
+    :return: the report id and the execution id, None if the notification is not for a completed report
     """
-    url = DNAC_URL + '/dna/system/api/v1/auth/token'
-    header = {'content-type': 'application/json'}
-    response = requests.post(url, auth=dnac_auth, headers=header, verify=False)
-    dnac_jwt_token = response.json()['Token']
-    return dnac_jwt_token
-
-
-def get_report_file(report_id, execution_id, dnac_auth):
+    # parse the report status and event type
+    event_type = webhook_json['Event Type']
+    event_status = webhook_json['Event Details']['status']
+    if event_type != 'APP' or event_status != 'Success':
+        return None
+
+    report_url = webhook_json['Cisco DNA Center Event Context link. **This link is active only in the context of Cisco DNA Center. You must have necessary permissions to login']
+    if not isinstance(report_url, str):
+        raise ValueError('The report link is not a string')
+
+    # parse the "data-set-id" and "execution-id" from the provided URL
+    report_id = None
+    execution_id = None
+    report_list = report_url.split('&')
+    for item in report_list:
+        if 'data-set-id' in item:
+            report_id = item.replace('data-set-id=', '')
+        elif 'execution-id' in item:
+            execution_id = item.replace('execution-id=', '')
+    if report_id is None or execution_id is None:
+        raise ValueError('Report id or execution id not found in the notification')
+    return report_id, execution_id
+
+
+def process_report(report_id, execution_id, dedup_keys=()):
     """
-    This function will return the report content specified by the {report_id} and {execution_id}
+    Download and save the report, this function is called by the report workers
     :param report_id: report id
     :param execution_id: execution id
-    :param dnac_auth: Cisco DNA Center Auth
-    :return: report data
+    :param dedup_keys: the notification keys, removed if the report is not downloaded, so the notification is
+    processed again when Cisco DNA Center sends it again
+    :return None
     """
-    url = DNAC_URL + '/dna/intent/api/v1/data/reports' + report_id + '/executions/' + execution_id
-    header = {'Content-Type': 'application/json', 'X-Auth-Token': dnac_auth}
-    response = requests.get(url, headers=header, verify=False)
-    report = response.json()
-    return report
+    log_fields = {'report_id': report_id, 'execution_id': execution_id}
+    logger.info('Report download started', extra=log_fields)
 
+    # call the API to download the report file, the report is streamed and compressed to a file in the report store,
+    # one file for each report execution, the notifications are processed at the same time by many report workers
+    try:
+        report_file, report_size = report_store.download(dnac, report_id, execution_id)
+        logger.info('Client report file saved', extra=dict(log_fields, file=report_file, bytes=report_size))
+    except (ReportDownloadError, requests.exceptions.RequestException) as error:
+        logger.error('Client report not saved, error received: %s', truncate(error), extra=log_fields)
+        report_notifications.discard(*dedup_keys)
+        raise
 
-@app.route('/')  # create a decorator for testing the Flask framework
-@basic_auth.required
-def index():
-    return '<h1>Flask Receiver App is Up!</h1>', 200
+    # add the report clients to the report index, for the client lookups
+    clients = report_index.ingest(report_file, report_id, execution_id)
+    logger.info('Client report added to the report index', extra=dict(log_fields, clients=clients))
 
 
-@app.route('/dnacenter_report', methods=['POST'])  # API endpoint to receive the client detail report
-@basic_auth.required
-def client_report():
-    if request.method == 'POST':
-        print('Webhook Received')
-        webhook_json = request.json
+# the downloaded reports are saved to the report store, the reports older than {REPORT_RETENTION_DAYS} are deleted
+report_store = ReportStore(REPORT_STORE, compression=REPORT_COMPRESSION, retention_days=REPORT_RETENTION_DAYS,
+                           max_bytes=int(float(REPORT_STORE_MAX_MB) * 1024 * 1024) if REPORT_STORE_MAX_MB else None)
 
-        # print the received notification
-        print('Payload: ')
-        print(webhook_json, '\n')
+# the downloaded reports are added to the index, for the client lookups
+report_index = ReportIndex(REPORT_INDEX_DB)
 
-        # parse the report status and event type
-        event_type = webhook_json['Event Type']
-        event_status = webhook_json['Event Details']['status']
+# the reports are downloaded by the worker threads, the webhook notifications are acknowledged right away
+report_workers = ReportWorkerPool(process_report, workers=REPORT_WORKERS, max_queue_size=REPORT_QUEUE_SIZE)
 
-        if event_type == 'APP' and event_status == 'Success':
+# the report notifications already received, by "Event Id" and by report id and execution id
+report_notifications = DedupCache(max_size=DEDUP_CACHE_SIZE, ttl=DEDUP_TTL, db_file=DEDUP_DB)
 
-            report_url = webhook_json['Cisco DNA Center Event Context link. **This link is active only in the context of Cisco DNA Center. You must have necessary permissions to login']
 
-            # parse the "data-set-id" and "execution-id" from the provided URL
-            report_list = report_url.split('&')
+@app.route('/stats')  # receiver statistics, token cache, report workers and duplicate notifications
+@basic_auth.required
+def stats():
+    return jsonify({
+        'token_cache': dnac.token_cache.stats(),
+        'circuit_breaker': dnac.circuit_breaker.stats(),
+        'report_workers': report_workers.stats(),
+        'notifications': report_notifications.stats(),
+        'report_store': report_store.stats(),
+        'dnac_api': dnac.metrics.summary()
+    }), 200
+
+
+@app.route('/metrics')  # Cisco DNA Center API metrics, Prometheus text format
+@basic_auth.required
+def metrics():
+    return Response(dnac.metrics.prometheus(), mimetype='text/plain; version=0.0.4'), 200
 
-            for item in report_list:
-                if 'data-set-id' in item:
-                    report_id = item.replace('data-set-id=', '')
-                elif 'execution-id' in item:
-                    execution_id = item.replace('execution-id=', '')
 
-            dnac_auth = get_dnac_jwt_token(DNAC_AUTH)
+@app.route('/reports/<report_id>/latest')  # the newest saved execution of the report
+@basic_auth.required
+def latest_report(report_id):
+    try:
+        execution = report_store.latest(report_id)
+    except ValueError:
+        execution = None
+    if execution is None:
+        return jsonify({'error': 'Report not found'}), 404
+    return jsonify(execution), 200
 
-            print('\nReport Id: ', report_id, '\nExecution Id: ', execution_id)
 
-            # call the API to download the report file
-            report_content = get_report_file(report_id, execution_id, dnac_auth)
-            print('\nReport content:\n', report_content)
+@app.route('/dnacenter_report', methods=['POST'])  # API endpoint to receive the client detail report
+@basic_auth.required
+def client_report():
+    if request.method == 'POST':
+        webhook_json = request.json
 
-            # save the report to a file
+        # log a summary of the received notification, not the full payload
+        try:
+            report = parse_report_notification(webhook_json)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            logger.warning('Invalid report notification', extra={'bytes': request.content_length})
+            return 'Invalid report notification', 400
+        logger.info('Webhook received', extra={
+            'event_id': webhook_json.get('Event Id'), 'event_type': webhook_json.get('Event Type'),
+            'report_id': report[0] if report else None, 'execution_id': report[1] if report else None,
+            'bytes': request.content_length})
+
+        if report is not None:
+            # DNAC sends the notification again on retries, the report is downloaded only once
+            report_id, execution_id = report
+            # the "Event Id" is optional, without it the notification is checked only by report id and execution id
+            dedup_keys = ('execution:' + report_id + '/' + execution_id,)
+            if webhook_json.get('Event Id'):
+                dedup_keys += ('event:' + str(webhook_json['Event Id']),)
+            if report_notifications.check_and_add(*dedup_keys):
+                logger.info('Duplicate notification, report already received',
+                            extra={'report_id': report_id, 'execution_id': execution_id})
+                return 'Client Detail Report Data Received', 202
             try:
-                report = json.dumps(report_content)
-
-                # verify if report file exists, if the "error" key exists
-                if 'error' in report_content:
-                    raise ValueError('Report error received')
-                with open('report.json', 'w') as file:
-                    file.write(report)
-                    print('Client report file saved')
-                    file.close()
-            except:
-                report_error = report_content['error']
-                print('Client report not saved, error received: ', report_error)
+                report_workers.submit(report_id, execution_id, dedup_keys)
+            except queue.Full:
+                report_notifications.discard(*dedup_keys)
+                logger.warning('Report queue full, notification rejected',
+                               extra={'report_id': report_id, 'execution_id': execution_id})
+                return 'Report queue full, try again later', 503
 
         return 'Client Detail Report Data Received', 202
     else:
@@ -161,4 +247,5 @@ def client_report():
 
 
 if __name__ == '__main__':
+    # Flask development server, run "serve_receiver.py" for the production server
     app.run(host='0.0.0.0', debug=True, ssl_context='adhoc')
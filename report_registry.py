@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+
+import dnac_json
+from dnac_resilience import DnacApiError
+from report_poller import get_latest_execution
+
+REGISTRY_DIR = '.report_registry'
+DEFINITION_TAG = 'definition:'  # the report tag with the report definition hash
+DEFINITION_HASH_LENGTH = 16
+
+# the report request keys not part of the report definition, the report is executed again when only these change
+NON_DEFINITION_KEYS = ('name', 'description', 'schedule', 'tags')
+
+logger = logging.getLogger(__name__)
+
+
+def definition_hash(report_request):
+    """
+    Hash of the report definition: the view, fields, filters, format and deliveries of the report request
+    :param report_request: the report request payload
+    :return: the definition hash, hex
+    """
+    definition = {key: value for key, value in report_request.items() if key not in NON_DEFINITION_KEYS}
+    canonical = json.dumps(definition, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:DEFINITION_HASH_LENGTH]
+
+
+def get_definition_tag(report):
+    """
+    :param report: report, from get_reports
+    :return: the definition hash in the report tags, None if the report was not created by the registry
+    """
+    for tag in report.get('tags') or []:
+        if isinstance(tag, str) and tag.startswith(DEFINITION_TAG):
+            return tag[len(DEFINITION_TAG):]
+    return None
+
+
+class ReportRegistry:
+    """
+    Registry of the reports created by the report apps, saved to a file for each Cisco DNA Center URL.
+    A report is created once, tagged with the hash of the report definition, and executed again on the next runs,
+    instead of a new report for each run. The report is created again only when the definition changes, and the
+    report with the old definition is deleted.
+    The start time of the last execution seen is saved for each report, only the newer executions are checked
+    when the report is executed again.
+    """
+
+    def __init__(self, dnac, registry_dir=REGISTRY_DIR):
+        """
+        :param dnac: DnacClient
+        :param registry_dir: folder where to save the registry files
+        """
+        self.dnac = dnac
+        url_hash = hashlib.sha1(dnac.dnac_url.encode()).hexdigest()[:16]
+        self.filename = os.path.join(registry_dir, 'registry-' + url_hash + '.json')
+        self._lock = threading.Lock()
+        self._reports = self._load()  # report name: report id, definition hash, last execution seen
+
+    def _load(self):
+        try:
+            with open(self.filename) as file:
+                registry = dnac_json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if registry.get('dnac_url') != self.dnac.dnac_url:
+            return {}
+        return registry.get('reports') or {}
+
+    def _save(self):
+        folder = os.path.dirname(self.filename)
+        os.makedirs(folder, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', dir=folder, suffix='.tmp', delete=False) as file:
+            dnac_json.dump({'dnac_url': self.dnac.dnac_url, 'reports': self._reports}, file)
+        os.replace(file.name, self.filename)
+
+    def get(self, report_name):
+        """
+        :param report_name: report name
+        :return: the registry entry for the report {report_name}, None if not registered
+        """
+        with self._lock:
+            entry = self._reports.get(report_name)
+            return dict(entry) if entry else None
+
+    def find_report(self, report_request, definition=None):
+        """
+        Find the report with the same name and definition as the {report_request} in Cisco DNA Center
+        :param report_request: the report request payload
+        :param definition: the definition hash, calculated if not provided
+        :return: the report, None if not found, and the list of the registry reports with the same name and an old
+        definition
+        """
+        definition = definition or definition_hash(report_request)
+        reports = self.dnac.get_reports(report_request.get('viewGroupId'), report_request.get('view', {}).get('viewId'))
+        report = None
+        stale_reports = []
+        for item in reports or []:
+            if item.get('name') != report_request['name']:
+                continue
+            report_definition = get_definition_tag(item)
+            if report_definition == definition and report is None:
+                report = item
+            elif report_definition is not None:
+                stale_reports.append(item)  # the reports without the definition tag were not created by the registry
+        return report, stale_reports
+
+    def _register(self, report_name, report_id, definition, last_start_time=None, last_execution_id=None):
+        self._reports[report_name] = {'report_id': report_id, 'definition': definition,
+                                      'last_start_time': last_start_time, 'last_execution_id': last_execution_id}
+        self._save()
+
+    def _delete_report(self, report_id):
+        response = self.dnac.delete_report(report_id)
+        if response.status_code >= 400 and response.status_code != 404:
+            logger.warning('Report with an old definition not deleted, status code %s', response.status_code,
+                           extra={'report_id': report_id})
+        else:
+            logger.info('Report with an old definition deleted', extra={'report_id': report_id})
+
+    def _create_report(self, report_request, definition):
+        report_request = copy.deepcopy(report_request)
+        report_request['tags'] = [tag for tag in report_request.get('tags') or []
+                                  if not tag.startswith(DEFINITION_TAG)] + [DEFINITION_TAG + definition]
+        response = self.dnac.create_report(report_request)
+        if response.status_code != 200:
+            raise DnacApiError('Report not submitted, ' + response.text[:200], response=response)
+        report_id = dnac_json.loads(response.content)['reportId']
+        self._register(report_request['name'], report_id, definition)
+        logger.info('Report created', extra={'report_id': report_id, 'definition': definition})
+        return report_id
+
+    def _get_latest_start_time(self, report_id, report_details=None):
+        """
+        :param report_id: the report id
+        :param report_details: the report executions info, requested if not provided
+        :return: the start time of the latest execution of the report, 0 if not executed yet, None if the report
+        was not found
+        """
+        if report_details is None or 'executions' not in report_details:
+            try:
+                report_details = self.dnac.get_report_executions(report_id)
+            except DnacApiError as error:
+                if error.response is not None and error.response.status_code == 404:
+                    return None
+                raise
+        latest = get_latest_execution(report_details)
+        return (latest.get('startTime') or 0) if latest else 0
+
+    def _execute_report(self, report_name, report_id, definition, since):
+        """
+        Execute again the report {report_id}, and save the new execution as the last execution seen
+        :return: True if the execution started, False if the report was not found
+        """
+        response = self.dnac.execute_report(report_id)
+        if response.status_code == 404:
+            return False
+        if response.status_code != 200:
+            raise DnacApiError('Report not executed, ' + response.text[:200], response=response)
+        execution = dnac_json.loads(response.content) if response.content else {}
+        self._register(report_name, report_id, definition, execution.get('startTime') or since,
+                       execution.get('executionId'))
+        logger.info('Report executed again', extra={'report_id': report_id, 'definition': definition,
+                                                    'execution_id': execution.get('executionId')})
+        return True
+
+    def run(self, report_request):
+        """
+        Run the report: execute again the registered report with the same definition, or create the report if not
+        found. The registry reports with the same name and an old definition are deleted.
+        :param report_request: the report request payload, from build_report_request
+        :return: the report id, and the start time of the last execution seen before this run, wait for an
+        execution started after it, None for a new report
+        """
+        report_name = report_request['name']
+        definition = definition_hash(report_request)
+        with self._lock:
+            entry = self._reports.get(report_name)
+            if entry and entry.get('definition') == definition:
+                # registered report, the Cisco DNA Center reports are not searched
+                report_id = entry['report_id']
+                since = entry.get('last_start_time')
+                if since is None:
+                    since = self._get_latest_start_time(report_id)
+                if since is not None and self._execute_report(report_name, report_id, definition, since):
+                    return report_id, since
+                logger.info('Registered report not found', extra={'report_id': report_id})
+                del self._reports[report_name]
+                self._save()
+
+            report, stale_reports = self.find_report(report_request, definition)
+            for stale_report in stale_reports:
+                self._delete_report(stale_report['reportId'])
+            if report is not None:
+                since = self._get_latest_start_time(report['reportId'], report)
+                if since is not None and self._execute_report(report_name, report['reportId'], definition, since):
+                    return report['reportId'], since
+            return self._create_report(report_request, definition), None
+
+    def update(self, report_name, execution_info):
+        """
+        Save the last execution seen for the report {report_name}, the older executions are ignored on the next runs
+        :param report_name: report name
+        :param execution_info: the completed execution info
+        :return None
+        """
+        with self._lock:
+            entry = self._reports.get(report_name)
+            start_time = execution_info.get('startTime')
+            if entry is None or start_time is None:
+                return
+            if entry.get('last_start_time') is None or start_time >= entry['last_start_time']:
+                entry['last_start_time'] = start_time
+                entry['last_execution_id'] = execution_info.get('executionId')
+                self._save()
@@ -0,0 +1,638 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import asyncio
+import contextlib
+import copy
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from dotenv import load_dotenv
+
+import dnac_json
+from dnac_client import DnacClient
+from dnac_logging import setup_logging
+from report_catalog import ReportCatalog
+from report_definitions import CLIENT_DETAIL_FILTERS, DEFAULT_PROFILE, FIELD_PROFILES
+from report_orchestrator import ReportOrchestrator, log_result
+from report_registry import ReportRegistry
+from report_stream import iter_client_details
+
+load_dotenv('environment.env')
+
+DNAC_URL = os.getenv('DNAC_URL')
+DNAC_USER = os.getenv('DNAC_USER')
+DNAC_PASS = os.getenv('DNAC_PASS')
+
+TIME_SHARDS = 4
+TIME_RANGE_HOURS = 24
+SITE_LEVEL = 2  # the site shards are the areas under Global
+CLIENT_KEY = 'macAddress'
+MERGE_SUFFIXES = ('_min', '_max', '_sum', '_avg', '_median')
+MERGE_BATCH = 500  # clients merged at a time, read and written to the merge state database in one query
+
+logger = logging.getLogger(__name__)
+
+
+def time_window_filters(windows, hours=TIME_RANGE_HOURS, end_time=None, filters=None):
+    """
+    Split the report time range into {windows} contiguous time windows
+    :param windows: number of time windows
+    :param hours: the report time range, in hours, ending at {end_time}
+    :param end_time: the time range end, epoch milliseconds, now if not provided
+    :param filters: the report filters, all the clients if not provided
+    :return: list of the report filters for each time window, oldest window first
+    """
+    end_time = int(end_time if end_time is not None else time.time() * 1000)
+    start_time = end_time - int(hours * 3600 * 1000)
+    window_filters = []
+    for window in range(windows):
+        window_start = start_time + (end_time - start_time) * window // windows
+        window_end = start_time + (end_time - start_time) * (window + 1) // windows
+        shard_filters = copy.deepcopy(filters if filters is not None else CLIENT_DETAIL_FILTERS)
+        for report_filter in shard_filters:
+            if report_filter.get('type') == 'TIME_RANGE':
+                report_filter['value'] = {'timeRangeOption': 'CUSTOM', 'startDateTime': window_start,
+                                          'endDateTime': window_end}
+        window_filters.append(shard_filters)
+    return window_filters
+
+
+def to_number(value):
+    """
+    :return: the report field value as float, None if the value is not a number, for example "--"
+    """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def format_number(value, integers):
+    """
+    Format the merged value as the report values, integer if all the merged values are integers
+    """
+    if integers:
+        return str(int(round(value)))
+    return repr(round(value, 2))
+
+
+def is_integer(value):
+    """
+    :return: True if the report field value is an integer, for example "12"
+    """
+    return isinstance(value, str) and value.lstrip('-').isdigit()
+
+
+def get_merge_rule(field):
+    """
+    :param field: the field name
+    :return: the merge rule of the field, from the field name suffix, "_min", "_max", "_sum", "_avg", "_median", or
+    None for the fields where the most recent value is kept
+    """
+    return next((suffix for suffix in MERGE_SUFFIXES if field.endswith(suffix)), None)
+
+
+def merge_field(field, state, value, window):
+    """
+    Add the field value from a time window to the field merge state, the time windows can be added in any order.
+    The merge state is a small list:
+     - the fields without a merge rule: [window, value]
+     - the fields with a merge rule: [window, last value, count, numbers, integers, min or max value, or the total]
+    :param field: the field name
+    :param state: the field merge state, None for the first value
+    :param value: the field value
+    :param window: the time window number, the most recent window has the highest number
+    :return: the updated merge state
+    """
+    rule = get_merge_rule(field)
+    if state is None:
+        state = [window, value] if rule is None else [window, value, 0, 0, True, None]
+    elif window >= state[0]:
+        state[0], state[1] = window, value
+    if rule is None:
+        return state
+    state[2] += 1
+    number = to_number(value)
+    if number is None:
+        return state
+    state[3] += 1
+    state[4] = state[4] and is_integer(value)
+    if rule in ('_min', '_max'):
+        best = to_number(state[5])
+        if best is None or (number < best if rule == '_min' else number > best):
+            state[5] = value  # the original value, not reformatted
+    else:
+        state[5] = (state[5] or 0) + number
+    return state
+
+
+def merged_value(field, state):
+    """
+    The merged value of the field:
+     - "_min", "_max" and "_sum" fields: the min, max and sum of the windows values, exact
+     - "_avg" field: the average of the windows values, approximate, the per window sample counts are not in the
+       report
+     - "_median" field: the average of the windows medians, approximate, the window samples are not in the report
+     - all the other fields: the value from the most recent window
+    :param field: the field name
+    :param state: the field merge state, from merge_field
+    :return: the merged value
+    """
+    rule = get_merge_rule(field)
+    if rule is None or state[2] == 1 or not state[3]:
+        return state[1]
+    if rule in ('_min', '_max'):
+        return state[5]
+    if rule == '_sum':
+        return format_number(state[5], state[4])
+    return format_number(state[5] / state[3], state[4])
+
+
+def merge_values(field, values):
+    """
+    Merge the values of the client {field} from the time windows, oldest window first, see merged_value
+    :param field: the field name
+    :param values: the field values, for each time window where the client was seen
+    :return: the merged value
+    """
+    state = None
+    for window, value in enumerate(values):
+        state = merge_field(field, state, value, window)
+    return merged_value(field, state)
+
+
+class ClientMerger:
+    """
+    Merge the clients from many reports into one client per MAC address.
+    The reports are read as streams, and the merge state of each client is kept in a SQLite database file, by MAC
+    address, only {MERGE_BATCH} clients are in memory at a time. The merged clients are saved in the order they
+    were first seen. The clients without a MAC address can not be merged, they are skipped.
+    """
+
+    def __init__(self, db_file=None):
+        """
+        :param db_file: SQLite database file for the merge state, a temporary file if not provided, deleted by close()
+        """
+        if db_file is None:
+            file, db_file = tempfile.mkstemp(prefix='report-merge-', suffix='.db')
+            os.close(file)
+        self.db_file = db_file
+        # the merge state is temporary, it does not need the journal
+        self._db = sqlite3.connect(db_file, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode = OFF')
+        self._db.execute('PRAGMA synchronous = OFF')
+        self._db.execute('CREATE TABLE IF NOT EXISTS clients (mac TEXT UNIQUE, state BLOB)')
+        self.clients = 0
+        self.records = 0
+        self.skipped = 0
+        self.reports = 0
+        self._other_fields = {}  # the other report fields, for example "filters", from the most recent window
+        self._other_fields_window = None
+        self._start_time = None  # the startTime filter of the oldest window
+        self._start_time_window = None
+
+    def add_report(self, source, window=None):
+        """
+        Add the clients from the report, the most recent values are kept, the reports can be added in any order
+        :param source: report file name, file object, or streamed response
+        :param window: the time window number of the report, the most recent window has the highest number, the
+        order the reports are added if not provided
+        :return: the number of clients in the report
+        """
+        window = self.reports if window is None else window
+        self.reports += 1
+        clients = 0
+        other_fields = {}
+        batch = []
+        for record in iter_client_details(source, other_fields=other_fields):
+            clients += 1
+            if not record.get(CLIENT_KEY):
+                self.skipped += 1
+                continue
+            batch.append(record)
+            if len(batch) >= MERGE_BATCH:
+                self._merge_batch(batch, window)
+                batch = []
+        self._merge_batch(batch, window)
+        self._db.commit()
+        self.records += clients
+        self._merge_other_fields(other_fields, window)
+        return clients
+
+    def _merge_batch(self, records, window):
+        if not records:
+            return
+        mac_addresses = list({record[CLIENT_KEY] for record in records})
+        states = {mac_address: dnac_json.loads(state) for mac_address, state in self._db.execute(
+            'SELECT mac, state FROM clients WHERE mac IN (' + ','.join('?' * len(mac_addresses)) + ')',
+            mac_addresses)}
+        new_clients = set()
+        for record in records:
+            mac_address = record[CLIENT_KEY]
+            state = states.get(mac_address)
+            if state is None:
+                state = states[mac_address] = {}
+                new_clients.add(mac_address)
+            for field, value in record.items():
+                state[field] = merge_field(field, state.get(field), value, window)
+        self._db.executemany('UPDATE clients SET state = ? WHERE mac = ?',
+                             [(dnac_json.dumpb(states[mac_address]), mac_address) for mac_address in mac_addresses
+                              if mac_address not in new_clients])
+        # the clients are inserted in the order they are first seen, the rowid order
+        self._db.executemany('INSERT INTO clients (mac, state) VALUES (?, ?)',
+                             [(mac_address, dnac_json.dumpb(states[mac_address])) for mac_address in
+                              dict.fromkeys(record[CLIENT_KEY] for record in records) if mac_address in new_clients])
+        self.clients += len(new_clients)
+
+    def _merge_other_fields(self, other_fields, window):
+        # the report filters from the most recent report, with the start time of the oldest report
+        for report_filter in other_fields.get('filters') or []:
+            if report_filter.get('name') == 'startTime' and (self._start_time_window is None or
+                                                              window < self._start_time_window):
+                self._start_time, self._start_time_window = report_filter.get('values'), window
+        if self._other_fields_window is None or window >= self._other_fields_window:
+            self._other_fields, self._other_fields_window = other_fields, window
+
+    @property
+    def other_fields(self):
+        """
+        :return: the other report fields, from the most recent report, with the start time of the oldest report
+        """
+        for report_filter in self._other_fields.get('filters') or []:
+            if report_filter.get('name') == 'startTime' and self._start_time is not None:
+                report_filter['values'] = self._start_time
+        return self._other_fields
+
+    def __len__(self):
+        return self.clients
+
+    def iter_clients(self):
+        """
+        :return: generator of the merged clients, in the order they were first seen
+        """
+        for state, in self._db.execute('SELECT state FROM clients ORDER BY rowid'):
+            yield {field: merged_value(field, field_state) for field, field_state in dnac_json.loads(state).items()}
+
+    def save(self, filename):
+        """
+        Save the merged clients to a report file, same format as the Cisco DNA Center reports. The report is written
+        to a temporary file, renamed to {filename} when complete.
+        :param filename: report file name
+        :return: the number of clients saved
+        """
+        folder = os.path.dirname(os.path.abspath(filename))
+        with tempfile.NamedTemporaryFile('wb', dir=folder, prefix='.report-', suffix='.tmp', delete=False) as file:
+            file.write(b'{"client_details": [')
+            for number, client in enumerate(self.iter_clients()):
+                file.write((b', ' if number else b'') + dnac_json.dumpb(client))
+            file.write(b']')
+            for name, value in self.other_fields.items():
+                file.write(b', ' + dnac_json.dumpb(name) + b': ' + dnac_json.dumpb(value))
+            file.write(b'}')
+        os.replace(file.name, filename)
+        return len(self)
+
+    def close(self):
+        """
+        Close and delete the merge state database
+        :return None
+        """
+        self._db.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.db_file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+async def run_shards(orchestrator, specs, on_complete=None):
+    """
+    Run the shard reports at the same time, up to the orchestrator max concurrency
+    :param orchestrator: ReportOrchestrator used to run the reports
+    :param specs: the report specs, one for each shard
+    :param on_complete: function called with each shard report result
+    :return: the shard report results, in the {specs} order, raises RuntimeError if any shard report failed
+    """
+    results, _ = await orchestrator.run(specs, on_complete=on_complete)
+    results_by_name = {result['name']: result for result in results}
+    results = [results_by_name[spec['name']] for spec in specs]
+    failed = [result['name'] for result in results if result['status'] != 'SUCCESS']
+    if failed:
+        raise RuntimeError('Shard reports failed: ' + ', '.join(failed))
+    return results
+
+
+def remove_shard_files(results, shard_dir, created):
+    """
+    Delete the shard reports after the merge, and the shard folder if it was created for this run
+    :param results: the shard report results
+    :param shard_dir: the shard reports folder
+    :param created: True if the folder was created for this run
+    :return None
+    """
+    for result in results:
+        if result.get('output'):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(result['output'])
+    if created:
+        shutil.rmtree(shard_dir, ignore_errors=True)
+
+
+async def run_time_shards(orchestrator, report_name, output, windows=TIME_SHARDS, hours=TIME_RANGE_HOURS,
+                          profile=DEFAULT_PROFILE, shard_dir=None, on_complete=None, keep_shards=False):
+    """
+    Create one report for each time window, all the reports run at the same time, and merge the reports. Each time
+    window report is merged as soon as it is downloaded, in a thread, while the other reports are still executing.
+    :param orchestrator: ReportOrchestrator used to run the reports
+    :param report_name: report name, the time window is added to the name of each report
+    :param output: file where to save the merged report
+    :param windows: number of time windows
+    :param hours: the report time range, in hours, ending now
+    :param profile: report field profile
+    :param shard_dir: folder where to save the time window reports, a temporary folder if not provided
+    :param on_complete: function called with each time window report result
+    :param keep_shards: keep the time window reports, they are deleted after the merge if False
+    :return: the time window report results, oldest window first, the number of merged clients and the number of
+    clients without a MAC address skipped
+    """
+    created = shard_dir is None or not os.path.isdir(shard_dir)
+    shard_dir = shard_dir or tempfile.mkdtemp(prefix='report-shards-')
+    os.makedirs(shard_dir, exist_ok=True)
+    specs = [{'name': '%s [%d of %d]' % (report_name, window + 1, windows), 'profile': profile,
+              'filters': shard_filters, 'output': os.path.join(shard_dir, 'shard-%03d.json' % window),
+              'baseline': False}
+             for window, shard_filters in enumerate(time_window_filters(windows, hours))]
+    windows_by_name = {spec['name']: window for window, spec in enumerate(specs)}
+    merger = ClientMerger(os.path.join(shard_dir, '.merge-%d.db' % os.getpid()))
+    merge_lock = asyncio.Lock()  # one merge at a time, the windows are merged in the order they complete
+    merges = []
+    results = []
+
+    async def merge_window(result):
+        async with merge_lock:
+            await asyncio.to_thread(merger.add_report, result['output'], windows_by_name[result['name']])
+
+    def window_completed(result):
+        results.append(result)
+        if on_complete:
+            on_complete(result)
+        if result['status'] == 'SUCCESS':
+            merges.append(asyncio.create_task(merge_window(result)))
+
+    try:
+        try:
+            results = await run_shards(orchestrator, specs, window_completed)
+        finally:
+            # the merges in progress complete before the merge state is deleted
+            await asyncio.gather(*merges, return_exceptions=True)
+        for merge in merges:
+            merge.result()  # raise the merge error, if any
+        clients = await asyncio.to_thread(merger.save, output)
+    finally:
+        merger.close()
+        if not keep_shards:
+            remove_shard_files(results, shard_dir, created)
+    return results, clients, merger.skipped
+
+
+def get_site_depth(site):
+    """
+    :param site: the site, from get_sites
+    :return: the site level in the site hierarchy, 1 for Global
+    """
+    return site['siteNameHierarchy'].count('/') + 1
+
+
+def select_site_shards(sites, level=SITE_LEVEL, prefix=None, sites_per_report=1):
+    """
+    Select the sites for the shard reports: the sites at the {level} of the site hierarchy, and the sites with no
+    child sites above the {level}, the Location filter includes the child sites
+    :param sites: all the sites, from get_sites
+    :param level: the site hierarchy level, 2 for the areas under Global
+    :param prefix: only the sites under this site hierarchy, for example "Global/San Francisco"
+    :param sites_per_report: number of sites in each shard report
+    :return: list of the site groups, one for each shard report
+    """
+    parents = {site['siteNameHierarchy'].rsplit('/', 1)[0] for site in sites if '/' in site['siteNameHierarchy']}
+    selected = sorted((site for site in sites
+                       if (get_site_depth(site) == level or
+                           (get_site_depth(site) < level and site['siteNameHierarchy'] not in parents)) and
+                       (not prefix or site['siteNameHierarchy'] == prefix or
+                        site['siteNameHierarchy'].startswith(prefix + '/'))),
+                      key=lambda site: site['siteNameHierarchy'])
+    return [selected[index:index + sites_per_report] for index in range(0, len(selected), sites_per_report)]
+
+
+def site_filters(site_group, filters=None):
+    """
+    Create the report filters for the sites in {site_group}
+    :param site_group: the sites, from get_sites
+    :param filters: the report filters, all the clients if not provided
+    :return: the report filters, with the sites in the Location filter
+    """
+    shard_filters = copy.deepcopy(filters if filters is not None else CLIENT_DETAIL_FILTERS)
+    for report_filter in shard_filters:
+        if report_filter.get('type') == 'MULTI_SELECT_TREE' and report_filter.get('name') == 'Location':
+            report_filter['value'] = [{'value': site['id'], 'displayValue': site['siteNameHierarchy']}
+                                      for site in site_group]
+    return shard_filters
+
+
+def stream_merge_reports(sources, filename):
+    """
+    Merge the reports into one report, the clients are written as they are read, only the MAC addresses are kept in
+    memory. A client in more than one report, roaming between the sites, is saved only from the first report. The
+    clients without a MAC address can not be deduplicated, they are skipped, same as ClientMerger.
+    :param sources: the report files
+    :param filename: merged report file name
+    :return: the number of clients saved, the number of duplicate clients and the number of clients without a MAC
+    address skipped
+    """
+    seen = set()
+    clients = duplicates = skipped = 0
+    other_fields = {}
+    locations = []
+    folder = os.path.dirname(os.path.abspath(filename))
+    with tempfile.NamedTemporaryFile('wb', dir=folder, prefix='.report-', suffix='.tmp', delete=False) as file:
+        file.write(b'{"client_details": [')
+        for source in sources:
+            report_fields = {}
+            for record in iter_client_details(source, other_fields=report_fields):
+                mac_address = record.get(CLIENT_KEY)
+                if not mac_address:
+                    skipped += 1
+                    continue
+                if mac_address in seen:
+                    duplicates += 1
+                    continue
+                seen.add(mac_address)
+                file.write((b', ' if clients else b'') + dnac_json.dumpb(record))
+                clients += 1
+            for report_filter in report_fields.get('filters') or []:
+                if report_filter.get('name') == 'Location':
+                    locations.extend(report_filter.get('values') or [])
+            other_fields = other_fields or report_fields
+        file.write(b']')
+        # the report filters from the first report, with the locations of all the reports
+        for report_filter in other_fields.get('filters') or []:
+            if report_filter.get('name') == 'Location':
+                report_filter['values'] = locations
+        for name, value in other_fields.items():
+            file.write(b', ' + dnac_json.dumpb(name) + b': ' + dnac_json.dumpb(value))
+        file.write(b'}')
+    os.replace(file.name, filename)
+    return clients, duplicates, skipped
+
+
+async def run_site_shards(orchestrator, report_name, output, site_groups, profile=DEFAULT_PROFILE, shard_dir=None,
+                          on_complete=None, keep_shards=False):
+    """
+    Create one report for each site group, the reports run at the same time, up to the orchestrator max concurrency,
+    and merge the reports
+    :param orchestrator: ReportOrchestrator used to run the reports
+    :param report_name: report name, the site is added to the name of each report
+    :param output: file where to save the merged report
+    :param site_groups: the site groups, from select_site_shards
+    :param profile: report field profile
+    :param shard_dir: folder where to save the site reports, a temporary folder if not provided
+    :param on_complete: function called with each site report result
+    :param keep_shards: keep the site reports, they are deleted after the merge if False
+    :return: the site report results, with the "sites" of each report, the number of clients saved, the number
+    of duplicate clients and the number of clients without a MAC address skipped
+    """
+    created = shard_dir is None or not os.path.isdir(shard_dir)
+    shard_dir = shard_dir or tempfile.mkdtemp(prefix='report-shards-')
+    os.makedirs(shard_dir, exist_ok=True)
+    specs = []
+    for index, site_group in enumerate(site_groups):
+        site_names = [site['siteNameHierarchy'] for site in site_group]
+        name = '%s [%s]' % (report_name, site_names[0] + (' +%d' % (len(site_names) - 1) if len(site_names) > 1
+                                                          else ''))
+        specs.append({'name': name, 'profile': profile, 'filters': site_filters(site_group), 'sites': site_names,
+                      'output': os.path.join(shard_dir, 'shard-%03d.json' % index), 'baseline': False})
+    results = []
+
+    def site_completed(result):
+        results.append(result)
+        if on_complete:
+            on_complete(result)
+
+    try:
+        results = await run_shards(orchestrator, specs, site_completed)
+        for spec, result in zip(specs, results):
+            result['sites'] = spec['sites']
+        clients, duplicates, skipped = await asyncio.to_thread(stream_merge_reports,
+                                                               [result['output'] for result in results], output)
+    finally:
+        if not keep_shards:
+            remove_shard_files(results, shard_dir, created)
+    return results, clients, duplicates, skipped
+
+
+def log_shard_timing(results):
+    """
+    Log the shard reports timing, the longest execution first, to find the shards that dominate the execution time
+    :param results: the shard report results
+    :return None
+    """
+    total_execution = sum(result['execution_time'] for result in results) or 1
+    for result in sorted(results, key=lambda item: item['execution_time'], reverse=True):
+        logger.info('Shard report timing', extra={
+            'report_name': result['name'], 'execution_time': round(result['execution_time'], 1),
+            'download_time': round(result['download_time'], 1),
+            'share': round(result['execution_time'] * 100 / total_execution), 'bytes': result['size']})
+
+
+def main():
+    """
+    This application will create the Client Detail report as many shard reports, executed at the same time by Cisco
+    DNA Center, and will merge the shard reports into one report with one record for each client:
+     - by time window, the 24 hours time range is split into {windows} time windows
+     - by site, one report for each site, or group of sites, at the {site_level} of the site hierarchy
+    """
+    parser = argparse.ArgumentParser(description='Create a Client Detail report as parallel shard reports')
+    parser.add_argument('--by', choices=['time', 'site'], default='time', help='split the report by time or site')
+    parser.add_argument('--name', default='Client Report Detail 24 h', help='report name')
+    parser.add_argument('--windows', type=int, default=TIME_SHARDS, help='number of time windows')
+    parser.add_argument('--hours', type=float, default=TIME_RANGE_HOURS, help='report time range, in hours')
+    parser.add_argument('--site-level', type=int, default=SITE_LEVEL,
+                        help='site hierarchy level of the site reports, 2 for the areas under Global')
+    parser.add_argument('--site-prefix', help='only the sites under this site hierarchy, for example Global/USA')
+    parser.add_argument('--sites-per-report', type=int, default=1, help='number of sites in each site report')
+    parser.add_argument('--profile', choices=sorted(FIELD_PROFILES), default=DEFAULT_PROFILE,
+                        help='report field profile')
+    parser.add_argument('--concurrency', type=int, default=TIME_SHARDS, help='max number of reports at a time')
+    parser.add_argument('--output', default='report.json', help='merged report file')
+    parser.add_argument('--shard-dir', help='folder where to save the shard reports')
+    parser.add_argument('--keep-shards', action='store_true', help='keep the shard reports after the merge')
+    parser.add_argument('--timing-file', help='JSON file where to save the shard reports timing')
+    args = parser.parse_args()
+
+    setup_logging()
+    logger.info('Shard Reports App Run Start', extra={'by': args.by})
+
+    dnac = DnacClient(DNAC_URL, DNAC_USER, DNAC_PASS, pool_size=max(args.concurrency, 10))
+    # the shard reports are executed again on the next runs, the site reports have the same definition on each run,
+    # the time window reports are created again, the reports with the old time windows are deleted
+    orchestrator = ReportOrchestrator(dnac, max_concurrency=args.concurrency, catalog=ReportCatalog(dnac),
+                                      registry=ReportRegistry(dnac))
+    start = time.monotonic()
+    try:
+        if args.by == 'time':
+            results, clients, skipped = asyncio.run(run_time_shards(orchestrator, args.name, args.output,
+                                                                    args.windows, args.hours, args.profile,
+                                                                    args.shard_dir, on_complete=log_result,
+                                                                    keep_shards=args.keep_shards))
+            logger.info('Merged report saved', extra={'output': args.output, 'clients': clients,
+                                                      'skipped': skipped})
+        else:
+            site_groups = select_site_shards(dnac.get_sites(), args.site_level, args.site_prefix,
+                                             args.sites_per_report)
+            logger.info('Site reports', extra={'reports': len(site_groups), 'concurrency': args.concurrency})
+            results, clients, duplicates, skipped = asyncio.run(run_site_shards(
+                orchestrator, args.name, args.output, site_groups, args.profile, args.shard_dir,
+                on_complete=log_result, keep_shards=args.keep_shards))
+            logger.info('Merged report saved', extra={'output': args.output, 'clients': clients,
+                                                      'duplicates': duplicates, 'skipped': skipped})
+        log_shard_timing(results)
+        if args.timing_file:
+            with open(args.timing_file, 'w') as file:
+                json.dump(results, file, indent=4)
+    except RuntimeError as error:
+        logger.error('Merged report not saved, %s', error)
+    finally:
+        dnac.close()
+    logger.info('Shard Reports App Run End', extra={'total_time': round(time.monotonic() - start, 1)})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,326 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import calendar
+import json
+import os
+import re
+import shutil
+import threading
+import time
+
+from report_download import CHUNK_SIZE, download_report
+from report_stream import COMPRESSION_EXTENSIONS, get_compression, wrap_compression, zstandard
+
+REPORT_STORE = 'report_store'
+REPORT_COMPRESSION = 'zstd' if zstandard is not None else 'gzip'
+RETENTION_DAYS = 90  # the reports older than this are deleted
+TIME_FORMAT = '%Y%m%dT%H%M%SZ'  # the report execution start time, UTC, in the report file name
+EVICT_INTERVAL = 600  # the store is checked for the reports to delete at most every 10 minutes after a download
+EVICT_DOWNLOADS = 50  # or after 50 downloads, the size limit may be exceeded by the reports downloaded in between
+
+# the report files are saved to {folder}/{report id}/{execution start time}_{execution id}.json[.gz|.zst], the
+# executions are ordered by the start time, the download order depends on the notifications and the retries
+REPORT_FILE_NAME = re.compile(r'^(?P<time>\d{8}T\d{6}Z)_(?P<execution_id>[\w-]+)\.json(\.gz|\.zst)?$')
+REPORT_ID = re.compile(r'^[\w-]+$')
+
+
+class ReportStore:
+    """
+    Archive of the downloaded reports, one file for each report execution, compressed as the report is downloaded.
+    The reports older than {retention_days} are deleted, and the oldest reports are deleted when the store size is
+    over {max_bytes}. The eviction lists all the saved reports, after a download it runs only every {evict_interval}
+    seconds or {evict_downloads} downloads.
+    """
+
+    def __init__(self, folder=REPORT_STORE, compression=REPORT_COMPRESSION, retention_days=RETENTION_DAYS,
+                 max_bytes=None, evict_interval=EVICT_INTERVAL, evict_downloads=EVICT_DOWNLOADS):
+        """
+        :param folder: folder where to save the reports
+        :param compression: "zstd", "gzip" or None to save the reports not compressed
+        :param retention_days: the reports older than this are deleted, None to keep all the reports
+        :param max_bytes: max size of the saved reports, in bytes, None for no size limit
+        :param evict_interval: min time between the evictions after a download, in seconds
+        :param evict_downloads: number of downloads that starts an eviction before {evict_interval}
+        """
+        if compression in ('', 'none'):
+            compression = None
+        if compression not in (None, *COMPRESSION_EXTENSIONS.values()):
+            raise ValueError('Compression not supported: ' + compression)
+        if compression == 'zstd' and zstandard is None:
+            raise ValueError('The zstd compression requires the zstandard package')
+        self.folder = folder
+        self.compression = compression
+        self.retention_days = retention_days
+        self.max_bytes = max_bytes
+        self.evict_interval = evict_interval
+        self.evict_downloads = evict_downloads
+        self._lock = threading.Lock()
+        self._last_evict = None  # the time of the last eviction, time.monotonic()
+        self._downloads = 0  # the downloads since the last eviction
+
+    def _report_folder(self, report_id):
+        if not REPORT_ID.match(report_id):
+            raise ValueError('Invalid report id: ' + report_id)
+        return os.path.join(self.folder, report_id)
+
+    def _file_name(self, execution_id, start_time):
+        extension = {value: key for key, value in COMPRESSION_EXTENSIONS.items()}.get(self.compression, '')
+        file_name = time.strftime(TIME_FORMAT, time.gmtime(start_time)) + '_' + execution_id + '.json' + extension
+        if not REPORT_FILE_NAME.match(file_name):
+            raise ValueError('Invalid execution id: ' + execution_id)
+        return file_name
+
+    def download(self, dnac, report_id, execution_id, chunk_size=CHUNK_SIZE, start_time=None):
+        """
+        Download the report execution to the store, the report is compressed as it is downloaded, and written to a
+        temporary file renamed to the report file only if Cisco DNA Center did not return an error
+        :param dnac: DnacClient
+        :param report_id: report id
+        :param execution_id: execution id
+        :param chunk_size: download chunk size, in bytes
+        :param start_time: the execution start time, epoch milliseconds, from the report executions info if not
+        provided
+        :return: the report file name and the report size, in bytes, before compression
+        """
+        report_folder = self._report_folder(report_id)
+        os.makedirs(report_folder, exist_ok=True)
+        if start_time is None:
+            start_time = get_execution_start_time(dnac, report_id, execution_id)
+        filename = os.path.join(report_folder, self._file_name(execution_id, start_time / 1000))
+        size = download_report(dnac, report_id, execution_id, filename, chunk_size=chunk_size,
+                               compression=self.compression)
+        self._evict_if_due()
+        return filename, size
+
+    def _evict_if_due(self):
+        """
+        Delete the old reports after a download, if {evict_interval} elapsed or {evict_downloads} reports were
+        downloaded since the last eviction
+        :return: list of the deleted report files
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._downloads += 1
+            if self._last_evict is not None and now - self._last_evict < self.evict_interval and \
+                    self._downloads < self.evict_downloads:
+                return []
+            self._last_evict = now
+            self._downloads = 0
+        return self.evict()
+
+    def executions(self, report_id):
+        """
+        :param report_id: report id
+        :return: list of the saved executions of the report, newest first, each a dict with the report id,
+        execution id, execution start time, file name and file size
+        """
+        report_folder = self._report_folder(report_id)
+        if not os.path.isdir(report_folder):
+            return []
+        executions = []
+        for file_name in os.listdir(report_folder):
+            match = REPORT_FILE_NAME.match(file_name)
+            if not match:
+                continue  # the temporary files of the downloads in progress
+            filename = os.path.join(report_folder, file_name)
+            try:
+                size = os.path.getsize(filename)
+            except FileNotFoundError:
+                continue  # deleted by the eviction
+            executions.append({
+                'report_id': report_id,
+                'execution_id': match.group('execution_id'),
+                'time': calendar.timegm(time.strptime(match.group('time'), TIME_FORMAT)),
+                'file': filename,
+                'bytes': size
+            })
+        return sorted(executions, key=lambda execution: (execution['time'], execution['file']), reverse=True)
+
+    def reports(self):
+        """
+        :return: the ids of the reports with saved executions
+        """
+        if not os.path.isdir(self.folder):
+            return []
+        return sorted(report_id for report_id in os.listdir(self.folder)
+                      if REPORT_ID.match(report_id) and os.path.isdir(os.path.join(self.folder, report_id)))
+
+    def latest(self, report_id):
+        """
+        :param report_id: report id
+        :return: the newest saved execution of the report, None if the report has no saved executions
+        """
+        executions = self.executions(report_id)
+        return executions[0] if executions else None
+
+    def get(self, report_id, execution_id):
+        """
+        :param report_id: report id
+        :param execution_id: execution id
+        :return: the saved report execution, None if not found
+        """
+        for execution in self.executions(report_id):
+            if execution['execution_id'] == execution_id:
+                return execution
+        return None
+
+    def evict(self, now=None):
+        """
+        Delete the reports executed before {retention_days}, then the oldest reports until the store size is below
+        {max_bytes}. The newest execution of each report is not deleted for the size limit.
+        :param now: current time, default time.time()
+        :return: list of the deleted report files
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            executions = [execution for report_id in self.reports() for execution in self.executions(report_id)]
+            executions.sort(key=lambda execution: (execution['time'], execution['file']))
+            latest_files = {}
+            for execution in executions:
+                latest_files[execution['report_id']] = execution['file']
+            deleted = []
+            if self.retention_days is not None:
+                oldest_time = now - self.retention_days * 86400
+                deleted = [execution for execution in executions if execution['time'] < oldest_time]
+            if self.max_bytes is not None:
+                kept = executions[len(deleted):]  # the executions are sorted by time, the expired ones are first
+                total_bytes = sum(execution['bytes'] for execution in kept)
+                for execution in kept:
+                    if total_bytes <= self.max_bytes:
+                        break
+                    if execution['file'] == latest_files[execution['report_id']]:
+                        continue
+                    deleted.append(execution)
+                    total_bytes -= execution['bytes']
+            for execution in deleted:
+                try:
+                    os.remove(execution['file'])
+                except FileNotFoundError:
+                    pass
+            for report_id in {execution['report_id'] for execution in deleted}:
+                try:
+                    os.rmdir(self._report_folder(report_id))  # only if there are no reports left
+                except OSError:
+                    pass
+            return [execution['file'] for execution in deleted]
+
+    def stats(self):
+        """
+        :return: the number of reports, executions, and the store size, in bytes
+        """
+        executions = [execution for report_id in self.reports() for execution in self.executions(report_id)]
+        return {
+            'reports': len({execution['report_id'] for execution in executions}),
+            'executions': len(executions),
+            'bytes': sum(execution['bytes'] for execution in executions),
+            'compression': self.compression
+        }
+
+
+def get_execution_start_time(dnac, report_id, execution_id):
+    """
+    Find the execution start time in the report executions info
+    :param dnac: DnacClient
+    :param report_id: report id
+    :param execution_id: execution id
+    :return: the execution start time, epoch milliseconds, the current time if the execution is not found
+    """
+    report_details = dnac.get_report_executions(report_id)
+    for execution in report_details.get('executions') or []:
+        if execution.get('executionId') == execution_id and execution.get('startTime'):
+            return execution['startTime']
+    return time.time() * 1000
+
+
+def export_report(filename, output):
+    """
+    Save the report file, decompressed, to {output}
+    :param filename: report file name, from the report store
+    :param output: output file name
+    :return None
+    """
+    with open(filename, 'rb') as file, wrap_compression(file, 'rb', get_compression(filename)) as report_file:
+        with open(output, 'wb') as output_file:
+            shutil.copyfileobj(report_file, output_file, CHUNK_SIZE)
+
+
+def main():
+    """
+    This application will list the reports saved to the report store, find the newest execution of a report, export
+    a report execution to a JSON file, and delete the expired reports
+    """
+    parser = argparse.ArgumentParser(description='Cisco DNA Center report store')
+    parser.add_argument('--store', default=os.getenv('REPORT_STORE', REPORT_STORE), help='report store folder')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    list_parser = subparsers.add_parser('list', help='list the saved report executions')
+    list_parser.add_argument('--report-id', help='list only the executions of this report')
+    latest_parser = subparsers.add_parser('latest', help='print the newest execution of the report')
+    latest_parser.add_argument('report_id', help='report id')
+    export_parser = subparsers.add_parser('export', help='save a report execution, decompressed, to a JSON file')
+    export_parser.add_argument('report_id', help='report id')
+    export_parser.add_argument('--execution-id', help='execution id, default the newest execution')
+    export_parser.add_argument('--output', default='report.json', help='output file')
+    evict_parser = subparsers.add_parser('evict', help='delete the expired reports')
+    evict_parser.add_argument('--retention-days', type=int, default=RETENTION_DAYS,
+                              help='the reports older than this are deleted')
+    evict_parser.add_argument('--max-mb', type=float, help='max size of the saved reports, in MB')
+    args = parser.parse_args()
+
+    if args.command == 'evict':
+        store = ReportStore(args.store, retention_days=args.retention_days,
+                            max_bytes=int(args.max_mb * 1024 * 1024) if args.max_mb else None)
+        deleted = store.evict()
+        print('Reports deleted:', len(deleted))
+        for filename in deleted:
+            print(' -', filename)
+        return
+
+    store = ReportStore(args.store)
+    if args.command == 'list':
+        report_ids = [args.report_id] if args.report_id else store.reports()
+        print('%-38s %-38s %-20s %12s' % ('Report Id', 'Execution Id', 'Started (UTC)', 'Bytes'))
+        for report_id in report_ids:
+            for execution in store.executions(report_id):
+                print('%-38s %-38s %-20s %12d' % (report_id, execution['execution_id'],
+                                                 time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(execution['time'])),
+                                                 execution['bytes']))
+        print('\nReport store:', json.dumps(store.stats()))
+        return
+
+    if args.command == 'export' and args.execution_id:
+        execution = store.get(args.report_id, args.execution_id)
+    else:
+        execution = store.latest(args.report_id)
+    if execution is None:
+        print('Report execution not found')
+        return
+    if args.command == 'latest':
+        print(json.dumps(execution, indent=4))
+        return
+    export_report(execution['file'], args.output)
+    print('Report execution', execution['execution_id'], 'saved to', args.output)
+
+
+if __name__ == '__main__':
+    main()
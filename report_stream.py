@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import codecs
+import gzip
+import json
+import os
+import re
+
+try:
+    import zstandard
+except ImportError:  # the zstd compression is optional
+    zstandard = None
+
+CHUNK_SIZE = 64 * 1024  # read chunk size, in bytes
+ZSTD_LEVEL = 3
+GZIP_LEVEL = 6
+
+# the report files compression, by file extension
+COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.zst': 'zstd'}
+
+WHITESPACE = re.compile(r'\s*')
+
+
+def get_compression(filename):
+    """
+    :param filename: report file name
+    :return: the report file compression, from the file extension, "gzip", "zstd", or None if not compressed
+    """
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(os.fsdecode(filename))[1])
+
+
+def wrap_compression(file, mode, compression):
+    """
+    Compress the data written to, or decompress the data read from, the binary {file}
+    :param file: binary file object
+    :param mode: "rb" or "wb"
+    :param compression: "gzip", "zstd", or None for no compression
+    :return: the file object to read or write, closing it does not close the {file}
+    """
+    if compression is None:
+        return file
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=file, mode=mode, compresslevel=GZIP_LEVEL)
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ValueError('The zstd compression requires the zstandard package')
+        if 'w' in mode:
+            return zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(file, closefd=False)
+        return zstandard.ZstdDecompressor().stream_reader(file, closefd=False)
+    raise ValueError('Compression not supported: ' + str(compression))
+
+
+def iter_chunks(source, chunk_size=CHUNK_SIZE):
+    """
+    Read the text chunks from the {source}
+    :param source: report file name, the .gz and .zst files are decompressed, file object, or streamed response from
+    DnacClient.stream_report_file
+    :param chunk_size: read chunk size
+    :return: generator of text chunks
+    """
+    if isinstance(source, (str, bytes, os.PathLike)):
+        with open(source, 'rb') as file:
+            with wrap_compression(file, 'rb', get_compression(source)) as report_file:
+                yield from iter_chunks(report_file, chunk_size)
+        return
+    if hasattr(source, 'iter_content'):
+        chunks = source.iter_content(chunk_size=chunk_size)
+    else:
+        chunks = iter(lambda: source.read(chunk_size), source.read(0))
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for chunk in chunks:
+        yield decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+    yield decoder.decode(b'', final=True)
+
+
+class _JsonStream:
+    """
+    Incremental JSON reader over a stream of text chunks, only the data not yet parsed is kept in memory
+    """
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _read_more(self):
+        if self.eof:
+            return False
+        # drop the data already parsed
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+        for chunk in self.chunks:
+            if chunk:
+                self.buffer += chunk
+                return True
+        self.eof = True
+        return False
+
+    def peek(self):
+        """
+        :return: the next non whitespace character, '' at the end of the stream
+        """
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._read_more():
+                return ''
+
+    def expect(self, characters):
+        """
+        Consume the next non whitespace character, that must be one of {characters}
+        :return: the character
+        """
+        character = self.peek()
+        if not character or character not in characters:
+            raise ValueError('Invalid report, expected ' + repr(characters) + ' found ' + repr(character))
+        self.pos += 1
+        return character
+
+    def value(self):
+        """
+        Parse the next JSON value
+        :return: the value
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # a value at the end of the buffer may be truncated, for example a number
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except ValueError:
+                if self.eof:
+                    raise
+            if not self._read_more():
+                value, self.pos = self.decoder.raw_decode(self.buffer, self.pos)
+                return value
+
+
+def iter_records(source, key='client_details', chunk_size=CHUNK_SIZE, other_fields=None):
+    """
+    Iterate the records of the {key} list in the report, without loading the report in memory.
+    The memory used is the same for any number of records.
+    :param source: report file name, file object, or streamed response from DnacClient.stream_report_file
+    :param key: the report field group, for example "client_details"
+    :param chunk_size: read chunk size
+    :param other_fields: dict where to save the other report fields, for example "filters", as they are read
+    :return: generator of the report records
+    """
+    stream = _JsonStream(iter_chunks(source, chunk_size))
+    stream.expect('{')
+    if stream.peek() == '}':
+        return
+    while True:
+        name = stream.value()
+        stream.expect(':')
+        if name == key and stream.peek() == '[':
+            stream.expect('[')
+            if stream.peek() == ']':
+                stream.expect(']')
+            else:
+                while True:
+                    yield stream.value()
+                    if stream.expect(',]') == ']':
+                        break
+        else:
+            value = stream.value()  # the other report fields, for example "filters"
+            if other_fields is not None:
+                other_fields[name] = value
+        if stream.expect(',}') == '}':
+            return
+
+
+def iter_client_details(source, chunk_size=CHUNK_SIZE, other_fields=None):
+    """
+    Iterate the client records of a Client Detail report, without loading the report in memory
+    :param source: report file name, file object, or streamed response from DnacClient.stream_report_file
+    :param chunk_size: read chunk size
+    :param other_fields: dict where to save the other report fields, for example "filters", as they are read
+    :return: generator of the client details
+    """
+    return iter_records(source, 'client_details', chunk_size, other_fields)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import collections
+import logging
+import queue
+import threading
+import time
+
+LATENCY_SAMPLES = 1000  # number of recent job latencies kept for the statistics
+
+logger = logging.getLogger(__name__)
+
+
+class ReportWorkerPool:
+    """
+    Pool of worker threads that process the report jobs in the background.
+    The webhook handler adds the jobs to the queue and returns, the workers run {handler} for each job.
+    """
+
+    def __init__(self, handler, workers=4, max_queue_size=100):
+        """
+        :param handler: function called by the workers with the job arguments
+        :param workers: number of worker threads
+        :param max_queue_size: max number of jobs waiting in the queue, 0 for no limit
+        """
+        self.handler = handler
+        self.jobs = queue.Queue(maxsize=max_queue_size)
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self._latencies = collections.deque(maxlen=LATENCY_SAMPLES)
+        self._running = {}  # worker thread id: the job arguments in progress
+        self._lock = threading.Lock()
+        self._threads = []
+        for index in range(workers):
+            thread = threading.Thread(target=self._worker, name='report-worker-' + str(index), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, *args):
+        """
+        Add a job to the queue
+        :param args: the job arguments, passed to the handler
+        :return None, raises queue.Full if the queue is full
+        """
+        self.jobs.put_nowait((time.monotonic(), args))
+
+    def _worker(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                self.jobs.task_done()
+                return
+            queued_time, args = job
+            with self._lock:
+                self.in_flight += 1
+                self._running[threading.get_ident()] = args
+            try:
+                self.handler(*args)
+                succeeded = True
+            except Exception:
+                logger.exception('Report job failed')
+                succeeded = False
+            latency = time.monotonic() - queued_time
+            with self._lock:
+                self.in_flight -= 1
+                self._running.pop(threading.get_ident(), None)
+                if succeeded:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+                self._latencies.append(latency)
+            self.jobs.task_done()
+
+    def stats(self):
+        """
+        :return: the queue depth, the number of jobs in progress, completed and failed, and the job latency, from
+        the time the job was queued until it was processed
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = {
+                'queue_depth': self.jobs.qsize(),
+                'in_flight': self.in_flight,
+                'completed': self.completed,
+                'failed': self.failed,
+                'latency_avg': sum(latencies) / len(latencies) if latencies else None,
+                'latency_p50': latencies[len(latencies) // 2] if latencies else None,
+                'latency_p99': latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)] if latencies else None,
+                'latency_max': latencies[-1] if latencies else None
+            }
+        return stats
+
+    def shutdown(self, wait=True, timeout=None):
+        """
+        Stop the workers, after all the queued jobs are processed
+        :param wait: wait for the workers to complete the jobs
+        :param timeout: max time to wait, in seconds, no limit if None. When the timeout expires the queued jobs are
+        removed from the queue, and the workers stop after the jobs in progress
+        :return: list of the arguments of the jobs not completed before the timeout, queued or in progress
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def remaining():
+            return None if deadline is None else max(deadline - time.monotonic(), 0)
+
+        try:
+            for _ in self._threads:
+                self.jobs.put(None, timeout=remaining())
+        except queue.Full:
+            pass  # the timeout expired before the queued jobs made room for the stop markers
+        if not wait:
+            return []
+        for thread in self._threads:
+            thread.join(remaining())
+        if not any(thread.is_alive() for thread in self._threads):
+            return []
+
+        dropped = []
+        while True:
+            try:
+                job = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            self.jobs.task_done()
+            if job is not None:
+                dropped.append(job[1])
+        try:
+            for _ in self._threads:
+                self.jobs.put_nowait(None)
+        except queue.Full:
+            pass
+        with self._lock:
+            dropped.extend(self._running.values())
+        return dropped
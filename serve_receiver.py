@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:  # the production server is optional, report_receiver.py runs the Flask development server
+    BaseApplication = None
+
+load_dotenv('environment.env')
+
+RECEIVER_BIND = os.getenv('RECEIVER_BIND', '0.0.0.0:5000')  # address and port the receiver listens on
+RECEIVER_WORKERS = int(os.getenv('RECEIVER_WORKERS', '1'))  # number of worker processes, DEDUP_DB required if > 1
+RECEIVER_THREADS = int(os.getenv('RECEIVER_THREADS', '8'))  # number of request threads in each worker process
+RECEIVER_KEEPALIVE = int(os.getenv('RECEIVER_KEEPALIVE', '75'))  # idle keep-alive connection timeout, in seconds
+RECEIVER_TIMEOUT = int(os.getenv('RECEIVER_TIMEOUT', '30'))  # a worker not responding for this long is restarted
+RECEIVER_DRAIN_TIMEOUT = int(os.getenv('RECEIVER_DRAIN_TIMEOUT', '300'))  # max time to drain the report downloads
+RECEIVER_CERT_FILE = os.getenv('RECEIVER_CERT_FILE')  # TLS certificate, HTTP if not provided
+RECEIVER_KEY_FILE = os.getenv('RECEIVER_KEY_FILE')  # TLS private key
+RECEIVER_MAX_REQUESTS = int(os.getenv('RECEIVER_MAX_REQUESTS', '0'))  # restart a worker after this many requests
+LIMIT_REQUEST_LINE = 4094  # max size of the HTTP request line, in bytes
+LIMIT_REQUEST_FIELDS = 50  # max number of HTTP request headers
+LIMIT_REQUEST_FIELD_SIZE = 8190  # max size of an HTTP request header, in bytes
+DRAIN_MARGIN = 5  # the drain stops this many seconds before the graceful timeout, the worker is then killed
+
+
+def drain_report_workers(server, worker):
+    """
+    Gunicorn worker_exit hook, the worker stopped accepting notifications, wait for the report downloads queued and
+    in progress to complete, up to the graceful timeout. The worker is killed after the graceful timeout, the
+    downloads not completed by then are dropped, and their notifications removed from the duplicate notifications,
+    so the report is downloaded when Cisco DNA Center sends the notification again.
+    :param server: Gunicorn arbiter
+    :param worker: the exiting worker
+    :return None
+    """
+    report_receiver = sys.modules.get('report_receiver')
+    if report_receiver is None:
+        return  # the worker did not load the app
+    stats = report_receiver.report_workers.stats()
+    server.log.info('Worker %s draining the report downloads, queued: %d, in progress: %d', worker.pid,
+                    stats['queue_depth'], stats['in_flight'])
+    start = time.monotonic()
+    timeout = max(server.cfg.graceful_timeout - DRAIN_MARGIN, 0)
+    dropped = report_receiver.report_workers.shutdown(wait=True, timeout=timeout)
+    for report_id, execution_id, dedup_keys in dropped:
+        report_receiver.report_notifications.discard(*dedup_keys)
+        server.log.warning('Worker %s report download dropped, report id: %s, execution id: %s', worker.pid,
+                           report_id, execution_id)
+    if not dropped:
+        report_receiver.dnac.close()  # the downloads dropped are still in progress, the connections are not closed
+    server.log.info('Worker %s report downloads drained in %.1fs, dropped: %d', worker.pid,
+                    time.monotonic() - start, len(dropped))
+
+
+if BaseApplication is not None:
+    class ReceiverApplication(BaseApplication):
+        """
+        The webhook receiver Flask app, run by Gunicorn with the {options} settings
+        """
+
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # the app is loaded by each worker, after the fork, each worker has its own Cisco DNA Center client and
+            # report worker threads
+            from report_receiver import app
+            return app
+
+
+def main():
+    """
+    This application will run the webhook receiver with the Gunicorn WSGI server, with many worker processes and
+    threads, keep-alive connections, request size limits, a persistent TLS certificate, and a graceful shutdown that
+    drains the report downloads in progress
+    """
+    parser = argparse.ArgumentParser(description='Run the webhook receiver with the Gunicorn WSGI server')
+    parser.add_argument('--bind', default=RECEIVER_BIND, help='address and port, for example 0.0.0.0:5000')
+    parser.add_argument('--workers', type=int, default=RECEIVER_WORKERS, help='number of worker processes')
+    parser.add_argument('--threads', type=int, default=RECEIVER_THREADS, help='request threads in each worker')
+    parser.add_argument('--keepalive', type=int, default=RECEIVER_KEEPALIVE,
+                        help='idle keep-alive connection timeout, in seconds')
+    parser.add_argument('--timeout', type=int, default=RECEIVER_TIMEOUT,
+                        help='a worker not responding for this long is restarted, in seconds')
+    parser.add_argument('--drain-timeout', type=int, default=RECEIVER_DRAIN_TIMEOUT,
+                        help='max time to drain the report downloads at shutdown, in seconds')
+    parser.add_argument('--max-requests', type=int, default=RECEIVER_MAX_REQUESTS,
+                        help='restart a worker after this many requests, 0 to disable')
+    parser.add_argument('--certfile', default=RECEIVER_CERT_FILE, help='TLS certificate file')
+    parser.add_argument('--keyfile', default=RECEIVER_KEY_FILE, help='TLS private key file')
+    args = parser.parse_args()
+
+    if BaseApplication is None:
+        print('The production server requires the gunicorn package, "pip install gunicorn"')
+        sys.exit(1)
+    if args.workers > 1 and not os.getenv('DEDUP_DB'):
+        # each worker process has its own duplicate notifications cache, a notification sent again by Cisco DNA
+        # Center to another worker is downloaded again, unless all the workers share the DEDUP_DB database
+        parser.error('--workers ' + str(args.workers) + ' requires the DEDUP_DB environment variable, the SQLite '
+                     'file shared by the workers for the duplicate notifications')
+    if bool(args.certfile) != bool(args.keyfile):
+        parser.error('--certfile and --keyfile are both required for TLS')
+    if not args.certfile:
+        print('No TLS certificate provided, the receiver accepts HTTP, use a TLS terminating proxy')
+
+    options = {
+        'bind': args.bind,
+        'workers': args.workers,
+        'threads': args.threads,
+        'worker_class': 'gthread',
+        'keepalive': args.keepalive,
+        'timeout': args.timeout,
+        'graceful_timeout': args.drain_timeout,
+        'max_requests': args.max_requests,
+        'max_requests_jitter': args.max_requests // 10,
+        'limit_request_line': LIMIT_REQUEST_LINE,
+        'limit_request_fields': LIMIT_REQUEST_FIELDS,
+        'limit_request_field_size': LIMIT_REQUEST_FIELD_SIZE,
+        'preload_app': False,  # the report worker threads do not survive a fork
+        'worker_exit': drain_report_workers
+    }
+    if args.certfile:
+        options.update(certfile=args.certfile, keyfile=args.keyfile)
+    ReceiverApplication(options).run()
+
+
+if __name__ == '__main__':
+    main()
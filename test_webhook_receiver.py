@@ -25,8 +25,17 @@ __version__ = "0.1.0"
 __copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
 __license__ = "Cisco Sample Code License, Version 1.1"
 
+import argparse
+import bisect
+import collections
+import copy
 import json
 import os
+import random
+import threading
+import time
+import uuid
+
 import requests
 import urllib3
 from requests.auth import HTTPBasicAuth  # for Basic Auth
@@ -61,12 +70,189 @@ report_notification = {
 
 report = {"client_details": [{"hostName":"Galaxy-Tab-A","username":"--","macAddress":"F0:8A:76:25:1F:5A","ipv4":"192.168.159.220","ipv6":"fe80::4c48:9d4:b8d2:bbf","deviceType":"Wireless","connectionStatus":"Disconnected","averageHealthScore_min":"10","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"0.69","connectedDeviceName":"AP2800.BFA0","frequency":"5.0","rssi_median":"-65.0","snr_median":"28.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 01:57:00 PM","apGroup":"default-group","ssid":"@CorpSSID_SF","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 11:55:31 AM","assocDoneTimestamp":"30 Mar, 11:55:31 AM","authDoneTimestamp":"30 Mar, 11:55:31 AM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 11:55:31 AM","maxDhcpDuration_max":"180","dhcpServerIp":"192.168.159.129","linkSpeed":"--","txRate_min":"0.0","txRate_max":"5664.0","txRate_avg":"617.92","rxRate_min":"0.0","rxRate_max":"3116.53","rxRate_avg":"219.38","txBytes_sum":"0.53","rxBytes_sum":"0.17","dataRate_median":"173.0","dot11Protocol":"802.11ac"},{"hostName":"Sensor-0950","username":"Sensor2","macAddress":"70:F3:5A:7C:8B:70","ipv4":"192.168.152.100","ipv6":"--","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"7156.42","connectedDeviceName":"AP4800.D092","frequency":"5.0","rssi_median":"-31.0","snr_median":"58.0","site":"Global/San Jose/SJ04/Fl3","lastUpdated":"30 Mar, 09:10:00 PM","apGroup":"default-group","ssid":"@CorpSSID","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 09:01:24 PM","assocDoneTimestamp":"30 Mar, 09:01:21 PM","authDoneTimestamp":"30 Mar, 09:01:23 PM","aaaServerIp":"192.168.152.43","dhcpDoneTimestamp":"30 Mar, 09:01:24 PM","maxDhcpDuration_max":"3042","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"0.0","txRate_max":"7857047.04","txRate_avg":"2163902.77","rxRate_min":"0.0","rxRate_max":"1.062149845E7","rxRate_avg":"3120075.92","txBytes_sum":"2917.25","rxBytes_sum":"4239.17","dataRate_median":"600.0","dot11Protocol":"802.11ac"},{"hostName":"Galaxy-S10","username":"Samsung2","macAddress":"E8:E8:B7:46:75:9B","ipv4":"192.168.152.86","ipv6":"fe80::eae8:b7ff:fe46:759b","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"10","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"26.33","connectedDeviceName":"AP0C75.BDB1.E174","frequency":"5.0","rssi_median":"-43.0","snr_median":"58.0","site":"Global/San Jose/SJ04/Fl3","lastUpdated":"30 Mar, 09:13:19 PM","apGroup":"--","ssid":"@CorpSSID_98","vlan":"10","vnid":"--","onboardingEventTime":"26 Mar, 10:15:39 AM","assocDoneTimestamp":"26 Mar, 10:15:39 AM","authDoneTimestamp":"26 Mar, 10:15:39 AM","aaaServerIp":"192.168.152.43","dhcpDoneTimestamp":"26 Mar, 10:15:39 AM","maxDhcpDuration_max":"4","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"448.0","txRate_max":"5035.44","txRate_avg":"849.59","rxRate_min":"330.37","rxRate_max":"141652.53","rxRate_avg":"1643.38","txBytes_sum":"9.16","rxBytes_sum":"17.17","dataRate_median":"287.0","dot11Protocol":"802.11ax (5GHz)"},{"hostName":"android-b4b9c935c0a0adc1","username":"lisa","macAddress":"7C:46:85:20:80:6F","ipv4":"192.168.152.187","ipv6":"fe80::7e46:85ff:fe20:806f","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"3.92","connectedDeviceName":"AP0C75.BDB1.E174","frequency":"5.0","rssi_median":"-59.0","snr_median":"40.0","site":"Global/San Jose/SJ04/Fl3","lastUpdated":"30 Mar, 09:13:19 PM","apGroup":"--","ssid":"@CorpSSID_98","vlan":"10","vnid":"--","onboardingEventTime":"30 Mar, 08:52:18 PM","assocDoneTimestamp":"30 Mar, 08:52:18 PM","authDoneTimestamp":"30 Mar, 08:52:18 PM","aaaServerIp":"192.168.152.43","dhcpDoneTimestamp":"30 Mar, 08:48:48 PM","maxDhcpDuration_max":"208","dhcpServerIp":"192.168.152.1","linkSpeed":"--","txRate_min":"0.0","txRate_max":"2122.4","txRate_avg":"450.65","rxRate_min":"0.0","rxRate_max":"2519.73","rxRate_avg":"563.56","txBytes_sum":"1.77","rxBytes_sum":"2.15","dataRate_median":"45.0","dot11Protocol":"802.11ac"},{"hostName":"AP70F3.5A7C.0340","username":"Sensor2","macAddress":"70:F3:5A:7C:73:30","ipv4":"192.168.152.101","ipv6":"--","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"13004.57","connectedDeviceName":"AP4800.D092","frequency":"5.0","rssi_median":"-22.0","snr_median":"63.0","site":"Global/San Jose/SJ04/Fl3","lastUpdated":"30 Mar, 09:11:00 PM","apGroup":"default-group","ssid":"@CorpSSID","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 09:01:08 PM","assocDoneTimestamp":"30 Mar, 09:01:05 PM","authDoneTimestamp":"30 Mar, 09:01:06 PM","aaaServerIp":"192.168.152.43","dhcpDoneTimestamp":"30 Mar, 09:01:08 PM","maxDhcpDuration_max":"2101","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"0.0","txRate_max":"1.17000984E7","txRate_avg":"3171229.87","rxRate_min":"0.0","rxRate_max":"1.289570293E7","rxRate_avg":"2779720.02","txBytes_sum":"6940.8","rxBytes_sum":"6063.76","dataRate_median":"217.0","dot11Protocol":"802.11ac"},{"hostName":"Sensor-AP70F3.5A82.0608","username":"admin","macAddress":"70:F3:5A:82:7D:F0","ipv4":"192.168.159.186","ipv6":"fe80::72f3:5aff:fe82:7df0","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"19.4","connectedDeviceName":"AP2800.BFA0","frequency":"5.0","rssi_median":"-55.0","snr_median":"37.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:13:00 PM","apGroup":"default-group","ssid":"CiscoSensorProvisioning","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 08:47:29 PM","assocDoneTimestamp":"30 Mar, 08:47:29 PM","authDoneTimestamp":"30 Mar, 08:47:29 PM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 02:47:32 AM","maxDhcpDuration_max":"1937","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"0.0","txRate_max":"11822.93","txRate_avg":"830.49","rxRate_min":"0.0","rxRate_max":"14482.27","rxRate_avg":"1561.42","txBytes_sum":"6.65","rxBytes_sum":"12.75","dataRate_median":"260.0","dot11Protocol":"802.11ac"},{"hostName":"Galaxy-Tab-A","username":"allen","macAddress":"F0:8A:76:25:18:72","ipv4":"192.168.152.182","ipv6":"fe80::f673:6858:bbc1:7330","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"7","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"8.13","connectedDeviceName":"APCC16.7E83.DCF6","frequency":"5.0","rssi_median":"-66.0","snr_median":"23.0","site":"Global/San Jose/SJ04/Fl3","lastUpdated":"30 Mar, 09:13:19 PM","apGroup":"default-group","ssid":"@CorpSSID_98","vlan":"10","vnid":"0","onboardingEventTime":"26 Mar, 05:45:38 AM","assocDoneTimestamp":"26 Mar, 05:45:37 AM","authDoneTimestamp":"26 Mar, 05:45:38 AM","aaaServerIp":"192.168.152.43","dhcpDoneTimestamp":"26 Mar, 12:38:13 AM","maxDhcpDuration_max":"--","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"199.26","txRate_max":"2310.93","txRate_avg":"676.79","rxRate_min":"19.2","rxRate_max":"203.79","rxRate_avg":"76.95","txBytes_sum":"7.29","rxBytes_sum":"0.84","dataRate_median":"400.0","dot11Protocol":"802.11ac"},{"hostName":"Galaxy-Tab-A","username":"arun","macAddress":"F0:8A:76:25:17:4E","ipv4":"192.168.152.206","ipv6":"fe80::1394:b1a7:c04b:2eee","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"7.74","connectedDeviceName":"APCC16.7E83.DCF6","frequency":"5.0","rssi_median":"-67.0","snr_median":"22.0","site":"Global/San Jose/SJ04/Fl3","lastUpdated":"30 Mar, 09:13:19 PM","apGroup":"default-group","ssid":"@CorpSSID_98","vlan":"10","vnid":"0","onboardingEventTime":"30 Mar, 08:58:35 PM","assocDoneTimestamp":"30 Mar, 08:58:35 PM","authDoneTimestamp":"30 Mar, 08:58:35 PM","aaaServerIp":"192.168.152.43","dhcpDoneTimestamp":"30 Mar, 08:58:35 PM","maxDhcpDuration_max":"146","dhcpServerIp":"192.168.152.1","linkSpeed":"--","txRate_min":"0.0","txRate_max":"1844.36","txRate_avg":"656.46","rxRate_min":"0.0","rxRate_max":"460.31","rxRate_avg":"78.99","txBytes_sum":"6.92","rxBytes_sum":"0.82","dataRate_median":"400.0","dot11Protocol":"802.11ac"},{"hostName":"Sensor-0188","username":"--","macAddress":"70:F3:5A:78:6C:91","ipv4":"192.168.159.171","ipv6":"--","deviceType":"Wireless","connectionStatus":"Disconnected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"3625.94","connectedDeviceName":"AP1815.8968","frequency":"5.0","rssi_median":"-20.0","snr_median":"68.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:05:00 PM","apGroup":"default-group","ssid":"@CorpSSID_SF","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 08:49:58 PM","assocDoneTimestamp":"30 Mar, 08:49:56 PM","authDoneTimestamp":"30 Mar, 08:49:56 PM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 08:49:58 PM","maxDhcpDuration_max":"2127","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"0.0","txRate_max":"2.93762024E7","txRate_avg":"1004517.98","rxRate_min":"0.0","rxRate_max":"2.13847864E7","rxRate_avg":"651227.48","txBytes_sum":"2235.83","rxBytes_sum":"1390.12","dataRate_median":"144.0","dot11Protocol":"802.11ac"},{"hostName":"Sensor-AP70F3.5A82.07C0","username":"admin","macAddress":"70:F3:5A:82:84:D0","ipv4":"192.168.159.185","ipv6":"fe80::72f3:5aff:fe82:84d0","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"19.67","connectedDeviceName":"AP2800.BFA0","frequency":"5.0","rssi_median":"-56.0","snr_median":"36.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:13:00 PM","apGroup":"default-group","ssid":"CiscoSensorProvisioning","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 08:48:02 PM","assocDoneTimestamp":"30 Mar, 08:48:02 PM","authDoneTimestamp":"30 Mar, 08:48:02 PM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 07:48:09 PM","maxDhcpDuration_max":"1969","dhcpServerIp":"192.168.159.129","linkSpeed":"--","txRate_min":"0.0","txRate_max":"8697.24","txRate_avg":"826.54","rxRate_min":"0.0","rxRate_max":"11208.89","rxRate_avg":"1532.76","txBytes_sum":"6.86","rxBytes_sum":"12.81","dataRate_median":"260.0","dot11Protocol":"802.11ac"},{"hostName":"DESKTOP-3I5E0N1","username":"kevinm","macAddress":"B8:31:B5:9B:D4:B4","ipv4":"192.168.152.90","ipv6":"fe80::94a6:1d20:798c:2c35","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"10","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"52.43","connectedDeviceName":"AP4800.D092","frequency":"5.0","rssi_median":"-30.0","snr_median":"60.0","site":"Global/San Jose/SJ04/Fl3","lastUpdated":"30 Mar, 09:13:19 PM","apGroup":"default-group","ssid":"@CorpSSID","vlan":"255","vnid":"0","onboardingEventTime":"30 Mar, 08:42:06 PM","assocDoneTimestamp":"27 Mar, 05:22:20 PM","authDoneTimestamp":"30 Mar, 08:42:06 PM","aaaServerIp":"192.168.152.43","dhcpDoneTimestamp":"30 Mar, 08:12:24 PM","maxDhcpDuration_max":"--","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"191.12","txRate_max":"6779.3","txRate_avg":"476.04","rxRate_min":"3.56","rxRate_max":"1392673.97","rxRate_avg":"5896.94","txBytes_sum":"3.47","rxBytes_sum":"48.96","dataRate_median":"600.0","dot11Protocol":"802.11ac"},{"hostName":"Sensor-6540","username":"Sensor2","macAddress":"70:F3:5A:7B:FB:50","ipv4":"192.168.152.102","ipv6":"--","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"3989.59","connectedDeviceName":"AP4800.D092","frequency":"5.0","rssi_median":"-34.0","snr_median":"53.0","site":"Global/San Jose/SJ04/Fl3","lastUpdated":"30 Mar, 07:39:00 PM","apGroup":"default-group","ssid":"@CorpSSID","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 07:30:57 PM","assocDoneTimestamp":"30 Mar, 07:30:54 PM","authDoneTimestamp":"30 Mar, 07:30:55 PM","aaaServerIp":"192.168.152.43","dhcpDoneTimestamp":"30 Mar, 07:30:57 PM","maxDhcpDuration_max":"2035","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"0.0","txRate_max":"9084173.71","txRate_avg":"5029444.69","rxRate_min":"0.0","rxRate_max":"1.106681424E7","rxRate_avg":"4998491.81","txBytes_sum":"2005.36","rxBytes_sum":"1984.23","dataRate_median":"600.0","dot11Protocol":"802.11n (2.4GHz)"},{"hostName":"Sensor-4230","username":"--","macAddress":"0C:75:BD:0D:5D:D1","ipv4":"192.168.159.175","ipv6":"--","deviceType":"Wireless","connectionStatus":"Disconnected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"5660.65","connectedDeviceName":"AP1815.8968","frequency":"5.0","rssi_median":"-18.0","snr_median":"70.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:08:00 PM","apGroup":"default-group","ssid":"@CorpSSID_SF","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 08:51:48 PM","assocDoneTimestamp":"30 Mar, 08:51:46 PM","authDoneTimestamp":"30 Mar, 08:51:46 PM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 08:51:48 PM","maxDhcpDuration_max":"5558","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"0.0","txRate_max":"1.657674122E7","txRate_avg":"1413647.04","rxRate_min":"0.0","rxRate_max":"9582388.87","rxRate_avg":"732251.58","txBytes_sum":"3672.45","rxBytes_sum":"1988.2","dataRate_median":"130.0","dot11Protocol":"802.11ac"},{"hostName":"AP70F3.5A78.00D8","username":"admin","macAddress":"70:F3:5A:78:69:D1","ipv4":"192.168.159.192","ipv6":"--","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"10","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"0.01","connectedDeviceName":"AP2800.BFA0","frequency":"5.0","rssi_median":"-55.0","snr_median":"39.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 08:19:00 PM","apGroup":"default-group","ssid":"CiscoSensorProvisioning","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 08:11:26 PM","assocDoneTimestamp":"30 Mar, 08:11:23 PM","authDoneTimestamp":"30 Mar, 08:11:24 PM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 08:11:26 PM","maxDhcpDuration_max":"1997","dhcpServerIp":"192.168.159.129","linkSpeed":"--","txRate_min":"0.0","txRate_max":"572.8","txRate_avg":"155.15","rxRate_min":"0.0","rxRate_max":"0.0","rxRate_avg":"0.0","txBytes_sum":"0.01","rxBytes_sum":"0.0","dataRate_median":"173.0","dot11Protocol":"802.11ac"},{"hostName":"Sensor-0188","username":"USER","macAddress":"70:F3:5A:78:6C:90","ipv4":"192.168.159.170","ipv6":"--","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"10","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"54.15","connectedDeviceName":"AP1815.8968","frequency":"2.4","rssi_median":"-15.0","snr_median":"67.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:13:19 PM","apGroup":"default-group","ssid":"CiscoSensorProvisioning","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 08:51:38 PM","assocDoneTimestamp":"30 Mar, 08:51:38 PM","authDoneTimestamp":"30 Mar, 08:51:38 PM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 08:49:36 PM","maxDhcpDuration_max":"7428","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"0.0","txRate_max":"144357.87","txRate_avg":"3532.85","rxRate_min":"0.0","rxRate_max":"186771.0","rxRate_avg":"4605.99","txBytes_sum":"23.36","rxBytes_sum":"30.79","dataRate_median":"72.0","dot11Protocol":"802.11n (2.4GHz)"},{"hostName":"AP70F3.5A7C.0288","username":"--","macAddress":"70:F3:5A:7C:70:50","ipv4":"192.168.159.160","ipv6":"--","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"5839.48","connectedDeviceName":"AP1815.8968","frequency":"5.0","rssi_median":"-21.5","snr_median":"66.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:10:00 PM","apGroup":"default-group","ssid":"@CorpSSID_SF","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 08:51:32 PM","assocDoneTimestamp":"30 Mar, 08:51:30 PM","authDoneTimestamp":"30 Mar, 08:51:30 PM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 08:51:32 PM","maxDhcpDuration_max":"5483","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"0.0","txRate_max":"6424760.2","txRate_avg":"1063897.56","rxRate_min":"0.0","rxRate_max":"4840743.6","rxRate_avg":"579488.47","txBytes_sum":"3749.15","rxBytes_sum":"2090.33","dataRate_median":"123.0","dot11Protocol":"802.11ac"},{"hostName":"iPad","username":"jeff","macAddress":"88:E9:FE:43:41:62","ipv4":"192.168.152.91","ipv6":"fe80::14f5:12c1:3c25:bf14","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"10","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"7.53","connectedDeviceName":"AP4800.D092","frequency":"5.0","rssi_median":"-26.0","snr_median":"64.0","site":"Global/San Jose/SJ04/Fl3","lastUpdated":"30 Mar, 09:13:19 PM","apGroup":"default-group","ssid":"@CorpSSID","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 08:52:49 PM","assocDoneTimestamp":"02 Mar, 07:34:20 PM","authDoneTimestamp":"30 Mar, 08:52:49 PM","aaaServerIp":"192.168.152.43","dhcpDoneTimestamp":"30 Mar, 07:33:30 PM","maxDhcpDuration_max":"--","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"542.4","txRate_max":"1336.13","txRate_avg":"913.33","rxRate_min":"46.29","rxRate_max":"360.98","rxRate_avg":"131.1","txBytes_sum":"6.58","rxBytes_sum":"0.95","dataRate_median":"600.0","dot11Protocol":"802.11ac"},{"hostName":"Sensor1","username":"--","macAddress":"70:F3:5A:7C:7F:D0","ipv4":"192.168.159.174","ipv6":"--","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"4649.08","connectedDeviceName":"AP1815.E4B0","frequency":"5.0","rssi_median":"-29.0","snr_median":"60.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:13:19 PM","apGroup":"default-group","ssid":"@CorpSSID_SF","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 09:06:31 PM","assocDoneTimestamp":"30 Mar, 09:06:29 PM","authDoneTimestamp":"30 Mar, 09:06:29 PM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 09:06:31 PM","maxDhcpDuration_max":"5496","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"0.0","txRate_max":"8558797.78","txRate_avg":"1058037.78","rxRate_min":"0.0","rxRate_max":"6431623.2","rxRate_avg":"580788.18","txBytes_sum":"2917.76","rxBytes_sum":"1731.32","dataRate_median":"144.0","dot11Protocol":"802.11ac"},{"hostName":"AP70F3.5A82.0898","username":"admin","macAddress":"70:F3:5A:82:88:30","ipv4":"192.168.159.190","ipv6":"fe80::72f3:5aff:fe82:8830","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"18.95","connectedDeviceName":"AP2800.BFA0","frequency":"5.0","rssi_median":"-56.0","snr_median":"36.666666666666664","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:13:19 PM","apGroup":"default-group","ssid":"CiscoSensorProvisioning","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 09:06:27 PM","assocDoneTimestamp":"30 Mar, 09:06:27 PM","authDoneTimestamp":"30 Mar, 09:06:27 PM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 08:37:05 AM","maxDhcpDuration_max":"--","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"0.0","txRate_max":"7763.82","txRate_avg":"768.54","rxRate_min":"0.0","rxRate_max":"9684.8","rxRate_avg":"1475.98","txBytes_sum":"6.46","rxBytes_sum":"12.49","dataRate_median":"260.0","dot11Protocol":"802.11ac"},{"hostName":"Sensor.0D48","username":"Sensor2","macAddress":"70:F3:5A:7C:9B:50","ipv4":"192.168.152.103","ipv6":"--","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"13224.05","connectedDeviceName":"AP4800.D092","frequency":"5.0","rssi_median":"-24.5","snr_median":"63.0","site":"Global/San Jose/SJ04/Fl3","lastUpdated":"30 Mar, 09:11:00 PM","apGroup":"default-group","ssid":"@CorpSSID","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 09:01:24 PM","assocDoneTimestamp":"30 Mar, 09:01:20 PM","authDoneTimestamp":"30 Mar, 09:01:22 PM","aaaServerIp":"192.168.152.43","dhcpDoneTimestamp":"30 Mar, 09:01:24 PM","maxDhcpDuration_max":"2165","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"0.0","txRate_max":"9276821.33","txRate_avg":"2823624.81","rxRate_min":"0.0","rxRate_max":"1.822118382E7","rxRate_avg":"3155786.75","txBytes_sum":"6325.05","rxBytes_sum":"6899.0","dataRate_median":"217.0","dot11Protocol":"802.11ac"},{"hostName":"Sensor-AP70F3.5A80.5CB8","username":"admin","macAddress":"70:F3:5A:81:D8:D0","ipv4":"192.168.159.163","ipv6":"fe80::72f3:5aff:fe81:d8d0","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"4","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"247.8","connectedDeviceName":"AP2800.BFA0","frequency":"5.0","rssi_median":"-57.0","snr_median":"36.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:13:19 PM","apGroup":"default-group","ssid":"CiscoSensorProvisioning","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 08:45:59 PM","assocDoneTimestamp":"30 Mar, 08:45:58 PM","authDoneTimestamp":"30 Mar, 08:45:59 PM","aaaServerIp":"--","dhcpDoneTimestamp":"21 Mar, 01:42:01 PM","maxDhcpDuration_max":"--","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"0.0","txRate_max":"38673.6","txRate_avg":"10525.5","rxRate_min":"0.0","rxRate_max":"72322.47","rxRate_avg":"19690.53","txBytes_sum":"86.42","rxBytes_sum":"161.39","dataRate_median":"260.0","dot11Protocol":"802.11ac"},{"hostName":"--","username":"admin","macAddress":"70:F3:5A:78:66:B1","ipv4":"192.168.159.178","ipv6":"--","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"8.64","connectedDeviceName":"AP2800.BFA0","frequency":"5.0","rssi_median":"-50.0","snr_median":"41.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:13:19 PM","apGroup":"default-group","ssid":"CiscoSensorProvisioning","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 08:11:49 PM","assocDoneTimestamp":"30 Mar, 08:11:47 PM","authDoneTimestamp":"30 Mar, 08:11:49 PM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 02:13:32 PM","maxDhcpDuration_max":"3929","dhcpServerIp":"192.168.159.129","linkSpeed":"--","txRate_min":"0.0","txRate_max":"4637.69","txRate_avg":"357.99","rxRate_min":"0.0","rxRate_max":"7406.13","rxRate_avg":"774.38","txBytes_sum":"2.69","rxBytes_sum":"5.96","dataRate_median":"260.0","dot11Protocol":"802.11ac"},{"hostName":"AP70F3.5A80.6240","username":"admin","macAddress":"70:F3:5A:81:EE:F0","ipv4":"192.168.159.189","ipv6":"fe80::72f3:5aff:fe81:eef0","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"143.64","connectedDeviceName":"AP2800.BFA0","frequency":"5.0","rssi_median":"-57.0","snr_median":"34.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:13:19 PM","apGroup":"default-group","ssid":"CiscoSensorProvisioning","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 08:39:23 PM","assocDoneTimestamp":"30 Mar, 07:40:12 PM","authDoneTimestamp":"30 Mar, 08:39:23 PM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 05:41:19 PM","maxDhcpDuration_max":"1914","dhcpServerIp":"192.168.159.129","linkSpeed":"--","txRate_min":"0.0","txRate_max":"2220136.19","txRate_avg":"11847.66","rxRate_min":"0.0","rxRate_max":"4115458.02","rxRate_avg":"21927.03","txBytes_sum":"50.36","rxBytes_sum":"93.27","dataRate_median":"260.0","dot11Protocol":"802.11ac"},{"hostName":"MinSes-iPad","username":"--","macAddress":"88:E9:FE:46:D0:FA","ipv4":"192.168.159.208","ipv6":"fe80::3d:ead5:a195:9f1b","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"10","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"10.59","connectedDeviceName":"AP2800.BFA0","frequency":"5.0","rssi_median":"-37.0","snr_median":"56.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:13:19 PM","apGroup":"default-group","ssid":"@CorpSSID_SF","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 02:00:53 PM","assocDoneTimestamp":"--","authDoneTimestamp":"30 Mar, 02:00:53 PM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 01:42:29 PM","maxDhcpDuration_max":"--","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"3.08","txRate_max":"5460.62","txRate_avg":"175.1","rxRate_min":"4.15","rxRate_max":"71886.67","rxRate_avg":"1321.07","txBytes_sum":"1.42","rxBytes_sum":"9.17","dataRate_median":"260.0","dot11Protocol":"802.11ac"},{"hostName":"Galaxy-Tab-A","username":"carl","macAddress":"B0:6F:E0:FF:B1:6C","ipv4":"192.168.152.88","ipv6":"fe80::71fa:9e7b:3591:3296","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"7","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"2.63","connectedDeviceName":"APCC16.7E83.DCF6","frequency":"5.0","rssi_median":"-63.0","snr_median":"26.0","site":"Global/San Jose/SJ04/Fl3","lastUpdated":"30 Mar, 09:13:19 PM","apGroup":"default-group","ssid":"@CorpSSID_98","vlan":"10","vnid":"--","onboardingEventTime":"28 Mar, 08:20:59 AM","assocDoneTimestamp":"28 Mar, 08:20:59 AM","authDoneTimestamp":"28 Mar, 08:20:59 AM","aaaServerIp":"192.168.152.43","dhcpDoneTimestamp":"27 Mar, 05:38:08 PM","maxDhcpDuration_max":"--","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"1.54","txRate_max":"1992.41","txRate_avg":"189.44","rxRate_min":"2.07","rxRate_max":"181.87","rxRate_avg":"54.4","txBytes_sum":"2.02","rxBytes_sum":"0.6","dataRate_median":"12.0","dot11Protocol":"802.11ac"},{"hostName":"Sensor.0D78","username":"--","macAddress":"70:F3:5A:7C:9C:10","ipv4":"192.168.159.177","ipv6":"--","deviceType":"Wireless","connectionStatus":"Disconnected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"3435.08","connectedDeviceName":"AP1815.8968","frequency":"5.0","rssi_median":"-21.0","snr_median":"67.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:08:00 PM","apGroup":"default-group","ssid":"@CorpSSID_SF","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 08:48:47 PM","assocDoneTimestamp":"30 Mar, 08:48:45 PM","authDoneTimestamp":"30 Mar, 08:48:45 PM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 08:48:47 PM","maxDhcpDuration_max":"5522","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"0.0","txRate_max":"6259860.67","txRate_avg":"687760.72","rxRate_min":"0.0","rxRate_max":"5875517.07","rxRate_avg":"341120.75","txBytes_sum":"2332.85","rxBytes_sum":"1102.23","dataRate_median":"58.0","dot11Protocol":"802.11ac"},{"hostName":"Galaxy-Tab-A","username":"--","macAddress":"B0:6F:E0:FF:A7:FC","ipv4":"192.168.159.202","ipv6":"fe80::b26f:e0ff:feff:a7fc","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"10","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"15.16","connectedDeviceName":"AP3802.02C2","frequency":"5.0","rssi_median":"-33.0","snr_median":"61.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:13:19 PM","apGroup":"default-group","ssid":"@CorpSSID_SF","vlan":"0","vnid":"0","onboardingEventTime":"29 Mar, 04:59:19 AM","assocDoneTimestamp":"29 Mar, 04:59:19 AM","authDoneTimestamp":"29 Mar, 04:59:19 AM","aaaServerIp":"--","dhcpDoneTimestamp":"29 Mar, 04:59:19 AM","maxDhcpDuration_max":"242","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"262.07","txRate_max":"1803.02","txRate_avg":"521.2","rxRate_min":"150.61","rxRate_max":"6649.87","rxRate_avg":"886.37","txBytes_sum":"5.63","rxBytes_sum":"9.53","dataRate_median":"173.0","dot11Protocol":"802.11ac"},{"hostName":"AP70F3.5A7A.65F8","username":"--","macAddress":"70:F3:5A:7B:FE:30","ipv4":"192.168.159.173","ipv6":"--","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"2632.42","connectedDeviceName":"AP1815.E4B0","frequency":"5.0","rssi_median":"-24.0","snr_median":"68.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 08:54:00 PM","apGroup":"default-group","ssid":"@CorpSSID_SF","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 08:41:17 PM","assocDoneTimestamp":"30 Mar, 08:41:15 PM","authDoneTimestamp":"30 Mar, 08:41:15 PM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 08:41:17 PM","maxDhcpDuration_max":"5542","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"0.0","txRate_max":"4758151.31","txRate_avg":"688175.6","rxRate_min":"0.0","rxRate_max":"3687030.83","rxRate_avg":"316207.8","txBytes_sum":"1772.78","rxBytes_sum":"859.64","dataRate_median":"173.0","dot11Protocol":"802.11ac"},{"hostName":"iPadUser32","username":"--","macAddress":"88:E9:FE:0B:6D:9E","ipv4":"192.168.159.209","ipv6":"fe80::802:41e6:d75d:800c","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"10","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"40.25","connectedDeviceName":"AP2800.BFA0","frequency":"5.0","rssi_median":"-42.0","snr_median":"51.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:13:19 PM","apGroup":"default-group","ssid":"@CorpSSID_SF","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 06:33:56 AM","assocDoneTimestamp":"--","authDoneTimestamp":"30 Mar, 06:33:56 AM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 01:47:14 AM","maxDhcpDuration_max":"--","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"2197.47","txRate_max":"15444.09","txRate_avg":"4422.96","rxRate_min":"211.53","rxRate_max":"1145.78","rxRate_avg":"382.92","txBytes_sum":"37.02","rxBytes_sum":"3.23","dataRate_median":"260.0","dot11Protocol":"802.11ac"},{"hostName":"Sensor-5CC0","username":"USER","macAddress":"70:F3:5A:7B:D9:50","ipv4":"192.168.159.216","ipv6":"--","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"4.19","connectedDeviceName":"AP1815.8968","frequency":"5.0","rssi_median":"-25.0","snr_median":"69.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:13:19 PM","apGroup":"default-group","ssid":"CiscoSensorProvisioning","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 09:04:13 PM","assocDoneTimestamp":"30 Mar, 09:04:13 PM","authDoneTimestamp":"30 Mar, 09:04:13 PM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 08:32:09 PM","maxDhcpDuration_max":"1986","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"0.0","txRate_max":"1670.67","txRate_avg":"290.1","rxRate_min":"0.0","rxRate_max":"930.19","rxRate_avg":"399.82","txBytes_sum":"1.81","rxBytes_sum":"2.38","dataRate_median":"260.0","dot11Protocol":"802.11ac"},{"hostName":"Sensor-44C8","username":"admin","macAddress":"70:F3:5A:7B:79:70","ipv4":"192.168.159.219","ipv6":"--","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"26.27","connectedDeviceName":"AP3802.02C2","frequency":"5.0","rssi_median":"-26.0","snr_median":"68.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:13:19 PM","apGroup":"default-group","ssid":"CiscoSensorProvisioning","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 08:22:57 PM","assocDoneTimestamp":"30 Mar, 08:22:57 PM","authDoneTimestamp":"30 Mar, 08:22:57 PM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 06:12:34 PM","maxDhcpDuration_max":"1926","dhcpServerIp":"192.168.159.129","linkSpeed":"--","txRate_min":"0.0","txRate_max":"170353.57","txRate_avg":"1214.72","rxRate_min":"0.0","rxRate_max":"392494.2","rxRate_avg":"2793.58","txBytes_sum":"7.95","rxBytes_sum":"18.33","dataRate_median":"260.0","dot11Protocol":"802.11ac"},{"hostName":"Apple-TV","username":"--","macAddress":"D0:03:4B:00:E6:8F","ipv4":"192.168.159.199","ipv6":"fe80::c39:365c:63b1:434f","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"10","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"12.74","connectedDeviceName":"AP3802.02C2","frequency":"5.0","rssi_median":"-23.0","snr_median":"71.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:13:19 PM","apGroup":"default-group","ssid":"@CorpSSID_SF","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 05:43:23 AM","assocDoneTimestamp":"03 Mar, 11:01:41 AM","authDoneTimestamp":"30 Mar, 05:43:23 AM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 02:07:25 AM","maxDhcpDuration_max":"--","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"4.16","txRate_max":"3174.52","txRate_avg":"783.62","rxRate_min":"5.6","rxRate_max":"1612.71","rxRate_avg":"399.23","txBytes_sum":"8.45","rxBytes_sum":"4.29","dataRate_median":"260.0","dot11Protocol":"802.11ac"},{"hostName":"Sensor-0298","username":"admin","macAddress":"70:F3:5A:7C:70:90","ipv4":"192.168.159.187","ipv6":"--","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"15.41","connectedDeviceName":"AP3802.02C2","frequency":"5.0","rssi_median":"-26.0","snr_median":"68.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:13:00 PM","apGroup":"default-group","ssid":"CiscoSensorProvisioning","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 08:25:15 PM","assocDoneTimestamp":"30 Mar, 08:25:15 PM","authDoneTimestamp":"30 Mar, 08:25:15 PM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 05:26:23 PM","maxDhcpDuration_max":"1973","dhcpServerIp":"192.168.159.129","linkSpeed":"--","txRate_min":"0.0","txRate_max":"7342.93","txRate_avg":"555.43","rxRate_min":"0.0","rxRate_max":"9713.87","rxRate_avg":"1230.6","txBytes_sum":"4.68","rxBytes_sum":"10.74","dataRate_median":"260.0","dot11Protocol":"802.11ac"},{"hostName":"Sensor.3910","username":"--","macAddress":"70:F3:5A:7B:4A:90","ipv4":"192.168.159.159","ipv6":"--","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"2063.52","connectedDeviceName":"AP2800.BFA0","frequency":"5.0","rssi_median":"-20.0","snr_median":"66.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 08:54:00 PM","apGroup":"default-group","ssid":"@CorpSSID_SF","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 08:44:55 PM","assocDoneTimestamp":"30 Mar, 08:42:22 PM","authDoneTimestamp":"30 Mar, 08:42:22 PM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 08:42:24 PM","maxDhcpDuration_max":"2494","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"0.0","txRate_max":"5935564.09","txRate_avg":"705424.82","rxRate_min":"0.0","rxRate_max":"5817540.36","rxRate_avg":"254234.76","txBytes_sum":"1515.68","rxBytes_sum":"547.84","dataRate_median":"130.0","dot11Protocol":"802.11n (2.4GHz)"},{"hostName":"Galaxy-Tab-A","username":"--","macAddress":"F0:8A:76:25:18:54","ipv4":"192.168.159.197","ipv6":"fe80::f28a:76ff:fe25:1854","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"10","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"34.52","connectedDeviceName":"AP3802.02C2","frequency":"5.0","rssi_median":"-29.0","snr_median":"65.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:13:00 PM","apGroup":"default-group","ssid":"@CorpSSID_SF","vlan":"0","vnid":"0","onboardingEventTime":"26 Mar, 09:39:17 PM","assocDoneTimestamp":"26 Mar, 09:39:17 PM","authDoneTimestamp":"26 Mar, 09:39:17 PM","aaaServerIp":"--","dhcpDoneTimestamp":"26 Mar, 09:39:17 PM","maxDhcpDuration_max":"234","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"285.16","txRate_max":"9716.36","txRate_avg":"594.56","rxRate_min":"263.82","rxRate_max":"530577.45","rxRate_avg":"2806.39","txBytes_sum":"6.38","rxBytes_sum":"28.15","dataRate_median":"173.0","dot11Protocol":"802.11ac"},{"hostName":"--","username":"--","macAddress":"70:F3:5A:7C:8B:91","ipv4":"0.0.0.0","ipv6":"--","deviceType":"Wireless","connectionStatus":"Disconnected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"7","usage_sum":"1.98","connectedDeviceName":"AP2800.BFA0","frequency":"2.4","rssi_median":"-62.0","snr_median":"23.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:13:19 PM","apGroup":"default-group","ssid":"CiscoSensorProvisioning","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 06:34:24 PM","assocDoneTimestamp":"30 Mar, 06:34:15 PM","authDoneTimestamp":"30 Mar, 06:34:18 PM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 06:34:24 PM","maxDhcpDuration_max":"23671","dhcpServerIp":"192.168.159.129","linkSpeed":"--","txRate_min":"0.0","txRate_max":"4220.53","txRate_avg":"316.64","rxRate_min":"0.0","rxRate_max":"7585.87","rxRate_avg":"496.05","txBytes_sum":"0.76","rxBytes_sum":"1.22","dataRate_median":"0.0","dot11Protocol":"802.11n (2.4GHz)"},{"hostName":"Sensor-AP70F3.5A82.0740","username":"admin","macAddress":"70:F3:5A:82:82:D0","ipv4":"192.168.159.188","ipv6":"fe80::72f3:5aff:fe82:82d0","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"1","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"19.04","connectedDeviceName":"AP2800.BFA0","frequency":"5.0","rssi_median":"-56.0","snr_median":"36.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:13:19 PM","apGroup":"default-group","ssid":"CiscoSensorProvisioning","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 06:41:27 PM","assocDoneTimestamp":"30 Mar, 06:41:26 PM","authDoneTimestamp":"30 Mar, 06:41:27 PM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 05:42:17 PM","maxDhcpDuration_max":"1942","dhcpServerIp":"192.168.159.129","linkSpeed":"--","txRate_min":"0.0","txRate_max":"7729.16","txRate_avg":"781.28","rxRate_min":"0.0","rxRate_max":"8887.73","rxRate_avg":"1477.67","txBytes_sum":"6.53","rxBytes_sum":"12.51","dataRate_median":"260.0","dot11Protocol":"802.11ac"},{"hostName":"Sensor-4230","username":"USER","macAddress":"0C:75:BD:0D:5D:D0","ipv4":"192.168.159.172","ipv6":"--","deviceType":"Wireless","connectionStatus":"Connected","averageHealthScore_min":"4","averageHealthScore_max":"10","averageHealthScore_median":"10","usage_sum":"505.83","connectedDeviceName":"AP1815.E4B0","frequency":"2.4","rssi_median":"-11.0","snr_median":"72.0","site":"Global/San Francisco/One Bush/Fl1","lastUpdated":"30 Mar, 09:13:00 PM","apGroup":"default-group","ssid":"CiscoSensorProvisioning","vlan":"0","vnid":"0","onboardingEventTime":"30 Mar, 08:54:44 PM","assocDoneTimestamp":"30 Mar, 08:54:44 PM","authDoneTimestamp":"30 Mar, 08:54:44 PM","aaaServerIp":"--","dhcpDoneTimestamp":"30 Mar, 08:51:30 PM","maxDhcpDuration_max":"7476","dhcpServerIp":"--","linkSpeed":"--","txRate_min":"0.0","txRate_max":"3268093.99","txRate_avg":"31062.13","rxRate_min":"0.0","rxRate_max":"4572712.95","rxRate_avg":"43473.25","txBytes_sum":"210.82","rxBytes_sum":"295.0","dataRate_median":"72.0","dot11Protocol":"802.11n (2.4GHz)"}],"filters": [{"name":"Location","displayName":"Location","values":["Global"]},{"name":"DeviceType","displayName":"Device Type","values":["Wireless"]},{"name":"SSID","displayName":"SSID","values":[]},{"name":"Band","displayName":"Band","values":[]},{"name":"startTime","displayName":"Start Time","values":["2021-03-29 21:13:19.769 PM UTC"]},{"name":"endTime","displayName":"End Time","values":["2021-03-30 21:13:19.769 PM UTC"]}]}
 
-# test the Webhook with a Cisco DNA Center Report notification
 
-url = WEBHOOK_URL
-header = {'content-type': 'application/json'}
-response = requests.post(url, auth=basic_auth, data=json.dumps(report_notification), headers=header, verify=False)
-print(response.status_code, ', ', response.text)
-# response_json = response.json()
+REPORT_LINK_KEY = ('Cisco DNA Center Event Context link. **This link is active only in the context of Cisco DNA '
+                   'Center. You must have necessary permissions to login')
+
+# latency histogram buckets, in milliseconds
+LATENCY_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+
+
+def unique_notification():
+    """
+    Create a copy of the {report_notification} with a new random Event Id and execution id
+    :return: the notification payload
+    """
+    notification = copy.deepcopy(report_notification)
+    old_execution_id = notification['Event Details']['execution id']
+    execution_id = str(uuid.uuid4())
+    notification['Event Id'] = str(uuid.uuid4())
+    notification['Event Timestamp'] = int(time.time() * 1000)
+    notification['Event Details']['execution id'] = execution_id
+    notification[REPORT_LINK_KEY] = notification[REPORT_LINK_KEY].replace(old_execution_id, execution_id)
+    return notification
+
+
+def print_histogram(latencies):
+    """
+    Print the latency histogram
+    :param latencies: the request latencies, in milliseconds
+    :return None
+    """
+    counts = [0] * (len(LATENCY_BUCKETS) + 1)
+    for latency in latencies:
+        counts[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+    largest = max(counts) or 1
+    lower = 0
+    for bucket, count in zip(LATENCY_BUCKETS + [None], counts):
+        label = ('%5d - %5d ms' % (lower, bucket)) if bucket else ('%5d+        ms' % lower)
+        print('  %s %7d %s' % (label, count, '#' * (count * 50 // largest)))
+        lower = bucket
+
+
+class LoadGenerator:
+    """
+    Send report notifications to the webhook receiver, from {concurrency} threads, at up to {rate} requests/sec
+    """
+
+    def __init__(self, url, requests_count, concurrency=1, rate=0, unique=False, duplicates=0):
+        """
+        :param url: webhook receiver URL
+        :param requests_count: total number of notifications to send
+        :param concurrency: number of notifications sent at the same time
+        :param rate: max number of notifications per second, for all the threads, not limited if 0
+        :param unique: send a new random Event Id and execution id with each notification
+        :param duplicates: fraction of the notifications sent again, as Cisco DNA Center retries
+        """
+        self.url = url
+        self.requests_count = requests_count
+        self.concurrency = concurrency
+        self.rate = rate
+        self.unique = unique
+        self.duplicates = duplicates
+        self.latencies = []  # in milliseconds
+        self.results = collections.Counter()  # response status code, or the error name: count
+        self.duplicates_sent = 0
+        self._sent = []
+        self._next = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _session(self):
+        # one keep-alive session for each thread
+        if not hasattr(self._local, 'session'):
+            self._local.session = requests.Session()
+            self._local.session.auth = basic_auth
+            self._local.session.verify = False
+            self._local.session.headers.update({'content-type': 'application/json'})
+        return self._local.session
+
+    def _next_notification(self):
+        """
+        :return: the request number and the notification to send, None when all the notifications were sent
+        """
+        with self._lock:
+            if self._next >= self.requests_count:
+                return None
+            number = self._next
+            self._next += 1
+            if self._sent and random.random() < self.duplicates:
+                self.duplicates_sent += 1
+                return number, random.choice(self._sent)
+            notification = unique_notification() if self.unique else report_notification
+            self._sent.append(notification)
+            return number, notification
+
+    def _worker(self, start):
+        while True:
+            item = self._next_notification()
+            if item is None:
+                return
+            number, notification = item
+            if self.rate:
+                delay = start + number / self.rate - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            request_start = time.monotonic()
+            try:
+                response = self._session().post(self.url, data=json.dumps(notification), timeout=30)
+                result = response.status_code
+            except requests.exceptions.RequestException as error:
+                result = type(error).__name__
+            latency = (time.monotonic() - request_start) * 1000
+            with self._lock:
+                self.latencies.append(latency)
+                self.results[result] += 1
+
+    def run(self):
+        """
+        Send all the notifications
+        :return: the total time, in seconds
+        """
+        start = time.monotonic()
+        threads = [threading.Thread(target=self._worker, args=(start,)) for _ in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.monotonic() - start
+
+    def print_summary(self, total_time):
+        """
+        Print the requests/sec, the latency percentiles and histogram, and the error rate
+        :param total_time: the total time, in seconds
+        :return None
+        """
+        latencies = sorted(self.latencies)
+        sent = len(latencies)
+        errors = sum(count for result, count in self.results.items() if result not in (200, 202))
+        print('\nNotifications sent: %d (duplicates %d), concurrency: %d, time: %.2fs' %
+              (sent, self.duplicates_sent, self.concurrency, total_time))
+        if sent == 0:
+            print('No notifications sent')
+            return
+        print('Requests/sec: %.1f' % (sent / total_time if total_time > 0 else 0))
+        print('Latency ms, avg: %.1f, p50: %.1f, p90: %.1f, p99: %.1f, max: %.1f' % (
+            sum(latencies) / sent, latencies[sent // 2], latencies[min(int(sent * 0.9), sent - 1)],
+            latencies[min(int(sent * 0.99), sent - 1)], latencies[-1]))
+        print('Responses:', ', '.join('%s: %d' % (result, count) for result, count in sorted(
+            self.results.items(), key=lambda item: str(item[0]))))
+        print('Error rate: %.2f%%' % (errors * 100 / sent))
+        print('\nLatency histogram')
+        print_histogram(latencies)
+
+
+def main():
+    """
+    This application will test the Webhook receiver with Cisco DNA Center Report notifications.
+    By default one notification is sent, the options will send many notifications, at the same time, to measure the
+    receiver capacity for the report notifications bursts.
+    """
+    parser = argparse.ArgumentParser(description='Send report notifications to the webhook receiver')
+    parser.add_argument('--url', default=WEBHOOK_URL, help='webhook receiver URL, default WEBHOOK_URL')
+    parser.add_argument('--requests', type=int, default=1, help='number of notifications to send')
+    parser.add_argument('--concurrency', type=int, default=1, help='number of notifications sent at the same time')
+    parser.add_argument('--rate', type=float, default=0, help='max notifications/sec, not limited if 0')
+    parser.add_argument('--unique', action='store_true',
+                        help='new random Event Id and execution id for each notification')
+    parser.add_argument('--duplicates', type=float, default=0,
+                        help='fraction of the notifications sent again, for example 0.1')
+    args = parser.parse_args()
+
+    if args.requests == 1:
+        # test the Webhook with a Cisco DNA Center Report notification
+        header = {'content-type': 'application/json'}
+        notification = unique_notification() if args.unique else report_notification
+        response = requests.post(args.url, auth=basic_auth, data=json.dumps(notification), headers=header,
+                                 verify=False)
+        print(response.status_code, ', ', response.text)
+        return
+
+    load_generator = LoadGenerator(args.url, args.requests, concurrency=args.concurrency, rate=args.rate,
+                                   unique=args.unique, duplicates=args.duplicates)
+    total_time = load_generator.run()
+    load_generator.print_summary(total_time)
 
 
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+import os
+import sys
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+
+# the report apps are top level modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mock_dnac_server  # noqa: E402
+from dnac_client import DnacClient  # noqa: E402
+from dnac_resilience import CircuitBreaker, RetryPolicy  # noqa: E402
+from report_catalog import ReportCatalog  # noqa: E402
+from report_orchestrator import ReportOrchestrator  # noqa: E402
+from report_poller import ExecutionHistory, ExecutionPoller  # noqa: E402
+from report_profiles import ProfileHistory  # noqa: E402
+
+MOCK_SETTINGS = {'latency': 0, 'execution_time': 0.2, 'clients': 50, 'error_rate': 0, 'fail_requests': 0,
+                 'fail_status': 503, 'webhook_url': None}
+
+
+@pytest.fixture(scope='session')
+def mock_server():
+    """
+    Run the mock Cisco DNA Center server in a thread, on a free port
+    :return: the mock server URL
+    """
+    server = make_server('127.0.0.1', 0, mock_dnac_server.app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield 'http://127.0.0.1:' + str(server.server_port)
+    server.shutdown()
+    thread.join()
+
+
+@pytest.fixture
+def mock_dnac(mock_server):
+    """
+    The mock server, with the test settings and no reports
+    :return: the mock server URL
+    """
+    with mock_dnac_server.reports_lock:
+        mock_dnac_server.settings.update(MOCK_SETTINGS)
+        mock_dnac_server.reports.clear()
+        mock_dnac_server.tokens.clear()
+        for name in mock_dnac_server.stats:
+            mock_dnac_server.stats[name] = 0
+    yield mock_server
+    mock_dnac_server.settings.update(MOCK_SETTINGS)
+
+
+@pytest.fixture
+def dnac(mock_dnac):
+    """
+    DnacClient for the mock server, the retries are not delayed, and the circuit opens after 3 failures for 0.2 seconds
+    """
+    client = DnacClient(mock_dnac, 'admin', 'password', retry_policy=RetryPolicy(backoff=0, max_retry_after=0),
+                        circuit_breaker=CircuitBreaker(failure_threshold=3, reset_timeout=0.2))
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def orchestrator(dnac, tmp_path):
+    """
+    ReportOrchestrator for the mock server, the executions are polled every 0.05 to 0.1 seconds, the catalog, the
+    execution and profile history files are saved to {tmp_path}
+    """
+    history = ExecutionHistory(str(tmp_path / 'execution_history.json'))
+    return ReportOrchestrator(dnac, max_concurrency=4, output_dir=str(tmp_path / 'reports'),
+                              poller=ExecutionPoller(dnac, initial_interval=0.05, max_interval=0.1, history=history),
+                              catalog=ReportCatalog(dnac, catalog_dir=str(tmp_path / 'catalog')),
+                              profile_history=ProfileHistory(str(tmp_path / 'profile_history.json')))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+import time
+
+from dedup_cache import DedupCache
+
+
+def test_duplicate_keys():
+    cache = DedupCache()
+    assert not cache.check_and_add('execution:r1/e1', 'event:1')
+    assert cache.check_and_add('execution:r1/e1', 'event:2')
+    assert cache.check_and_add('execution:r1/e2', 'event:1')
+    assert not cache.check_and_add('execution:r1/e2', 'event:2')
+    assert cache.stats() == {'size': 4, 'checked': 4, 'duplicates': 2, 'pruned': 0}
+
+
+def test_keys_expire_after_ttl():
+    cache = DedupCache(ttl=0.1)
+    assert not cache.check_and_add('key')
+    assert cache.check_and_add('key')
+    time.sleep(0.15)
+    assert not cache.check_and_add('key')
+
+
+def test_least_recently_seen_keys_evicted():
+    cache = DedupCache(max_size=2)
+    cache.check_and_add('key1')
+    cache.check_and_add('key2')
+    cache.check_and_add('key1')
+    cache.check_and_add('key3')
+    assert cache.stats()['size'] == 2
+    assert cache.check_and_add('key1')
+    assert not cache.check_and_add('key2')
+
+
+def test_discard():
+    cache = DedupCache()
+    cache.check_and_add('key1', 'key2')
+    cache.discard('key1', 'key2')
+    assert not cache.check_and_add('key1', 'key2')
+
+
+def test_keys_shared_by_database(tmp_path):
+    db_file = str(tmp_path / 'dedup.db')
+    worker1 = DedupCache(db_file=db_file)
+    worker2 = DedupCache(db_file=db_file)
+    assert not worker1.check_and_add('execution:r1/e1', 'event:1')
+    assert worker2.check_and_add('execution:r1/e1', 'event:2')
+    # the duplicate keys are not added, event:2 is new for the other workers
+    assert not worker2.check_and_add('execution:r1/e2', 'event:2')
+    worker1.discard('execution:r1/e1', 'event:1')
+    assert not worker2.check_and_add('execution:r1/e1', 'event:1')
+
+
+def test_keys_kept_after_restart(tmp_path):
+    db_file = str(tmp_path / 'dedup.db')
+    DedupCache(db_file=db_file).check_and_add('key')
+    assert DedupCache(db_file=db_file).check_and_add('key')
+    assert not DedupCache(db_file=db_file, ttl=0).check_and_add('key')
+
+
+def test_database_pruned_periodically(tmp_path, monkeypatch):
+    db_file = str(tmp_path / 'dedup.db')
+    cache = DedupCache(db_file=db_file, ttl=10, db_max_size=3, prune_interval=2)
+    monkeypatch.setattr(time, 'time', lambda: 1000.0)
+    for key in ('key1', 'key2'):
+        cache.check_and_add(key)
+    monkeypatch.setattr(time, 'time', lambda: 1020.0)
+    for key in ('key3', 'key4', 'key5', 'key6'):
+        cache.check_and_add(key)
+    # the expired keys are deleted after 2 notifications, and the oldest keys over 3 after 2 more notifications
+    assert cache.stats()['pruned'] == 3
+    assert {row[0] for row in cache._db.execute('SELECT key FROM seen')} == {'key4', 'key5', 'key6'}
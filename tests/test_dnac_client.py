@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+import pytest
+
+import mock_dnac_server
+from dnac_resilience import CircuitBreaker, CircuitOpenError
+from report_definitions import build_report_request
+
+
+def report_request(name='Client Detail test'):
+    return build_report_request(name, 'Client', mock_dnac_server.VIEW_GROUP_ID, 'Client Detail',
+                                mock_dnac_server.VIEW_ID, fields=[{'name': 'macAddress', 'displayName': 'MAC Address'},
+                                                                  {'name': 'hostName', 'displayName': 'Host Name'}])
+
+
+def test_token_cached(dnac):
+    dnac.get_report_view_groups()
+    dnac.get_report_view_groups()
+    assert mock_dnac_server.stats['tokens'] == 1
+    assert dnac.token_cache.stats()['hits'] == 1
+
+
+def test_retry_transient_errors(dnac):
+    dnac.get_dnac_jwt_token()
+    mock_dnac_server.settings['fail_requests'] = 2
+    view_groups = dnac.get_report_view_groups()
+    assert view_groups[0]['viewGroupId'] == mock_dnac_server.VIEW_GROUP_ID
+    assert mock_dnac_server.stats['errors'] == 2
+    assert dnac.metrics.summary()['api']['view_groups']['status'] == {'200': 1, '503': 2}
+
+
+def test_create_report_not_retried_after_503(dnac):
+    dnac.get_report_view_groups()
+    mock_dnac_server.settings['fail_requests'] = 1
+    response = dnac.create_report(report_request())
+    assert response.status_code == 503
+    assert mock_dnac_server.reports == {}
+
+
+def test_create_report_retried_after_429(dnac):
+    dnac.get_report_view_groups()
+    mock_dnac_server.settings.update({'fail_requests': 1, 'fail_status': 429})
+    response = dnac.create_report(report_request())
+    assert response.status_code == 200
+    assert list(mock_dnac_server.reports) == [response.json()['reportId']]
+
+
+def test_new_token_after_401(dnac):
+    dnac.get_report_view_groups()
+    mock_dnac_server.tokens.clear()
+    dnac.get_report_view_groups()
+    assert mock_dnac_server.stats['tokens'] == 2
+    assert dnac.metrics.summary()['api']['view_groups']['status'] == {'200': 2, '401': 1}
+
+
+def test_circuit_opens_and_closes(dnac):
+    dnac.get_report_view_groups()
+    mock_dnac_server.settings['fail_requests'] = 10
+    with pytest.raises(CircuitOpenError):
+        dnac.get_report_view_groups()
+    assert dnac.circuit_breaker.stats()['state'] == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        dnac.get_report_view_groups()
+    assert mock_dnac_server.stats['errors'] == 3
+
+    mock_dnac_server.settings['fail_requests'] = 0
+    dnac.circuit_breaker.reset_timeout = 0
+    dnac.get_report_view_groups()
+    assert dnac.circuit_breaker.stats() == {'state': CircuitBreaker.CLOSED, 'failures': 0, 'opened': 1,
+                                            'rejected': 2}
+
+
+def test_circuit_trial_call_fails_with_any_exception(dnac, monkeypatch):
+    dnac.get_report_view_groups()
+    dnac.circuit_breaker.state = CircuitBreaker.OPEN
+    dnac.circuit_breaker.reset_timeout = 0
+
+    def request(*args, **kwargs):
+        raise RuntimeError('not a requests error')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(dnac.session, 'request', request)
+        with pytest.raises(RuntimeError):
+            dnac.get_report_view_groups()
+    assert dnac.circuit_breaker.stats()['state'] == CircuitBreaker.OPEN
+    dnac.get_report_view_groups()  # the next trial call is sent
+    assert dnac.circuit_breaker.stats()['state'] == CircuitBreaker.CLOSED
+
+
+def test_429_is_not_a_circuit_failure(dnac):
+    dnac.get_report_view_groups()
+    mock_dnac_server.settings.update({'fail_requests': 10, 'fail_status': 429})
+    response = dnac.get('/dna/intent/api/v1/data/view-groups', 'view_groups')
+    assert response.status_code == 429
+    assert dnac.circuit_breaker.stats()['state'] == CircuitBreaker.CLOSED
+    assert dnac.circuit_breaker.stats()['failures'] == 0
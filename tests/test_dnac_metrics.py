@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+
+import asyncio
+
+import pytest
+
+import mock_dnac_server
+from dnac_metrics import ApiMetrics, Histogram
+
+
+def test_histogram_quantiles():
+    histogram = Histogram([1, 2, 5])
+    assert histogram.summary() == {'count': 0, 'avg': None, 'p50': None, 'p99': None, 'max': None}
+    for value in (0.5, 1.5, 1.5, 4, 8):
+        histogram.observe(value)
+    assert histogram.counts == [1, 2, 1, 1]
+    assert histogram.quantile(0.5) == pytest.approx(1.75)  # inside the (1, 2] bucket
+    assert histogram.quantile(0.99) == pytest.approx(7.85)  # the +Inf bucket upper bound is the max
+    assert histogram.summary()['avg'] == pytest.approx(3.1)
+    assert histogram.prometheus('latency', 'operation="auth"') == [
+        'latency_bucket{operation="auth",le="1"} 1', 'latency_bucket{operation="auth",le="2"} 3',
+        'latency_bucket{operation="auth",le="5"} 4', 'latency_bucket{operation="auth",le="+Inf"} 5',
+        'latency_sum{operation="auth"} 15.5', 'latency_count{operation="auth"} 5']
+
+
+def test_api_metrics():
+    metrics = ApiMetrics()
+    metrics.record_call('create_report', 200, 0.2, bytes_sent=100, bytes_received=50)
+    metrics.record_call('create_report', 'error', 0.1, bytes_sent=100)
+    metrics.record_download('report_file', 1000, 0.5)
+    metrics.report_submitted('report-1')
+    metrics.report_completed('report-1', 'SUCCESS')
+    metrics.report_completed('report-2', 'SUCCESS')  # not submitted by this client, not recorded
+    summary = metrics.summary()
+    assert summary['api']['create_report']['status'] == {'200': 1, 'error': 1}
+    assert (summary['api']['create_report']['bytes_sent'], summary['api']['create_report']['bytes_received']) == \
+        (200, 50)
+    assert summary['report_executions']['SUCCESS']['count'] == 1
+    assert summary['report_downloads']['count'] == 1
+    text = metrics.prometheus()
+    assert 'dnac_api_requests_total{operation="create_report",status="error"} 1\n' in text
+    assert 'dnac_api_response_bytes_total{operation="report_file"} 1000\n' in text
+    assert 'dnac_report_execution_duration_seconds_count{status="SUCCESS"} 1\n' in text
+
+
+def test_api_metrics_of_report_run(orchestrator):
+    results, total_time = asyncio.run(orchestrator.run([{'name': 'Client Detail', 'profile': 'lookup'}]))
+    summary = orchestrator.dnac.metrics.summary()
+    assert {'auth', 'create_report', 'report_executions', 'report_file'} <= set(summary['api'])
+    assert summary['api']['create_report']['status'] == {'200': 1}
+    assert summary['api']['report_file']['bytes_received'] >= results[0]['size']
+    assert summary['report_executions']['SUCCESS']['count'] == 1
+    assert summary['report_executions']['SUCCESS']['max'] >= mock_dnac_server.settings['execution_time']
+    assert summary['report_downloads']['count'] == 1
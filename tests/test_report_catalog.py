@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+
+import os
+import time
+
+import pytest
+
+import mock_dnac_server
+from report_catalog import ReportCatalog
+
+API_CALLS = ('get_report_view_groups', 'get_report_view_ids', 'get_detailed_report_views')
+
+
+@pytest.fixture
+def api_calls(dnac, monkeypatch):
+    """
+    Count the report catalog API calls
+    """
+    calls = []
+    for name in API_CALLS:
+        method = getattr(dnac, name)
+        monkeypatch.setattr(dnac, name, lambda *args, method=method: calls.append(method.__name__) or method(*args))
+    return calls
+
+
+def discover(catalog):
+    view_group_id, view_id = catalog.discover('Client', 'Client Detail')
+    return view_group_id, view_id, catalog.get_view_details(view_group_id, view_id)
+
+
+def test_catalog_cached_on_disk(dnac, api_calls, tmp_path):
+    catalog_dir = str(tmp_path)
+    view_group_id, view_id, view_details = discover(ReportCatalog(dnac, catalog_dir=catalog_dir))
+    assert (view_group_id, view_id) == (mock_dnac_server.VIEW_GROUP_ID, mock_dnac_server.VIEW_ID)
+    assert api_calls == list(API_CALLS)
+    # the next runs use the saved catalog
+    assert discover(ReportCatalog(dnac, catalog_dir=catalog_dir)) == (view_group_id, view_id, view_details)
+    assert len(api_calls) == 3
+    assert [file_name for file_name in os.listdir(catalog_dir) if not file_name.startswith('catalog-')] == []
+
+
+def test_catalog_discovered_again(dnac, api_calls, tmp_path):
+    catalog_dir = str(tmp_path)
+    discover(ReportCatalog(dnac, catalog_dir=catalog_dir))
+    discover(ReportCatalog(dnac, catalog_dir=catalog_dir, refresh=True))
+    assert len(api_calls) == 6
+    catalog = ReportCatalog(dnac, catalog_dir=catalog_dir, ttl=3600)
+    catalog._catalog['created'] = time.time() - 7200
+    catalog._save()
+    discover(ReportCatalog(dnac, catalog_dir=catalog_dir, ttl=3600))  # expired
+    assert len(api_calls) == 9
+    catalog.refresh()
+    discover(catalog)
+    assert len(api_calls) == 12
+
+
+def test_catalog_file_for_each_dnac(dnac, api_calls, tmp_path):
+    catalog_dir = str(tmp_path)
+    discover(ReportCatalog(dnac, catalog_dir=catalog_dir))
+    other_dnac = type('OtherDnac', (), {'dnac_url': 'https://other-dnac'})()
+    other_catalog = ReportCatalog(other_dnac, catalog_dir=catalog_dir)
+    assert other_catalog.filename != ReportCatalog(dnac, catalog_dir=catalog_dir).filename
+    assert other_catalog._catalog['view_groups'] is None
+
+
+def test_catalog_file_not_valid(dnac, api_calls, tmp_path):
+    catalog = ReportCatalog(dnac, catalog_dir=str(tmp_path))
+    with open(catalog.filename, 'w') as file:
+        file.write('{"dnac_url": ')
+    discover(ReportCatalog(dnac, catalog_dir=str(tmp_path)))
+    assert len(api_calls) == 3
+
+
+def test_report_view_not_found(dnac, tmp_path):
+    catalog = ReportCatalog(dnac, catalog_dir=str(tmp_path))
+    with pytest.raises(ValueError, match='category'):
+        catalog.discover('Not a category', 'Client Detail')
+    with pytest.raises(ValueError, match='view'):
+        catalog.discover('Client', 'Not a view')
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+
+import datetime
+import json
+import math
+
+import pytest
+
+import report_columnar
+from report_columnar import ColumnBuilder, convert_report, get_report_timezone, load_report, parse_timestamp, to_epoch
+
+FILTERS = [{'name': 'startTime', 'values': ['2021-03-29 09:13:19.769 PM UTC']},
+           {'name': 'endTime', 'values': ['2021-03-30 09:13:19.769 PM UTC']}]
+CLIENTS = [
+    {'macAddress': 'mac-1', 'usage_sum': '10.5', 'lastUpdated': '30 Mar, 01:57:00 PM', 'site': 'Global/San Jose'},
+    {'macAddress': 'mac-2', 'usage_sum': '--', 'lastUpdated': '--', 'site': 'Global/London'},
+    {'macAddress': 'mac-3', 'usage_sum': ['not', 'a number'], 'lastUpdated': 1617112620, 'site': 'Global/San Jose'}
+]
+
+
+def save_report(tmp_path, filters=FILTERS):
+    filename = str(tmp_path / 'report.json')
+    with open(filename, 'w') as file:
+        json.dump({'client_details': CLIENTS, 'filters': filters}, file)
+    return filename
+
+
+def test_parse_timestamp():
+    assert parse_timestamp('30 Mar, 01:57:00 PM') == 330135700
+    assert parse_timestamp('1 Jan, 12:00:05 AM') == 101000005
+    for value in (None, '', '--', 'not a timestamp', '30 Xyz, 01:57:00 PM', 1617112620, ['30 Mar, 01:57:00 PM']):
+        assert parse_timestamp(value) == -1
+
+
+def test_column_builder_values_not_valid():
+    builder = ColumnBuilder()
+    for record in CLIENTS + [{'macAddress': 'mac-4', 'usage_sum': {'value': 1}, 'site': None}]:
+        builder.add(record)
+    assert builder.columns['usage_sum'][0] == 10.5
+    assert all(math.isnan(value) for value in builder.columns['usage_sum'][1:])
+    assert list(builder.columns['lastUpdated']) == [330135700, -1, -1, -1]
+    assert list(builder.columns['site']) == [0, 1, 0, -1]
+
+
+def test_report_timezone():
+    assert get_report_timezone(FILTERS) == datetime.timezone.utc
+    assert get_report_timezone([{'name': 'endTime', 'values': ['2021-03-30']}]) == datetime.timezone.utc
+    los_angeles = get_report_timezone([{'name': 'endTime', 'values': ['2021-03-30 09:13 PM America/Los_Angeles']}])
+    assert str(los_angeles) == 'America/Los_Angeles'
+    assert get_report_timezone(FILTERS, 'America/Los_Angeles') == los_angeles
+    with pytest.raises(ValueError):
+        get_report_timezone(FILTERS, 'Not/A_Timezone')
+    end_date = datetime.date(2021, 3, 30)
+    assert to_epoch(330135700, end_date) == 1617112620
+    assert to_epoch(330135700, end_date, los_angeles) == 1617112620 + 7 * 3600  # PDT is UTC-7
+    assert to_epoch(1231000000, end_date) == to_epoch(1231000000, datetime.date(2020, 12, 31))  # previous year
+
+
+@pytest.mark.skipif(report_columnar.pyarrow is None, reason='requires pyarrow')
+def test_convert_report_parquet(tmp_path):
+    output = str(tmp_path / 'report.parquet')
+    assert convert_report(save_report(tmp_path), output, 'parquet', timezone='America/Los_Angeles') == 3
+    table = load_report(output).to_pydict()
+    assert table['macAddress'] == ['mac-1', 'mac-2', 'mac-3']
+    assert table['usage_sum'][0] == 10.5
+    assert table['lastUpdated'][0] == datetime.datetime(2021, 3, 30, 20, 57, tzinfo=datetime.timezone.utc)
+    assert table['lastUpdated'][1:] == [None, None]
+    assert table['site'] == ['Global/San Jose', 'Global/London', 'Global/San Jose']
+
+
+@pytest.mark.skipif(report_columnar.numpy is None, reason='requires numpy')
+def test_convert_report_numpy(tmp_path):
+    output = str(tmp_path / 'report')
+    assert convert_report(save_report(tmp_path), output, 'numpy') == 3
+    report = load_report(output)
+    assert list(report['columns']['macAddress']) == ['mac-1', 'mac-2', 'mac-3']
+    assert str(report['columns']['lastUpdated'][0]) == '2021-03-30T13:57:00'
+    assert list(report['categories']['site'][report['columns']['site']]) == [
+        'Global/San Jose', 'Global/London', 'Global/San Jose']
+    assert report['metadata']['filters'] == FILTERS
+
+
+def test_load_report_format_not_installed(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_columnar, 'pyarrow', None)
+    monkeypatch.setattr(report_columnar, 'numpy', None)
+    with pytest.raises(ImportError, match='pyarrow'):
+        load_report(str(tmp_path / 'report.parquet'))
+    with pytest.raises(ImportError, match='numpy'):
+        load_report(str(tmp_path))
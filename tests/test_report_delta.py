@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+import json
+
+from report_delta import DeltaStore, apply_delta, diff_snapshots
+
+REPORTS = [
+    [{'macAddress': 'mac-1', 'hostName': 'client-1', 'ssid': 'lab', 'rssi': '-60'},
+     {'macAddress': 'mac-2', 'hostName': 'client-2', 'ssid': None}],
+    [{'macAddress': 'mac-1', 'hostName': 'client-1', 'ssid': None, 'rssi': '-62'},
+     {'macAddress': 'mac-3', 'hostName': 'client-3'},
+     {'hostName': 'no mac address'}],
+    [{'macAddress': 'mac-1', 'hostName': 'client-1', 'ssid': None},
+     {'macAddress': 'mac-3', 'hostName': 'client-3', 'vlan': None}],
+    [{'macAddress': 'mac-3', 'hostName': 'client-3', 'vlan': '10'}]
+]
+
+
+def save_report(tmp_path, clients):
+    filename = str(tmp_path / 'report.json')
+    with open(filename, 'w') as file:
+        json.dump({'client_details': clients}, file)
+    return filename
+
+
+def clients_by_mac(clients):
+    return {client['macAddress']: client for client in clients if client.get('macAddress')}
+
+
+def test_diff_snapshots(tmp_path):
+    delta = diff_snapshots(clients_by_mac(REPORTS[1]), save_report(tmp_path, REPORTS[2]))
+    assert delta == {'added': {}, 'removed': [], 'changed': {'mac-1': {'rssi': ['-62', None]},
+                                                             'mac-3': {'vlan': [None, None]}},
+                     'removed_fields': {'mac-1': ['rssi']}}
+
+
+def test_null_values_kept():
+    clients = {'mac-1': {'macAddress': 'mac-1', 'ssid': 'lab', 'rssi': '-60'}}
+    delta = {'added': {}, 'removed': [], 'changed': {'mac-1': {'ssid': ['lab', None], 'rssi': ['-60', None]}},
+             'removed_fields': {'mac-1': ['rssi']}}
+    assert apply_delta(clients, delta) == {'mac-1': {'macAddress': 'mac-1', 'ssid': None}}
+
+
+def test_delta_round_trip(tmp_path):
+    store = DeltaStore(str(tmp_path / 'deltas'), snapshot_interval=3)
+    entries = [store.add_report(save_report(tmp_path, clients), 'report-1', 'execution-' + str(number))
+               for number, clients in enumerate(REPORTS)]
+    assert [entry['type'] for entry in entries] == ['snapshot', 'delta', 'delta', 'snapshot']
+    assert (entries[1]['added'], entries[1]['removed'], entries[1]['changed']) == (1, 1, 1)
+    for seq, clients in enumerate(REPORTS):
+        assert store.reconstruct(seq) == clients_by_mac(clients)
+
+    # the chain is loaded from the index
+    store = DeltaStore(str(tmp_path / 'deltas'))
+    assert store.reconstruct() == clients_by_mac(REPORTS[-1])
+    assert [(entry['seq'], delta is None) for entry, delta in store.iter_deltas(0)] == [(1, False), (2, False),
+                                                                                       (3, True)]
+
+
+def test_deltas_without_removed_fields():
+    # the deltas saved before "removed_fields", the None new value is a removed field
+    clients = {'mac-1': {'macAddress': 'mac-1', 'ssid': 'lab'}}
+    delta = {'added': {}, 'removed': [], 'changed': {'mac-1': {'ssid': ['lab', None]}}}
+    assert apply_delta(clients, delta) == {'mac-1': {'macAddress': 'mac-1'}}
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+
+import json
+
+import pytest
+
+import report_index
+from report_index import ReportIndex
+
+CLIENTS = [
+    {'macAddress': 'F0:8A:76:25:1F:5A', 'hostName': 'laptop-1', 'ipv4': '10.1.1.1', 'site': 'Global/San Jose/Floor 1'},
+    {'macAddress': 'F0:8A:76:25:1F:5B', 'hostName': 'phone-1', 'ipv4': '10.1.1.2', 'site': 'Global/San Jose/Floor 2'},
+    {'macAddress': 'F0:8A:76:25:1F:5C', 'hostName': 'laptop-2', 'ipv4': None, 'site': 'Global/London/Floor 1'}
+]
+
+
+def save_report(tmp_path, clients=CLIENTS, name='report.json'):
+    filename = str(tmp_path / name)
+    with open(filename, 'w') as file:
+        json.dump({'client_details': clients}, file)
+    return filename
+
+
+@pytest.fixture
+def index(tmp_path):
+    return ReportIndex(str(tmp_path / 'report_index.db'))
+
+
+def test_ingest_and_query(index, tmp_path, monkeypatch):
+    monkeypatch.setattr(report_index, 'BATCH_SIZE', 2)
+    assert index.ingest(save_report(tmp_path), 'report-1', 'execution-1') == 3
+    [result] = index.query(macAddress='f0:8a:76:25:1f:5a')  # case insensitive
+    assert (result['report_id'], result['execution_id'], result['client']) == ('report-1', 'execution-1', CLIENTS[0])
+    assert [result['client']['hostName'] for result in index.query(hostName='laptop%')] == ['laptop-1', 'laptop-2']
+    assert len(index.query(site='Global/San Jose/%', hostName='phone-1')) == 1
+    assert len(index.query(ipv4=None)) == 3  # the fields with value None are not matched
+    assert len(index.query(limit=2)) == 2
+    with pytest.raises(ValueError):
+        index.query(rssi='-60')
+
+
+def test_newest_reports_first(index, tmp_path):
+    index.ingest(save_report(tmp_path), 'report-1', 'execution-1')
+    index.ingest(save_report(tmp_path, CLIENTS[:1], 'report-2.json'), 'report-1', 'execution-2')
+    results = index.query(macAddress=CLIENTS[0]['macAddress'])
+    assert [result['execution_id'] for result in results] == ['execution-2', 'execution-1']
+
+
+def test_execution_ingested_again(index, tmp_path):
+    index.ingest(save_report(tmp_path), 'report-1', 'execution-1')
+    assert index.ingest(save_report(tmp_path, CLIENTS[1:], 'report-2.json'), 'report-1', 'execution-1') == 2
+    assert len(index.query()) == 2  # the clients of the same execution are replaced
+
+
+def test_ingest_error_keeps_the_index(index, tmp_path):
+    index.ingest(save_report(tmp_path), 'report-1', 'execution-1')
+    filename = str(tmp_path / 'truncated.json')
+    with open(filename, 'w') as file:
+        file.write(json.dumps({'client_details': CLIENTS})[:150])
+    with pytest.raises(ValueError):
+        index.ingest(filename, 'report-1', 'execution-1')
+    assert len(index.query()) == 3  # the report is loaded in one transaction
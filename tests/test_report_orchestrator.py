@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+
+import asyncio
+import os
+
+import requests
+
+import mock_dnac_server
+from report_definitions import FIELD_PROFILES
+from report_registry import ReportRegistry
+from report_stream import iter_client_details
+
+
+def test_report_id_not_in_create_response(orchestrator, monkeypatch):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b'{"name": "Client Detail"}'
+    monkeypatch.setattr(orchestrator.dnac, 'create_report', lambda report_request: response)
+    results, total_time = asyncio.run(orchestrator.run([{'name': 'Client Detail'}]))
+    assert results[0]['status'] == 'FAILED'
+    assert results[0]['error'].startswith('Report id not found')
+
+
+def test_reports_downloaded_as_completed(orchestrator, tmp_path):
+    mock_dnac_server.settings['execution_time'] = 0.3
+    specs = [{'name': 'Client Detail %d' % number, 'profile': 'lookup'} for number in range(4)]
+    completed = []
+    results, total_time = asyncio.run(orchestrator.run(specs, on_complete=completed.append))
+    assert sorted(result['name'] for result in results) == [spec['name'] for spec in specs]
+    assert completed == results
+    assert all(result['status'] == 'SUCCESS' for result in results)
+    assert total_time < 4 * 0.3  # the reports are executed at the same time
+    clients = list(iter_client_details(results[0]['output']))
+    assert len(clients) == mock_dnac_server.settings['clients']
+    assert set(clients[0]) == set(FIELD_PROFILES['lookup'])
+    assert all(os.path.dirname(result['output']) == str(tmp_path / 'reports') for result in results)
+
+
+def test_max_concurrency(orchestrator):
+    mock_dnac_server.settings['execution_time'] = 0.3
+    orchestrator.max_concurrency = 2
+    results, total_time = asyncio.run(orchestrator.run([{'name': 'Client Detail %d' % number}
+                                                        for number in range(4)]))
+    assert all(result['status'] == 'SUCCESS' for result in results)
+    assert total_time >= 2 * 0.3  # two reports at a time
+
+
+def test_global_semaphore_shared_by_orchestrators(orchestrator):
+    mock_dnac_server.settings['execution_time'] = 0.3
+
+    async def run_all():
+        global_semaphore = asyncio.Semaphore(1)
+        return await asyncio.gather(orchestrator.run([{'name': 'Client Detail 1'}], global_semaphore=global_semaphore),
+                                    orchestrator.run([{'name': 'Client Detail 2'}], global_semaphore=global_semaphore))
+
+    (results_1, time_1), (results_2, time_2) = asyncio.run(run_all())
+    assert results_1[0]['status'] == results_2[0]['status'] == 'SUCCESS'
+    assert max(time_1, time_2) >= 2 * 0.3  # one report at a time for all the orchestrators
+
+
+def test_failed_report_does_not_stop_the_others(orchestrator):
+    specs = [{'name': 'Client Detail'}, {'name': 'Unknown view', 'view_name': 'Not a report view'},
+             {'name': 'Unknown profile', 'profile': 'not a profile'}]
+    results, total_time = asyncio.run(orchestrator.run(specs))
+    status = {result['name']: result['status'] for result in results}
+    assert status == {'Client Detail': 'SUCCESS', 'Unknown view': 'FAILED', 'Unknown profile': 'FAILED'}
+    assert all(result['error'] for result in results if result['status'] == 'FAILED')
+
+
+def test_reports_executed_again_with_registry(orchestrator, tmp_path):
+    orchestrator.registry = ReportRegistry(orchestrator.dnac, registry_dir=str(tmp_path / 'registry'))
+    for run in range(2):
+        results, total_time = asyncio.run(orchestrator.run([{'name': 'Client Detail', 'profile': 'lookup'}]))
+        assert results[0]['status'] == 'SUCCESS'
+    assert len(mock_dnac_server.reports) == 1
+    assert mock_dnac_server.stats['executions'] == 1  # the report created by the first run is executed again
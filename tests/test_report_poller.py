@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+
+import os
+
+import pytest
+
+import mock_dnac_server
+from report_definitions import build_report_request
+from report_poller import (ExecutionHistory, ExecutionPoller, PollTimeoutError, ReportExecutionError,
+                           get_latest_execution)
+
+
+def create_report(dnac):
+    report_request = build_report_request('Client Detail poller', 'Client', mock_dnac_server.VIEW_GROUP_ID,
+                                          'Client Detail', mock_dnac_server.VIEW_ID)
+    return dnac.create_report(report_request).json()['reportId']
+
+
+def test_execution_history_saved(tmp_path):
+    filename = str(tmp_path / 'execution_history.json')
+    history = ExecutionHistory(filename, size=3)
+    for duration in (10, 20, 30, 40):
+        history.add('view-1', duration)
+    assert ExecutionHistory(filename).estimate('view-1') == 30
+    assert ExecutionHistory(filename).estimate('view-2') is None
+    assert os.listdir(str(tmp_path)) == ['execution_history.json']  # the temporary file is renamed
+
+
+@pytest.mark.parametrize('content', [b'{"view-1": [10', b'\xff\xfe not JSON'])
+def test_execution_history_not_valid(tmp_path, content):
+    filename = str(tmp_path / 'execution_history.json')
+    with open(filename, 'wb') as file:
+        file.write(content)
+    history = ExecutionHistory(filename)
+    assert history.estimate('view-1') is None
+    history.add('view-1', 10)
+    assert ExecutionHistory(filename).estimate('view-1') == 10
+
+
+def test_execution_history_not_readable(tmp_path):
+    # the history file is a folder, the history is not loaded or saved, the executions are still polled
+    history = ExecutionHistory(str(tmp_path))
+    history.add('view-1', 10)
+    assert history.estimate('view-1') == 10
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_get_latest_execution():
+    report_details = {'executions': [{'executionId': 'e1', 'startTime': 1000}, {'executionId': 'e2', 'startTime': 3000},
+                                     {'executionId': 'e3', 'startTime': 2000}]}
+    assert get_latest_execution(report_details)['executionId'] == 'e2'
+    assert get_latest_execution(report_details, since=3000) is None
+    assert get_latest_execution({'executions': None}) is None
+
+
+def test_wait_for_execution(dnac, tmp_path):
+    history = ExecutionHistory(str(tmp_path / 'execution_history.json'))
+    poller = ExecutionPoller(dnac, initial_interval=0.05, max_interval=0.1, history=history)
+    report_id = create_report(dnac)
+    polls = []
+    execution_info = poller.wait_for_execution(report_id, view_id='view-1', on_poll=polls.append)
+    assert execution_info['processStatus'] == 'SUCCESS'
+    assert polls and history.estimate('view-1') == pytest.approx(mock_dnac_server.settings['execution_time'], abs=0.01)
+    # the report executed again, the execution already seen is ignored
+    dnac.execute_report(report_id)
+    new_execution = poller.wait_for_execution(report_id, since=execution_info['startTime'])
+    assert new_execution['executionId'] != execution_info['executionId']
+
+
+def test_wait_for_execution_api_errors_polled_again(dnac):
+    poller = ExecutionPoller(dnac, initial_interval=0.05, max_interval=0.1, history=ExecutionHistory(None))
+    report_id = create_report(dnac)
+    mock_dnac_server.settings['fail_requests'] = 2
+    assert poller.wait_for_execution(report_id)['processStatus'] == 'SUCCESS'
+
+
+def test_wait_for_execution_deadline(dnac):
+    mock_dnac_server.settings['execution_time'] = 60
+    poller = ExecutionPoller(dnac, initial_interval=0.05, max_interval=0.1, deadline=0.3,
+                             history=ExecutionHistory(None))
+    with pytest.raises(PollTimeoutError):
+        poller.wait_for_execution(create_report(dnac))
+
+
+def test_execution_failed(dnac):
+    poller = ExecutionPoller(dnac, history=ExecutionHistory(None))
+    report_details = {'executions': [{'executionId': 'e1', 'startTime': 1000, 'processStatus': 'FAILED'}]}
+    with pytest.raises(ReportExecutionError):
+        poller.check_execution('report-1', report_details)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+
+import asyncio
+
+from report_profiles import ProfileHistory
+from report_shards import run_time_shards
+
+EXECUTION_INFO = {'startTime': 1000, 'endTime': 5000}
+
+
+def test_profile_history_scopes(tmp_path):
+    filename = str(tmp_path / 'profile_history.json')
+    history = ProfileHistory(filename)
+    history.add('all', EXECUTION_INFO, 100)
+    history.add('lookup', EXECUTION_INFO, 20)
+    history.add('all', {'startTime': 1000, 'endTime': 61000}, 300, scope='cluster-1')
+    assert ProfileHistory(filename).summary() == {
+        'all': {'reports': 1, 'execution_time': 4, 'bytes': 100},
+        'lookup': {'reports': 1, 'execution_time': 4, 'bytes': 20}}
+    assert history.summary('cluster-1') == {'all': {'reports': 1, 'execution_time': 60, 'bytes': 300}}
+    assert history.summary('cluster-2') == {}
+
+
+def test_orchestrator_profile_history(orchestrator):
+    specs = [{'name': 'Client Detail', 'profile': 'lookup'},
+             {'name': 'Client Detail not saved', 'profile': 'lookup', 'baseline': False}]
+    results, total_time = asyncio.run(orchestrator.run(specs))
+    assert [result['status'] for result in results] == ['SUCCESS', 'SUCCESS']
+    assert orchestrator.profile_history.summary()['lookup']['reports'] == 1
+
+
+def test_shard_reports_not_saved_to_profile_history(orchestrator, tmp_path):
+    asyncio.run(run_time_shards(orchestrator, 'Client Detail', str(tmp_path / 'report.json'), windows=2))
+    assert orchestrator.profile_history.summary() == {}
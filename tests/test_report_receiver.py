@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+
+import base64
+import importlib
+import os
+
+import pytest
+
+import dnac_logging
+
+LINK = 'Cisco DNA Center Event Context link. **This link is active only in the context of Cisco DNA Center. ' \
+       'You must have necessary permissions to login'
+AUTH = {'Authorization': 'Basic ' + base64.b64encode(b'webhook:password').decode()}
+
+
+def notification(link='https://dnac/data-sets-reports?report-tab=list&data-set-id=report-1&execution-id=execution-1',
+                 status='Success'):
+    return {'Event Id': 'event-1', 'Event Type': 'APP', 'Event Details': {'status': status}, LINK: link}
+
+
+@pytest.fixture(scope='module')
+def receiver(tmp_path_factory):
+    """
+    The receiver app, the report store, index and log files are saved to a temporary folder
+    """
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('receiver'))
+    environ = dict(os.environ)
+    os.environ.update({'WEBHOOK_USERNAME': 'webhook', 'WEBHOOK_PASSWORD': 'password', 'DNAC_URL': 'https://dnac',
+                       'REPORT_WORKERS': '1'})
+    try:
+        report_receiver = importlib.import_module('report_receiver')
+        yield report_receiver
+        report_receiver.report_workers.shutdown()
+        report_receiver.dnac.close()
+    finally:
+        dnac_logging.stop_logging()
+        os.environ.clear()
+        os.environ.update(environ)
+        os.chdir(cwd)
+
+
+def test_parse_report_notification(receiver):
+    assert receiver.parse_report_notification(notification()) == ('report-1', 'execution-1')
+    assert receiver.parse_report_notification(notification(status='Failed')) is None
+    with pytest.raises(ValueError):
+        receiver.parse_report_notification(notification(link='https://dnac/reports?data-set-id=report-1'))
+    with pytest.raises(ValueError):
+        receiver.parse_report_notification(notification(link=['data-set-id=report-1&execution-id=execution-1']))
+
+
+@pytest.mark.parametrize('payload', [
+    {'Event Type': 'APP'},
+    ['not', 'a', 'notification'],
+    {'Event Type': 'APP', 'Event Details': 'Success'},
+    notification(link=None),
+    notification(link={'data-set-id': 'report-1'}),
+    notification(link='https://dnac/reports')
+])
+def test_invalid_notification_rejected(receiver, payload):
+    response = receiver.app.test_client().post('/dnacenter_report', json=payload, headers=AUTH)
+    assert response.status_code == 400
+
+
+def test_notification_not_for_completed_report(receiver):
+    response = receiver.app.test_client().post('/dnacenter_report', json=notification(status='Failed'), headers=AUTH)
+    assert response.status_code == 202
+    assert receiver.report_notifications.stats()['checked'] == 0  # not checked for duplicates, not downloaded
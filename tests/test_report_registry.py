@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+import mock_dnac_server
+from report_definitions import build_report_request
+from report_registry import DEFINITION_TAG, ReportRegistry, definition_hash
+
+FIELDS = [{'name': 'macAddress', 'displayName': 'MAC Address'}, {'name': 'hostName', 'displayName': 'Host Name'}]
+
+
+def report_request(fields=FIELDS, name='Client Detail registry'):
+    return build_report_request(name, 'Client', mock_dnac_server.VIEW_GROUP_ID, 'Client Detail',
+                                mock_dnac_server.VIEW_ID, fields=fields)
+
+
+def executions(report_id):
+    with mock_dnac_server.reports_lock:
+        return list(mock_dnac_server.reports[report_id]['executions'])
+
+
+def test_definition_hash():
+    request = report_request()
+    renamed = dict(request, name='another name', tags=['daily'])
+    assert definition_hash(request) == definition_hash(renamed)
+    assert definition_hash(request) != definition_hash(report_request(fields=FIELDS[:1]))
+
+
+def test_report_created_once(dnac, tmp_path):
+    registry = ReportRegistry(dnac, registry_dir=str(tmp_path))
+    report_id, since = registry.run(report_request())
+    assert since is None
+    assert mock_dnac_server.reports[report_id]['request']['tags'] == [DEFINITION_TAG +
+                                                                      definition_hash(report_request())]
+
+    # executed again, the executions started before the last one seen are ignored
+    first_execution = executions(report_id)[0]
+    assert registry.run(report_request()) == (report_id, first_execution['startTime'])
+    second_execution = executions(report_id)[1]
+
+    # the registry is saved, the last execution seen is the execution started by the last run
+    registry = ReportRegistry(dnac, registry_dir=str(tmp_path))
+    assert registry.get(report_request()['name'])['last_execution_id'] == second_execution['executionId']
+    assert registry.run(report_request()) == (report_id, second_execution['startTime'])
+    assert len(mock_dnac_server.reports) == 1
+    assert len(executions(report_id)) == 3
+    assert mock_dnac_server.stats['reports'] == 1
+
+
+def test_registered_report_found_in_dnac(dnac, tmp_path):
+    report_id, _ = ReportRegistry(dnac, registry_dir=str(tmp_path / 'app1')).run(report_request())
+    registry = ReportRegistry(dnac, registry_dir=str(tmp_path / 'app2'))
+    assert registry.run(report_request()) == (report_id, executions(report_id)[0]['startTime'])
+    assert mock_dnac_server.stats['reports'] == 1
+
+
+def test_report_created_again_when_definition_changes(dnac, tmp_path):
+    registry = ReportRegistry(dnac, registry_dir=str(tmp_path))
+    old_report_id, _ = registry.run(report_request())
+    # a report with the same name, not created by the registry, is not deleted
+    other_report_id = dnac.create_report(report_request()).json()['reportId']
+    report_id, since = registry.run(report_request(fields=FIELDS[:1]))
+    assert since is None
+    assert report_id != old_report_id
+    assert sorted(mock_dnac_server.reports) == sorted([report_id, other_report_id])
+
+
+def test_report_created_again_when_deleted(dnac, tmp_path):
+    registry = ReportRegistry(dnac, registry_dir=str(tmp_path))
+    old_report_id, _ = registry.run(report_request())
+    dnac.delete_report(old_report_id)
+    report_id, since = registry.run(report_request())
+    assert since is None
+    assert report_id != old_report_id
+    assert registry.get(report_request()['name'])['report_id'] == report_id
+
+
+def test_update_last_execution(dnac, tmp_path):
+    registry = ReportRegistry(dnac, registry_dir=str(tmp_path))
+    report_id, _ = registry.run(report_request())
+    execution = executions(report_id)[0]
+    registry.update(report_request()['name'], execution)
+    registry.update(report_request()['name'], dict(execution, startTime=0, executionId='older'))
+    entry = registry.get(report_request()['name'])
+    assert (entry['last_start_time'], entry['last_execution_id']) == (execution['startTime'],
+                                                                      execution['executionId'])
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+import asyncio
+import json
+import os
+
+import pytest
+
+import mock_dnac_server
+import report_shards
+from report_registry import ReportRegistry
+from report_shards import (ClientMerger, merge_values, run_site_shards, run_time_shards, select_site_shards,
+                           stream_merge_reports, time_window_filters)
+from report_stream import iter_client_details
+
+WINDOWS = [
+    [{'macAddress': 'mac-1', 'hostName': 'old name', 'rssi_min': '-70', 'rssi_max': '-60', 'usage_sum': '10',
+      'rssi_avg': '-65', 'rssi_median': '-66'},
+     {'macAddress': 'mac-2', 'hostName': 'client-2', 'usage_sum': '--'}],
+    [{'macAddress': 'mac-1', 'hostName': 'new name', 'rssi_min': '-75', 'rssi_max': '-50', 'usage_sum': '5',
+      'rssi_avg': '-60', 'rssi_median': '-61'},
+     {'hostName': 'no mac address'}],
+    [{'macAddress': 'mac-3', 'hostName': 'client-3'},
+     {'macAddress': 'mac-1', 'rssi_avg': '-58.5'}]
+]
+MERGED = [
+    {'macAddress': 'mac-1', 'hostName': 'new name', 'rssi_min': '-75', 'rssi_max': '-50', 'usage_sum': '15',
+     'rssi_avg': '-61.17', 'rssi_median': '-64'},
+    {'macAddress': 'mac-2', 'hostName': 'client-2', 'usage_sum': '--'},
+    {'macAddress': 'mac-3', 'hostName': 'client-3'}
+]
+
+
+def save_window(tmp_path, window, start_time):
+    filename = str(tmp_path / ('window-%d.json' % window))
+    with open(filename, 'w') as file:
+        json.dump({'client_details': WINDOWS[window], 'filters': [{'name': 'startTime', 'values': [start_time]},
+                                                                  {'name': 'window', 'values': [window]}]}, file)
+    return filename
+
+
+def test_merge_values():
+    assert merge_values('rssi_min', ['-70', '-75.0', '-75']) == '-75.0'
+    assert merge_values('rssi_max', ['--', '-50']) == '-50'
+    assert merge_values('usage_sum', ['1.5', '2']) == '3.5'
+    assert merge_values('rssi_avg', ['-60', '-65']) == '-62'
+    assert merge_values('rssi_median', ['1', '2', '6']) == '3'
+    assert merge_values('usage_sum', ['--', 'n/a']) == 'n/a'
+    assert merge_values('hostName', ['a', 'b']) == 'b'
+    assert merge_values('hostName_sum', ['7']) == '7'
+
+
+@pytest.mark.parametrize('order', [[0, 1, 2], [2, 0, 1], [2, 1, 0]])
+def test_merge_windows_in_any_order(tmp_path, monkeypatch, order):
+    monkeypatch.setattr(report_shards, 'MERGE_BATCH', 1)
+    db_file = str(tmp_path / 'merge.db')
+    with ClientMerger(db_file) as merger:
+        for window in order:
+            merger.add_report(save_window(tmp_path, window, 'start %d' % window), window)
+        output = str(tmp_path / 'merged.json')
+        assert merger.save(output) == 3
+        assert (merger.records, merger.skipped) == (6, 1)
+    assert not os.path.exists(db_file)
+    other_fields = {}
+    clients = sorted(iter_client_details(output, other_fields=other_fields), key=lambda client: client['macAddress'])
+    assert clients == MERGED
+    # the filters of the most recent window, with the start time of the oldest window
+    assert other_fields['filters'] == [{'name': 'startTime', 'values': ['start 0']}, {'name': 'window', 'values': [2]}]
+
+
+def test_merged_clients_in_first_seen_order(tmp_path):
+    with ClientMerger() as merger:
+        for window in range(3):
+            merger.add_report(save_window(tmp_path, window, 'start'))
+        assert [client['macAddress'] for client in merger.iter_clients()] == ['mac-1', 'mac-2', 'mac-3']
+
+
+def test_stream_merge_reports(tmp_path):
+    sources = [save_window(tmp_path, window, 'start') for window in range(3)]
+    output = str(tmp_path / 'merged.json')
+    assert stream_merge_reports(sources, output) == (3, 2, 1)
+    assert [client['hostName'] for client in iter_client_details(output)] == ['old name', 'client-2', 'client-3']
+
+
+def test_time_window_filters():
+    windows = time_window_filters(3, hours=3, end_time=10800000)
+    ranges = [[report_filter['value'] for report_filter in filters if report_filter.get('type') == 'TIME_RANGE'][0]
+              for filters in windows]
+    assert [(value['startDateTime'], value['endDateTime']) for value in ranges] == [(0, 3600000), (3600000, 7200000),
+                                                                                    (7200000, 10800000)]
+
+
+def test_run_time_shards(orchestrator, tmp_path):
+    shard_dir = str(tmp_path / 'shards')
+    output = str(tmp_path / 'report.json')
+    completed = []
+    results, clients, skipped = asyncio.run(run_time_shards(orchestrator, 'Client Detail', output, windows=3,
+                                                            shard_dir=shard_dir, on_complete=completed.append))
+    assert [result['name'] for result in results] == ['Client Detail [%d of 3]' % window for window in (1, 2, 3)]
+    assert len(completed) == 3
+    assert (clients, skipped) == (mock_dnac_server.settings['clients'], 0)
+    assert len(list(iter_client_details(output))) == clients
+    assert not os.path.exists(shard_dir)  # the window reports and the merge state are deleted
+
+
+def test_run_time_shards_keep_shards(orchestrator, tmp_path):
+    shard_dir = str(tmp_path / 'shards')
+    os.makedirs(shard_dir)
+    asyncio.run(run_time_shards(orchestrator, 'Client Detail', str(tmp_path / 'report.json'), windows=2,
+                                shard_dir=shard_dir, keep_shards=True))
+    assert sorted(os.listdir(shard_dir)) == ['shard-000.json', 'shard-001.json']
+
+
+def test_select_site_shards():
+    sites = mock_dnac_server.SITES
+    assert [[site['siteNameHierarchy'] for site in group] for group in select_site_shards(sites, 2)] == [
+        ['Global/London'], ['Global/New York'], ['Global/San Francisco'], ['Global/San Jose']]
+    groups = select_site_shards(sites, 3, prefix='Global/San Jose', sites_per_report=2)
+    assert [[site['name'] for site in group] for group in groups] == [['Building 1', 'Building 2']]
+
+
+def test_run_site_shards(orchestrator, tmp_path):
+    output = str(tmp_path / 'report.json')
+    site_groups = select_site_shards(mock_dnac_server.SITES, 2)
+    results, clients, duplicates, skipped = asyncio.run(run_site_shards(orchestrator, 'Client Detail', output,
+                                                                        site_groups))
+    assert [result['sites'] for result in results] == [[group[0]['siteNameHierarchy']] for group in site_groups]
+    assert (clients, duplicates, skipped) == (mock_dnac_server.settings['clients'], 0, 0)
+    assert len(list(iter_client_details(output))) == clients
+    assert not any(os.path.exists(result['output']) for result in results)
+
+
+def test_shard_reports_executed_again(orchestrator, dnac, tmp_path):
+    orchestrator.registry = ReportRegistry(dnac, registry_dir=str(tmp_path / 'registry'))
+    site_groups = select_site_shards(mock_dnac_server.SITES, 2)
+    for _ in range(2):
+        asyncio.run(run_site_shards(orchestrator, 'Client Detail', str(tmp_path / 'sites.json'), site_groups))
+    assert len(mock_dnac_server.reports) == len(site_groups)
+    assert all(len(report['executions']) == 2 for report in mock_dnac_server.reports.values())
+
+    # the time window reports have new time windows on each run, the reports of the previous run are deleted
+    mock_dnac_server.reports.clear()
+    for _ in range(2):
+        asyncio.run(run_time_shards(orchestrator, 'Client Detail', str(tmp_path / 'time.json'), windows=2))
+    assert len(mock_dnac_server.reports) == 2
+    assert mock_dnac_server.stats['reports'] == len(site_groups) + 4
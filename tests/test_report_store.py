@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+import os
+import time
+
+import mock_dnac_server
+import report_store
+from report_definitions import build_report_request
+from report_store import TIME_FORMAT, ReportStore, export_report
+from report_stream import iter_client_details
+
+DAY = 86400
+
+
+def save_execution(store, report_id, execution_id, start_time, size=100):
+    folder = os.path.join(store.folder, report_id)
+    os.makedirs(folder, exist_ok=True)
+    filename = os.path.join(folder, time.strftime(TIME_FORMAT, time.gmtime(start_time)) + '_' + execution_id +
+                            '.json')
+    with open(filename, 'wb') as file:
+        file.write(b' ' * size)
+    return filename
+
+
+def test_download_compressed(dnac, tmp_path):
+    store = ReportStore(str(tmp_path / 'store'), compression='gzip', retention_days=None)
+    filename, size = store.download(dnac, 'report-1', 'execution-1', start_time=1617112620000)
+    assert os.path.basename(filename) == '20210330T135700Z_execution-1.json.gz'
+    assert size > os.path.getsize(filename)
+    assert len(list(iter_client_details(filename))) == mock_dnac_server.settings['clients']
+    store.download(dnac, 'report-1', 'execution-2', start_time=1617199020000)
+    assert store.reports() == ['report-1']
+    assert [execution['execution_id'] for execution in store.executions('report-1')] == ['execution-2',
+                                                                                         'execution-1']
+    assert store.get('report-1', 'execution-1')['file'] == filename
+    output = str(tmp_path / 'report.json')
+    export_report(filename, output)
+    assert os.path.getsize(output) == size
+
+
+def test_executions_ordered_by_start_time(dnac, tmp_path):
+    report_request = build_report_request('Client Detail store', 'Client', mock_dnac_server.VIEW_GROUP_ID,
+                                          'Client Detail', mock_dnac_server.VIEW_ID)
+    report_id = dnac.create_report(report_request).json()['reportId']
+    dnac.execute_report(report_id)
+    with mock_dnac_server.reports_lock:
+        older, newer = mock_dnac_server.reports[report_id]['executions']
+        older['startTime'] -= DAY * 1000
+    store = ReportStore(str(tmp_path), compression=None)
+    # the newer execution is downloaded first, the older execution notification is retried
+    store.download(dnac, report_id, newer['executionId'])
+    store.download(dnac, report_id, older['executionId'])
+    assert [execution['execution_id'] for execution in store.executions(report_id)] == [newer['executionId'],
+                                                                                        older['executionId']]
+    assert store.latest(report_id)['time'] == int(newer['startTime'] / 1000)
+
+
+def test_latest_execution(tmp_path):
+    store = ReportStore(str(tmp_path), compression=None)
+    now = time.time()
+    save_execution(store, 'report-1', 'execution-1', now - DAY)
+    save_execution(store, 'report-1', 'execution-2', now)
+    assert store.latest('report-1')['execution_id'] == 'execution-2'
+    assert store.latest('report-2') is None
+
+
+def test_evict_expired_reports(tmp_path):
+    store = ReportStore(str(tmp_path), compression=None, retention_days=7)
+    now = time.time()
+    expired = save_execution(store, 'report-1', 'execution-1', now - 8 * DAY)
+    save_execution(store, 'report-1', 'execution-2', now - DAY)
+    assert store.evict(now) == [expired]
+    assert store.stats()['executions'] == 1
+
+
+def test_evict_oldest_reports_over_max_bytes(tmp_path):
+    store = ReportStore(str(tmp_path), compression=None, retention_days=None, max_bytes=250)
+    now = time.time()
+    oldest = save_execution(store, 'report-1', 'execution-1', now - 3 * DAY)
+    save_execution(store, 'report-2', 'execution-1', now - 2 * DAY)  # the newest execution of report-2 is kept
+    older = save_execution(store, 'report-1', 'execution-2', now - DAY)
+    save_execution(store, 'report-1', 'execution-3', now)
+    assert store.evict(now) == [oldest, older]
+    assert store.stats()['bytes'] == 200
+    store.max_bytes = 100
+    assert store.evict(now) == []  # the newest execution of each report is not deleted for the size limit
+    assert store.stats()['executions'] == 2
+
+
+def test_evict_throttled_after_downloads(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_store, 'download_report', lambda *args, **kwargs: 100)
+    store = ReportStore(str(tmp_path), compression=None, evict_interval=3600, evict_downloads=3)
+    evictions = []
+    monkeypatch.setattr(store, 'evict', lambda: evictions.append(1) or [])
+    for number in range(7):
+        store.download(None, 'report-1', 'execution-' + str(number), start_time=time.time() * 1000)
+    assert len(evictions) == 3  # after the first download, then every 3 downloads
+    store.evict_interval = 0
+    store.download(None, 'report-1', 'execution-7', start_time=time.time() * 1000)
+    assert len(evictions) == 4
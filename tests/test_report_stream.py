@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+import gzip
+import io
+import json
+
+import pytest
+
+from report_stream import _JsonStream, iter_client_details, iter_records
+
+REPORT = {
+    'client_details': [
+        {'macAddress': 'AA:BB:CC:00:00:01', 'hostName': 'client-1', 'rssi': -61.5, 'tags': ['a', 'b'], 'ssid': None},
+        {'macAddress': 'AA:BB:CC:00:00:02', 'hostName': 'client "2"', 'rssi': 1234567, 'tags': [], 'ssid': 'lab'}
+    ],
+    'filters': [{'name': 'Location', 'values': []}]
+}
+
+
+def split_chunks(text, size):
+    return [text[start:start + size] for start in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize('size', [1, 2, 7, 1000])
+def test_values_split_across_chunks(size):
+    stream = _JsonStream(iter(split_chunks(' [123456, "text \\" ,", {"key": [1.5e3, null]}, true] ', size)))
+    assert stream.expect('[') == '['
+    values = []
+    while True:
+        values.append(stream.value())
+        if stream.expect(',]') == ']':
+            break
+    assert values == [123456, 'text " ,', {'key': [1500.0, None]}, True]
+    assert stream.peek() == ''
+
+
+def test_parsed_data_dropped():
+    stream = _JsonStream(iter(split_chunks('[' + ', '.join(['"' + 'x' * 100 + '"'] * 100) + ']', 64)))
+    stream.expect('[')
+    for _ in range(99):
+        stream.value()
+        stream.expect(',')
+        assert len(stream.buffer) < 300
+
+
+def test_invalid_stream():
+    stream = _JsonStream(iter(['{"a": 1']))
+    stream.expect('{')
+    stream.value()
+    stream.expect(':')
+    stream.value()
+    with pytest.raises(ValueError):
+        stream.expect(',}')
+    with pytest.raises(ValueError):
+        _JsonStream(iter(['[1, tru'])).expect('{')
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 64 * 1024])
+def test_iter_records(chunk_size):
+    other_fields = {}
+    source = io.BytesIO(json.dumps(REPORT).encode('utf-8'))
+    records = list(iter_client_details(source, chunk_size=chunk_size, other_fields=other_fields))
+    assert records == REPORT['client_details']
+    assert other_fields == {'filters': REPORT['filters']}
+
+
+def test_iter_records_multibyte_characters():
+    report = {'client_details': [{'hostName': 'café-ü-日本'}]}
+    source = io.BytesIO(json.dumps(report, ensure_ascii=False).encode('utf-8'))
+    assert list(iter_client_details(source, chunk_size=1)) == report['client_details']
+
+
+def test_iter_records_compressed_file(tmp_path):
+    filename = str(tmp_path / 'report.json.gz')
+    with gzip.open(filename, 'wt') as file:
+        json.dump(REPORT, file)
+    assert list(iter_client_details(filename)) == REPORT['client_details']
+
+
+def test_iter_records_empty_report():
+    assert list(iter_records(io.BytesIO(b'{}'))) == []
+    assert list(iter_records(io.BytesIO(b'{"client_details": [], "filters": []}'))) == []
+    assert list(iter_records(io.BytesIO(b'{"filters": [1]}'), key='filters')) == [1]
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+import base64
+import json
+import threading
+import time
+
+import mock_dnac_server
+from token_cache import TokenCache, get_jwt_expiry
+
+
+def jwt_token(expires_at):
+    payload = base64.urlsafe_b64encode(json.dumps({'exp': expires_at}).encode()).decode().rstrip('=')
+    return 'header.' + payload + '.signature'
+
+
+class TokenServer:
+    """
+    Count the tokens requested, each token expires after {lifetime} seconds
+    """
+
+    def __init__(self, lifetime=3600):
+        self.lifetime = lifetime
+        self.fetched = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def fetch_token(self):
+        self.fetched += 1
+        self.release.wait(5)
+        return jwt_token(time.time() + self.lifetime)
+
+
+def test_jwt_expiry():
+    assert get_jwt_expiry(jwt_token(1700000000)) == 1700000000
+    assert get_jwt_expiry('not a jwt token') is None
+
+
+def test_token_cached_until_invalidated():
+    server = TokenServer()
+    cache = TokenCache(server.fetch_token, background_refresh=False)
+    token = cache.get()
+    assert cache.get() == token
+    assert server.fetched == 1
+    cache.invalidate('another token')
+    assert cache.get() == token
+    cache.invalidate(token)
+    assert cache.get() != token
+    assert cache.stats()['hits'] == 2
+    assert cache.stats()['misses'] == 2
+
+
+def test_token_expiry_without_exp_claim():
+    cache = TokenCache(lambda: 'opaque-token', refresh_margin=10, default_lifetime=100, background_refresh=False)
+    cache.get()
+    assert 80 < cache.stats()['expires_at'] - time.time() <= 100
+
+
+def test_fetched_token_refreshed_in_background():
+    server = TokenServer(lifetime=1.3)
+    cache = TokenCache(server.fetch_token, refresh_margin=1)
+    try:
+        token = cache.get()  # the fetched token is used, it is refreshed without another get()
+        time.sleep(0.6)
+        assert server.fetched == 2
+        assert cache.stats()['refreshes'] == 1
+        assert cache.get() != token
+    finally:
+        cache.close()
+
+
+def test_idle_token_not_refreshed():
+    server = TokenServer(lifetime=1.3)
+    cache = TokenCache(server.fetch_token, refresh_margin=1)
+    try:
+        cache.get()
+        time.sleep(0.6)  # refreshed once, the token was used when fetched
+        time.sleep(0.6)  # idle since the refresh
+        assert server.fetched == 2
+    finally:
+        cache.close()
+
+
+def test_get_not_blocked_by_refresh():
+    server = TokenServer(lifetime=1.5)
+    cache = TokenCache(server.fetch_token, refresh_margin=1)
+    try:
+        token = cache.get()
+        server.release.clear()
+        time.sleep(0.7)  # the refresh is waiting for the new token
+        start = time.monotonic()
+        assert cache.get() == token
+        assert time.monotonic() - start < 0.5
+        server.release.set()
+        time.sleep(0.2)
+        assert cache.get() != token
+        assert server.fetched == 2
+    finally:
+        server.release.set()
+        cache.close()
+
+
+def test_dnac_client_token_cache(dnac):
+    for _ in range(5):
+        dnac.get_report_view_groups()
+    assert mock_dnac_server.stats['tokens'] == 1
+    assert dnac.token_cache.stats()['hits'] == 4
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2021 Cisco and/or its affiliates.
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+               https://developer.cisco.com/docs/licenses
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+"""
+
+__author__ = "Gabriel Zapodeanu TME, ENB"
+__email__ = "gzapodea@cisco.com"
+__version__ = "0.1.0"
+__copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import base64
+import json
+import threading
+import time
+
+DEFAULT_TOKEN_LIFETIME = 3600  # Cisco DNA Center tokens are valid for 60 minutes
+REFRESH_MARGIN = 60  # refresh the token this many seconds before it expires
+
+
+def get_jwt_expiry(jwt_token):
+    """
+    Read the expiry time from the JWT token "exp" claim, the signature is not verified
+    :param jwt_token: Cisco DNA Center JWT token
+    :return: expiry time in epoch seconds, or None if the token has no "exp" claim
+    """
+    try:
+        payload = jwt_token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)  # restore the base64 padding
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return float(claims['exp'])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenCache:
+    """
+    Thread safe cache for the Cisco DNA Center JWT token.
+    The token is requested once per token lifetime, and refreshed in the background just before it expires,
+    as long as it was used since the last refresh.
+    """
+
+    def __init__(self, fetch_token, refresh_margin=REFRESH_MARGIN, default_lifetime=DEFAULT_TOKEN_LIFETIME,
+                 background_refresh=True):
+        """
+        :param fetch_token: function that will request a new token from Cisco DNA Center
+        :param refresh_margin: seconds before the expiry when the token is refreshed
+        :param default_lifetime: token lifetime to use when the token has no "exp" claim
+        :param background_refresh: refresh the token in a background thread before it expires
+        """
+        self.fetch_token = fetch_token
+        self.refresh_margin = refresh_margin
+        self.default_lifetime = default_lifetime
+        self.background_refresh = background_refresh
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self._token = None
+        self._expires_at = 0
+        self._used = False
+        self._refreshing = False
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        Return a valid token, a new token is requested only if there is no cached token or it expired
+        :return: Cisco DNA Center JWT token
+        """
+        with self._lock:
+            now = time.time()
+            # while the background refresh is in progress, the cached token is used until it expires
+            if self._token is not None and (now < self._expires_at - self.refresh_margin or
+                                            self._refreshing and now < self._expires_at):
+                self.hits += 1
+                self._used = True
+                return self._token
+            self.misses += 1
+            token = self._update_token(self.fetch_token())
+            self._used = True
+            return token
+
+    def invalidate(self, token=None):
+        """
+        Drop the cached token, for example when Cisco DNA Center rejected it with 401
+        :param token: drop the cached token only if it is still this token
+        :return None
+        """
+        with self._lock:
+            if token is None or token == self._token:
+                self._token = None
+                self._expires_at = 0
+
+    def stats(self):
+        """
+        :return: the cache hit/miss/refresh counters and the cached token expiry time
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'refreshes': self.refreshes,
+                'expires_at': self._expires_at if self._token is not None else None
+            }
+
+    def close(self):
+        """
+        Stop the background refresh
+        :return None
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _update_token(self, token, expires_at=None):
+        # the lock is held by the caller
+        expires_at = expires_at or get_jwt_expiry(token) or time.time() + self.default_lifetime
+        self._token = token
+        self._expires_at = expires_at
+        self._used = False
+        self._schedule_refresh()
+        return token
+
+    def _schedule_refresh(self):
+        if not self.background_refresh:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        delay = max(self._expires_at - self.refresh_margin - time.time(), 0)
+        self._timer = threading.Timer(delay, self._refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _refresh(self):
+        with self._lock:
+            self._timer = None
+            if not self._used or self._refreshing:
+                # idle since the last refresh, the next get() will request a new token
+                return
+            self._refreshing = True
+        # the new token is requested without the lock, get() returns the cached token until it is replaced
+        try:
+            token = self.fetch_token()
+        except Exception:
+            # the next get() will retry, once the cached token expires
+            token = None
+        with self._lock:
+            self._refreshing = False
+            if token is None:
+                return
+            expires_at = get_jwt_expiry(token) or time.time() + self.default_lifetime
+            if self._token is not None and self._expires_at > expires_at:
+                return  # a newer token was requested by get() during the refresh, after a 401
+            self._update_token(token, expires_at)
+            self.refreshes += 1